@@ -16,7 +16,7 @@ st.set_page_config(
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import utilities
-from utils.data_storage import initialize_session_state
+from utils.data_storage import initialize_session_state, login_enabled, needs_login, report_failed_saves
 from pages.dashboard import show_dashboard
 from pages.journal import show_journal
 from pages.weekly_summary import show_weekly_summary
@@ -71,8 +71,6 @@ def initialize_session_state():
         st.session_state.current_lesson = 1
     if 'completed_lessons' not in st.session_state:
         st.session_state.completed_lessons = {}
-    if 'journal_entries' not in st.session_state:
-        st.session_state.journal_entries = []
     if 'current_page' not in st.session_state:
         st.session_state.current_page = "dashboard"
     if 'journal_content' not in st.session_state:
@@ -105,6 +103,15 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+def require_login():
+    """With authentication configured, stop here until the visitor signs in."""
+    if needs_login():
+        st.info("Log in to open your journal. Your entries are kept with your account.")
+        st.button("Log in", on_click=st.login)
+        st.stop()
+    if login_enabled():
+        st.sidebar.button("Log out", on_click=st.logout)
+
 # Navigation
 def navigation():
     tabs = ["Dashboard", "Journal", "Weekly Summary", "Settings"]
@@ -167,4 +174,6 @@ def navigation():
         show_conclusion()
 
 if __name__ == "__main__":
+    require_login()
+    report_failed_saves()
     navigation()
@@ -0,0 +1,37 @@
+"""
+Benchmark batch analysis scaling from one worker process up to the CPU count.
+
+Run from the project root:
+    python benchmarks/bench_analyze_many.py [entries] [max_workers]
+"""
+import os
+import sys
+import time
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_analysis import SentimentAnalyzer
+from bench_emotion_index import make_entry
+
+def main():
+    entry_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    texts = [make_entry(300, seed=i) for i in range(entry_count)]
+    analyzer = SentimentAnalyzer()
+
+    baseline = None
+    print(f"{entry_count} entries of 300 words, {os.cpu_count()} CPUs available")
+    print(f"{'workers':>8}  {'seconds':>10}  {'entries/sec':>12}  {'speedup':>8}")
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        results = analyzer.analyze_many(texts, workers=workers)
+        seconds = time.perf_counter() - start
+        assert len(results) == entry_count
+        baseline = baseline or seconds
+        print(f"{workers:>8}  {seconds:>10.3f}  {entry_count / seconds:>12,.0f}  {baseline / seconds:>7.2f}x")
+        workers *= 2
+
+if __name__ == "__main__":
+    main()
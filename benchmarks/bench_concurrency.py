@@ -0,0 +1,94 @@
+"""
+Throughput of the multi-user journal store with 50 simulated sessions.
+
+Each session is a thread that, like a page run, saves an entry and then reads
+the count, the latest entries and the past week. Two sessions share each user,
+so writes to the same journal race as well. After the run every user's ids
+must be 1..n with no gaps or duplicates.
+
+Run from the project root:
+    python benchmarks/bench_concurrency.py [sessions] [pool sizes ...]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.journal_store import JournalStore, open_journal_pool
+from bench_emotion_index import make_entry
+
+ROUNDS = 40
+TODAY = date(2025, 1, 1)
+
+def run_session(pool, user_id, session, barrier, latencies):
+    """Save and read ROUNDS times as one session of user_id."""
+    store = JournalStore(user_id=user_id, pool=pool)
+    barrier.wait()
+    for i in range(ROUNDS):
+        start = time.perf_counter()
+        store.add({
+            'date': (TODAY - timedelta(days=i % 14)).isoformat(),
+            'time': '09:00',
+            'module': 1 + i % 5,
+            'lesson': 1 + i % 4,
+            'prompt': 'Reflect on your day.',
+            'content': make_entry(60, seed=session * ROUNDS + i),
+            'sentiment': {'compound': 0.5, 'pos': 0.2, 'neu': 0.8, 'neg': 0.0,
+                          'category': 'positive', 'emotions': {'joy': 60.0}},
+            'themes': ['journey']
+        })
+        store.count()
+        store.latest(3)
+        store.entries_between(TODAY - timedelta(days=6), TODAY)
+        latencies.append(time.perf_counter() - start)
+
+def measure(sessions, pool_size, directory):
+    pool = open_journal_pool(os.path.join(directory, f"journal_{pool_size}.sqlite3"), size=pool_size)
+    users = [f"user{session // 2}" for session in range(sessions)]
+    barrier = threading.Barrier(sessions + 1)
+    latencies = []
+    threads = [
+        threading.Thread(target=run_session, args=(pool, users[session], session, barrier, latencies))
+        for session in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    # Same-user sessions raced on ids; each journal must still number 1..n
+    for user_id in set(users):
+        ids = [entry['id'] for entry in JournalStore(user_id=user_id, pool=pool).iter_entries()]
+        assert ids == list(range(1, users.count(user_id) * ROUNDS + 1)), user_id
+
+    latencies.sort()
+    return {
+        'pages_per_s': len(latencies) / seconds,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'opened': pool.opened,
+        'waits': pool.waits,
+    }
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    pool_sizes = [int(arg) for arg in sys.argv[2:]] or [1, 4, 8, 16]
+    print(f"{sessions} sessions, {ROUNDS} page runs each (save + 3 reads)")
+    print(f"{'pool':>5}  {'pages/s':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'opened':>6}  {'waits':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        for pool_size in pool_sizes:
+            result = measure(sessions, pool_size, directory)
+            print(f"{pool_size:>5}  {result['pages_per_s']:>8.0f}  {result['p50_ms']:>7.1f}  "
+                  f"{result['p95_ms']:>7.1f}  {result['opened']:>6}  {result['waits']:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark week-long date range queries: strptime scan versus the sorted day index.
+
+Run from the project root:
+    python benchmarks/bench_date_range.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.journal_store import JournalStore
+
+def make_entries(count, seed=0):
+    """Build count small entries spread over the days before 2025-01-01."""
+    rng = random.Random(seed)
+    end = date(2025, 1, 1)
+    entries = []
+    for _ in range(count):
+        day = end - timedelta(days=rng.randrange(max(count // 3, 30)))
+        entries.append({
+            'date': day.strftime('%Y-%m-%d'),
+            'time': '09:00',
+            'module': rng.randint(1, 5),
+            'lesson': rng.randint(1, 4),
+            'prompt': 'Prompt',
+            'content': 'Short entry.',
+            'sentiment': {'category': 'neutral', 'emotions': {'neutral': 50}},
+            'themes': []
+        })
+    return entries
+
+def scan_period(entries, start_date, end_date):
+    """The previous approach: parse every entry's date on every query."""
+    matches = []
+    for entry in entries:
+        entry_date = datetime.strptime(entry['date'], '%Y-%m-%d').date()
+        if start_date <= entry_date <= end_date:
+            matches.append(entry)
+    return matches
+
+def best_of(repeat, func, *args):
+    """Return the best wall-clock time and last result of func over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    start_date, end_date = date(2024, 12, 1), date(2024, 12, 7)
+    print(f"{'entries':>8}  {'matches':>8}  {'scan ms':>10}  {'index ms':>10}  {'speedup':>8}")
+    for count in [10_000, 100_000]:
+        entries = make_entries(count)
+        store = JournalStore()
+        store.add_many(entries)
+
+        scan_seconds, scanned = best_of(3, scan_period, entries, start_date, end_date)
+        index_seconds, indexed = best_of(20, store.entries_between, start_date, end_date)
+        assert len(indexed) == len(scanned)
+
+        print(f"{count:>8}  {len(indexed):>8}  {scan_seconds * 1e3:>10.2f}  "
+              f"{index_seconds * 1e3:>10.2f}  {scan_seconds / index_seconds:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark re-analysis latency of a long draft after a one-sentence edit.
+
+Run from the project root:
+    python benchmarks/bench_draft_analyzer.py
+"""
+import os
+import sys
+import time
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_analysis import SentimentAnalyzer, DraftAnalyzer
+from bench_emotion_index import make_entry
+
+def main():
+    analyzer = SentimentAnalyzer()
+    print(f"{'words':>8}  {'full (s)':>10}  {'edit (s)':>10}  {'speedup':>8}")
+    for word_count in [1_000, 10_000, 50_000]:
+        draft = make_entry(word_count)
+        edited = draft + " I felt grateful and hopeful after the walk."
+
+        start = time.perf_counter()
+        expected = analyzer.analyze_entry(edited)
+        full = time.perf_counter() - start
+
+        draft_analyzer = DraftAnalyzer(analyzer)
+        draft_analyzer.analyze(draft)
+        start = time.perf_counter()
+        result = draft_analyzer.analyze(edited)
+        incremental = time.perf_counter() - start
+        # Polarity included, the incremental result is the whole-text one
+        assert result == expected
+
+        print(f"{word_count:>8}  {full:>10.4f}  {incremental:>10.4f}  {full / incremental:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
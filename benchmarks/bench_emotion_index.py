@@ -0,0 +1,54 @@
+"""
+Benchmark emotion detection throughput on synthetic journal entries.
+
+Run from the project root:
+    python benchmarks/bench_emotion_index.py
+"""
+import os
+import random
+import sys
+import time
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_analysis import SentimentAnalyzer
+
+# Mix of emotion keywords, modifiers, negations, stopwords and neutral words
+VOCABULARY = [
+    "happy", "grateful", "worried", "hope", "love", "tense", "sad", "proud",
+    "very", "really", "deeply", "not", "never", "fed", "up", "looking", "forward",
+    "i", "my", "the", "and", "today", "work", "family", "morning", "walk",
+    "conversation", "decided", "friend", "journey", "noticed", "feeling",
+]
+
+def make_entry(word_count, seed=0):
+    """Build a synthetic entry of roughly word_count words with sentence breaks."""
+    rng = random.Random(seed)
+    words = []
+    for i in range(word_count):
+        word = rng.choice(VOCABULARY)
+        if i % 12 == 11:
+            word += rng.choice([".", "!", "?"])
+        words.append(word)
+    return " ".join(words)
+
+def bench(analyzer, text, repeat):
+    """Return the best wall-clock time of detect_emotions over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        analyzer.detect_emotions(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    analyzer = SentimentAnalyzer()
+    print(f"{'words':>8}  {'seconds':>10}  {'tokens/sec':>12}")
+    for word_count, repeat in [(1_000, 50), (10_000, 10), (100_000, 3)]:
+        text = make_entry(word_count)
+        seconds = bench(analyzer, text, repeat)
+        print(f"{word_count:>8}  {seconds:>10.5f}  {word_count / seconds:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
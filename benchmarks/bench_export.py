@@ -0,0 +1,63 @@
+"""
+Compare peak memory of the old in-memory export with the streaming export.
+
+The old path built the whole JSON string with indent=2, then base64-encoded it
+for an HTML link. The streaming path writes entries one at a time into a file.
+
+Run from the project root:
+    python benchmarks/bench_export.py
+"""
+import base64
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_storage import write_export
+from utils.journal_store import JournalStore
+from bench_journal_entry import make_entries
+
+SETTINGS = {'user_name': 'User', 'current_module': 1, 'current_lesson': 1, 'completed_lessons': []}
+
+def measure(func):
+    """Return (seconds, peak MiB allocated) for one call of func()."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+def export_in_memory(store):
+    data = dict(SETTINGS, journal_entries=[entry.to_dict() for entry in store.iter_entries()])
+    return base64.b64encode(json.dumps(data, indent=2).encode()).decode()
+
+def export_streaming(store, compress):
+    with tempfile.TemporaryFile() as export_file:
+        write_export(export_file, SETTINGS, store.iter_entries(), compress=compress)
+        return export_file.tell()
+
+def main():
+    print(f"{'entries':>8}  {'in-memory s':>11}  {'peak MiB':>8}  {'stream s':>8}  {'peak MiB':>8}  "
+          f"{'gzip s':>7}  {'peak MiB':>8}  {'gzip size':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in [5_000, 20_000, 50_000]:
+            store = JournalStore(os.path.join(directory, f"journal_{count}.sqlite3"))
+            store.add_many(make_entries(count))
+
+            memory_seconds, memory_peak = measure(lambda: export_in_memory(store))
+            stream_seconds, stream_peak = measure(lambda: export_streaming(store, compress=False))
+            gzip_seconds, gzip_peak = measure(lambda: export_streaming(store, compress=True))
+            gzip_size = export_streaming(store, compress=True) / 2**20
+
+            print(f"{count:>8}  {memory_seconds:>11.2f}  {memory_peak:>8.1f}  {stream_seconds:>8.2f}  "
+                  f"{stream_peak:>8.1f}  {gzip_seconds:>7.2f}  {gzip_peak:>8.1f}  {gzip_size:>7.1f}MB")
+
+if __name__ == "__main__":
+    main()
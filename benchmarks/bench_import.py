@@ -0,0 +1,95 @@
+"""
+Compare time and peak memory of the old double-parse import with the streaming importer.
+
+Each import runs in a fresh subprocess so peak RSS is measured separately.
+
+Run from the project root:
+    python benchmarks/bench_import.py [entries ...]
+"""
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_import import ExportReader, validate_entry
+from utils.data_storage import write_export
+from utils.journal_store import JournalStore
+from bench_emotion_index import make_entry
+
+def iter_entries(count, seed=0):
+    """Yield count synthetic entries without holding them all in memory."""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'id': i + 1,
+            'date': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'time': '09:00',
+            'module': rng.randint(1, 5),
+            'lesson': rng.randint(1, 4),
+            'prompt': 'Reflect on your day.',
+            'content': make_entry(60, seed=i),
+            'sentiment': {'compound': 0.5, 'pos': 0.2, 'neu': 0.8, 'neg': 0.0,
+                          'category': 'positive', 'emotions': {'joy': 60.0, 'hope': 40.0}},
+            'themes': ['journey', 'friend', 'morning']
+        }
+
+def import_old(path, store):
+    """Decode, validate with json.loads, parse again, then insert the full list."""
+    with open(path, 'rb') as export_file:
+        contents = export_file.read().decode()
+    json.loads(contents)
+    data = json.loads(contents)
+    return store.replace_all(data.get('journal_entries', []))
+
+def import_streaming(path, store):
+    """Parse once, validate each entry and insert in batches."""
+    with open(path, 'rb') as export_file:
+        reader = ExportReader(io.TextIOWrapper(export_file, encoding='utf-8'))
+        return store.replace_all(entry for entry in reader.entries() if not validate_entry(entry))
+
+def run_child(mode, path):
+    """Import path with one approach and print seconds and peak RSS in MiB."""
+    with tempfile.TemporaryDirectory() as directory:
+        store = JournalStore(os.path.join(directory, 'journal.sqlite3'))
+        start = time.perf_counter()
+        count = (import_old if mode == 'old' else import_streaming)(path, store)
+        seconds = time.perf_counter() - start
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'count': count, 'seconds': seconds, 'peak_mib': peak_mib}))
+
+def measure(mode, path):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode, path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3])
+        return
+
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'entries':>8}  {'file MB':>8}  {'old s':>7}  {'old MiB':>8}  {'stream s':>8}  {'stream MiB':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            path = os.path.join(directory, f"export_{count}.json")
+            with open(path, 'wb') as export_file:
+                write_export(export_file, {'user_name': 'User'}, iter_entries(count))
+
+            old = measure('old', path)
+            streaming = measure('streaming', path)
+            assert old['count'] == streaming['count'] == count
+            print(f"{count:>8}  {os.path.getsize(path) / 1e6:>8.1f}  {old['seconds']:>7.2f}  "
+                  f"{old['peak_mib']:>8.0f}  {streaming['seconds']:>8.2f}  {streaming['peak_mib']:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare the memory of 10k journal entries as dicts versus JournalEntry records.
+
+Run from the project root:
+    python benchmarks/bench_journal_entry.py [entries]
+"""
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.journal_entry import JournalEntry
+from utils.sentiment_analysis import SentimentAnalyzer
+from bench_emotion_index import make_entry
+
+PROMPTS = [f"Reflect on lesson {i} and what it brought up for you." for i in range(20)]
+
+def make_entries(count, seed=0):
+    """Build count entries in the saved dict shape, as they come back from JSON."""
+    rng = random.Random(seed)
+    analyzer = SentimentAnalyzer()
+    analyses = [analyzer.analyze_entry(make_entry(60, seed=i)) for i in range(200)]
+    entries = []
+    for i in range(count):
+        analysis = analyses[i % len(analyses)]
+        entries.append({
+            'id': i + 1,
+            'date': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'time': f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            'module': rng.randint(1, 5),
+            'lesson': rng.randint(1, 4),
+            'prompt': rng.choice(PROMPTS),
+            'content': make_entry(60, seed=i),
+            'sentiment': analysis['sentiment'] if analysis['sentiment']['emotions'] else
+                         dict(analysis['sentiment'], emotions={'neutral': 50}),
+            'themes': analysis['themes']
+        })
+    # Every entry parsed separately, as when loaded from storage
+    return [json.loads(payload) for payload in map(json.dumps, entries)]
+
+def traced(build):
+    """Return (result, MiB retained by it) for one call of build()."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size / 2**20
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    payloads = [json.dumps(entry) for entry in make_entries(count)]
+
+    dicts, dict_mib = traced(lambda: [json.loads(payload) for payload in payloads])
+    records, record_mib = traced(lambda: [JournalEntry.from_dict(json.loads(payload)) for payload in payloads])
+    assert all(record.to_dict() == entry for record, entry in zip(records, dicts))
+
+    content_mib = sum(sys.getsizeof(entry['content']) for entry in dicts) / 2**20
+    print(f"{count} entries, {content_mib:.2f} MiB of which is entry text")
+    print(f"{'layout':>12}  {'MiB':>8}  {'bytes/entry':>12}  {'excluding text':>14}")
+    for name, mib in [("dict", dict_mib), ("JournalEntry", record_mib)]:
+        print(f"{name:>12}  {mib:>8.2f}  {mib * 2**20 / count:>12,.0f}  "
+              f"{(mib - content_mib) * 2**20 / count:>14,.0f}")
+    print(f"JournalEntry uses {record_mib / dict_mib:.0%} of the dict layout")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark phrase matching time as the phrase lexicon grows.
+
+Run from the project root:
+    python benchmarks/bench_phrase_matcher.py
+"""
+import os
+import random
+import sys
+import time
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.phrase_matcher import PhraseMatcher
+from utils.sentiment_analysis import tokenize
+from bench_emotion_index import VOCABULARY, make_entry
+
+def random_phrases(count, seed=0):
+    """Build count distinct phrases of two to five words from the benchmark vocabulary."""
+    rng = random.Random(seed)
+    phrases = {}
+    while len(phrases) < count:
+        words = tuple(rng.choice(VOCABULARY) for _ in range(rng.randint(2, 5)))
+        phrases[words] = (("joy", 1.2),)
+    return phrases
+
+def main():
+    words = [word for sentence in tokenize(make_entry(100_000)) for word in sentence]
+    print(f"{'phrases':>8}  {'build (s)':>10}  {'match (s)':>10}  {'tokens/sec':>12}  {'matches':>8}")
+    for count in [10, 100, 1_000, 10_000]:
+        start = time.perf_counter()
+        matcher = PhraseMatcher(random_phrases(count))
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matches = matcher.find(words)
+        match = time.perf_counter() - start
+        print(f"{count:>8}  {build:>10.4f}  {match:>10.4f}  {len(words) / match:>12,.0f}  {len(matches):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Check that incrementally maintained rollups equal a rebuild from scratch, that
+the day/week/month/year pyramid covers any range exactly in a few buckets, and
+compare period summaries from rollup buckets with rescanning every entry.
+
+Run from the project root:
+    python benchmarks/bench_rollups.py [entries]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.journal_entry import day_ordinal
+from utils.rollups import RollupBucket, Rollups
+from bench_journal_entry import make_entries
+
+PERIODS = {'week': 7, 'month': 30, 'year': 365, '3 years': 3 * 365}
+
+def rescan(entries, start_date, end_date):
+    """Summarise a period by filtering and walking every entry."""
+    first, last = start_date.toordinal(), end_date.toordinal()
+    return Rollups.from_entries(
+        entry for entry in entries if first <= (day_ordinal(entry.get('date')) or 0) <= last
+    ).total()
+
+def summary(bucket):
+    """The numbers the weekly summary shows."""
+    return (bucket.entries, bucket.words, bucket.category_counts(),
+            bucket.average_emotions('emotional'), bucket.average_emotions('present'))
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = random.Random(1)
+    entries = make_entries(count)
+    start = date(2022, 1, 1)
+    for entry in entries:
+        entry['date'] = (start + timedelta(days=rng.randrange(3 * 365))).isoformat()
+
+    # Saves arrive one at a time and in any order; a rebuild reads them all at once
+    incremental = Rollups()
+    for entry in rng.sample(entries, len(entries)):
+        incremental.add(entry)
+    rebuilt = Rollups.from_entries(entries)
+    assert incremental == rebuilt
+    print(f"{count} entries: incremental rollups equal the rebuild ({len(rebuilt.days)} day, "
+          f"{len(rebuilt.weeks)} week, {len(rebuilt.months)} month and {len(rebuilt.years)} year buckets)")
+
+    # Years, months and weeks plus ragged days give the same totals as day buckets alone
+    most_nodes = 0
+    for _ in range(500):
+        first = start + timedelta(days=rng.randrange(3 * 365))
+        last = first + timedelta(days=rng.randrange(4 * 365))
+        by_days = RollupBucket()
+        for _, bucket in rebuilt.daily(first, last):
+            by_days.merge(bucket)
+        assert rebuilt.between(first, last) == by_days
+        most_nodes = max(most_nodes, sum(1 for _ in rebuilt._cover(first, last)))
+    print(f"500 random ranges of up to 4 years match day sums, merging at most {most_nodes} buckets")
+
+    print(f"{'period':>8}  {'rescan ms':>10}  {'rollups ms':>10}  {'speedup':>8}")
+    for name, days in PERIODS.items():
+        first = date(2023, 3, 1)
+        last = first + timedelta(days=days - 1)
+
+        begin = time.perf_counter()
+        scanned = rescan(entries, first, last)
+        scan_ms = (time.perf_counter() - begin) * 1000
+
+        repeats = 200
+        begin = time.perf_counter()
+        for _ in range(repeats):
+            merged = rebuilt.between(first, last)
+        rollup_ms = (time.perf_counter() - begin) * 1000 / repeats
+
+        assert summary(scanned) == summary(merged)
+        print(f"{name:>8}  {scan_ms:>10.1f}  {rollup_ms:>10.3f}  {scan_ms / rollup_ms:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
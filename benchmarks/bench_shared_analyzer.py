@@ -0,0 +1,42 @@
+"""
+Benchmark the per-rerun cost of getting a sentiment analyzer on the Journal page.
+
+Compares building NLTK's analyzer from its lexicon text file (what each rerun
+used to do), building a SentimentAnalyzer from the bundled lexicon, and
+fetching the process-wide shared analyzer.
+
+Run from the project root:
+    python benchmarks/bench_shared_analyzer.py
+"""
+import os
+import sys
+import time
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from utils.sentiment_analysis import SentimentAnalyzer, get_shared_analyzer
+
+def per_call_ms(func, repeat):
+    """Return the mean wall-clock milliseconds of func() over repeat calls."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    start = time.perf_counter()
+    get_shared_analyzer()
+    print(f"first get_shared_analyzer() (build + warm-up): {(time.perf_counter() - start) * 1000:.3f} ms")
+
+    try:
+        nltk_ms = per_call_ms(SentimentIntensityAnalyzer, 20)
+        print(f"SentimentIntensityAnalyzer() from NLTK data:    {nltk_ms:.3f} ms per rerun")
+    except LookupError:
+        print("SentimentIntensityAnalyzer() from NLTK data:    skipped (vader_lexicon not installed)")
+    print(f"SentimentAnalyzer() from bundled lexicon:       {per_call_ms(SentimentAnalyzer, 2_000):.4f} ms per rerun")
+    print(f"get_shared_analyzer():                          {per_call_ms(get_shared_analyzer, 100_000):.5f} ms per rerun")
+
+if __name__ == "__main__":
+    main()
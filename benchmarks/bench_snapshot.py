@@ -0,0 +1,86 @@
+"""
+Compare the binary snapshot with the JSON export: file size, save time,
+load time (decoding only) and full restore time into a fresh journal store.
+
+Run from the project root:
+    python benchmarks/bench_snapshot.py [entries ...]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_import import ExportReader, validate_entry
+from utils.data_storage import write_export
+from utils.journal_store import JournalStore
+from utils.rollups import Rollups
+from utils.snapshot import read_snapshot, write_snapshot
+from bench_export import SETTINGS
+from bench_journal_entry import make_entries
+
+def timed(func):
+    """Return (result, seconds) for one call of func()."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def save_json(store, compress):
+    buffer = io.BytesIO()
+    write_export(buffer, SETTINGS, store.iter_entries(), compress=compress)
+    return buffer.getvalue()
+
+def save_snapshot(store):
+    buffer = io.BytesIO()
+    write_snapshot(buffer, SETTINGS, store.iter_entries())
+    return buffer.getvalue()
+
+def load_json(data):
+    reader = ExportReader(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8'))
+    return [entry for entry in reader.entries() if not validate_entry(entry)]
+
+def load_snapshot(data):
+    return read_snapshot(io.BytesIO(data))[1]
+
+def restore(entries, path):
+    """Replace the journal at path and rebuild the rollups, as an import does."""
+    store = JournalStore(path)
+    store.replace_all(entries)
+    Rollups.from_entries(entries)
+    return store.count()
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 50_000]
+    print(f"{'entries':>8}  {'format':<9}  {'size MB':>8}  {'save s':>7}  {'load s':>7}  {'restore s':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            store = JournalStore(os.path.join(directory, f"source_{count}.sqlite3"))
+            store.add_many(make_entries(count))
+
+            rows = []
+            for name, save, load in [
+                ('json', lambda: save_json(store, compress=False), load_json),
+                ('json.gz', None, None),
+                ('snapshot', lambda: save_snapshot(store), load_snapshot),
+            ]:
+                if save is None:
+                    data, save_seconds = timed(lambda: save_json(store, compress=True))
+                    rows.append((name, len(data), save_seconds, None, None))
+                    continue
+                data, save_seconds = timed(save)
+                entries, load_seconds = timed(lambda: load(data))
+                target = os.path.join(directory, f"restore_{name}_{count}.sqlite3")
+                restored, restore_seconds = timed(lambda: restore(entries, target))
+                assert restored == count
+                rows.append((name, len(data), save_seconds, load_seconds, load_seconds + restore_seconds))
+
+            for name, size, save_seconds, load_seconds, restore_seconds in rows:
+                load_text = f"{load_seconds:>7.2f}" if load_seconds is not None else f"{'-':>7}"
+                restore_text = f"{restore_seconds:>9.2f}" if restore_seconds is not None else f"{'-':>9}"
+                print(f"{count:>8}  {name:<9}  {size / 1e6:>8.1f}  {save_seconds:>7.2f}  {load_text}  {restore_text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark peak memory and time of whole-text versus streaming analysis.
+
+Run from the project root:
+    python benchmarks/bench_stream.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_analysis import SentimentAnalyzer, iter_text_chunks
+from bench_emotion_index import make_entry
+
+def measure(func):
+    """Return (seconds, peak MiB allocated) for one call of func()."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+def main():
+    analyzer = SentimentAnalyzer()
+    print(f"{'MiB text':>9}  {'entry s':>8}  {'entry peak':>10}  {'stream s':>8}  {'stream peak':>11}")
+    for word_count in [100_000, 400_000]:
+        text = make_entry(word_count)
+        entry_s, entry_peak = measure(lambda: analyzer.analyze_entry(text))
+        stream_s, stream_peak = measure(lambda: analyzer.analyze_stream(iter_text_chunks(text)))
+        print(f"{len(text) / 2**20:>9.1f}  {entry_s:>8.2f}  {entry_peak:>8.1f}MB  "
+              f"{stream_s:>8.2f}  {stream_peak:>9.1f}MB")
+
+if __name__ == "__main__":
+    main()
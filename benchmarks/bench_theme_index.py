@@ -0,0 +1,64 @@
+"""
+Benchmark TF-IDF theme ranking and indexing as the journal grows.
+
+Ranking and adding a new entry should cost the same at every journal size.
+
+Run from the project root:
+    python benchmarks/bench_theme_index.py
+"""
+import os
+import random
+import sys
+import time
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.theme_index import ThemeIndex
+
+def make_vocabulary(size, seed=0):
+    """Build size distinct pseudo-words of five to ten letters."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 10))))
+    return sorted(words)
+
+def make_terms(vocabulary, rng, word_count=150):
+    """Count theme words of a synthetic entry, drawn with a Zipf-like skew."""
+    terms = {}
+    for _ in range(word_count):
+        word = vocabulary[int(len(vocabulary) * rng.random() ** 3)]
+        terms[word] = terms.get(word, 0) + 1
+    return terms
+
+def main():
+    vocabulary = make_vocabulary(20_000)
+    rng = random.Random(1)
+    new_entries = [make_terms(vocabulary, rng) for _ in range(200)]
+
+    index = ThemeIndex()
+    print(f"{'entries':>8}  {'rank us':>10}  {'add us':>10}  {'vocabulary':>10}")
+    for target in [1_000, 10_000, 100_000]:
+        while index.document_count < target:
+            index.add_document(make_terms(vocabulary, rng))
+
+        start = time.perf_counter()
+        for terms in new_entries:
+            index.rank(terms)
+        rank_seconds = (time.perf_counter() - start) / len(new_entries)
+
+        # Time adds on a scratch copy so every size starts from the same journal
+        scratch = ThemeIndex()
+        scratch.vocabulary = dict(index.vocabulary)
+        scratch.document_frequency = index.document_frequency.copy()
+        scratch.document_count = index.document_count
+        start = time.perf_counter()
+        for terms in new_entries:
+            scratch.add_document(terms)
+        add_seconds = (time.perf_counter() - start) / len(new_entries)
+
+        print(f"{target:>8}  {rank_seconds * 1e6:>10.1f}  {add_seconds * 1e6:>10.1f}  {len(index.vocabulary):>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Benchmark the combined cost of analyzing an entry: sentiment, emotions and themes.
+
+Run from the project root:
+    python benchmarks/bench_tokenizer.py
+"""
+import os
+import sys
+import time
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_analysis import SentimentAnalyzer
+from bench_emotion_index import make_entry
+
+def best_of(func, repeat):
+    """Return the best wall-clock seconds of func() over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    analyzer = SentimentAnalyzer()
+    print(f"{'words':>8}  {'emotions+themes (s)':>20}  {'analyze_entry (s)':>18}")
+    for word_count, repeat in [(1_000, 30), (10_000, 10), (100_000, 3)]:
+        text = make_entry(word_count)
+        local = best_of(lambda: (analyzer.detect_emotions(text), analyzer.extract_themes(text)), repeat)
+        combined = best_of(lambda: analyzer.analyze_entry(text), repeat)
+        print(f"{word_count:>8}  {local:>20.4f}  {combined:>18.4f}")
+
+if __name__ == "__main__":
+    main()
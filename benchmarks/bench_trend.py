@@ -0,0 +1,71 @@
+"""
+Size of the Emotional Trends figure sent to the browser: one point per day
+and emotion, as the chart used to draw, against the resampled and
+LTTB-capped lines, for ranges from a month to several years.
+
+Run from the project root:
+    python benchmarks/bench_trend.py [entries per day]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages.weekly_summary import emotion_trend_figure
+from utils.rollups import Rollups
+from utils.trend import MAX_TREND_POINTS, choose_frequency, emotion_series, lttb
+
+EMOTIONS = ('joy', 'sadness', 'anger', 'fear', 'hope')
+RANGES = {'month': 30, 'quarter': 91, 'year': 365, '3 years': 3 * 365, '8 years': 8 * 365}
+
+def make_rollups(days, per_day, rng):
+    end = date(2025, 1, 1)
+    entries = [
+        {
+            'date': (end - timedelta(days=day)).isoformat(),
+            'content': 'word ' * 50,
+            'sentiment': {'category': 'positive', 'compound': 0.5,
+                          'emotions': {emotion: rng.uniform(0, 100) for emotion in EMOTIONS}},
+        }
+        for day in range(days) for _ in range(per_day)
+    ]
+    return Rollups.from_entries(entries), end
+
+def payload(series, frequency):
+    figure = emotion_trend_figure(series, frequency)
+    return len(figure.to_json()), sum(len(dates) for dates, _ in series.values())
+
+def main():
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    rng = random.Random(1)
+
+    # LTTB keeps the ends and exactly the requested number of points
+    xs = list(range(5000))
+    ys = [rng.random() for _ in xs]
+    kept = lttb(xs, ys, MAX_TREND_POINTS)
+    assert len(kept) == MAX_TREND_POINTS and kept[0] == 0 and kept[-1] == len(xs) - 1
+    assert kept == sorted(set(kept))
+
+    rollups, end = make_rollups(max(RANGES.values()), per_day, rng)
+    print(f"{per_day} entries a day, {len(EMOTIONS)} emotions")
+    print(f"{'range':>8}  {'daily pts':>9}  {'daily KB':>8}  {'auto':>5}  {'pts':>5}  {'KB':>6}  {'ms':>6}")
+    for name, days in RANGES.items():
+        start = end - timedelta(days=days - 1)
+        buckets = [(date.fromordinal(day), bucket) for day, bucket in rollups.daily(start, end)]
+        full_size, full_points = payload(emotion_series(buckets, 'day', max_points=10 ** 9), 'day')
+
+        frequency = choose_frequency(start, end)
+        begin = time.perf_counter()
+        series = emotion_series(buckets, frequency, window=3)
+        build_ms = (time.perf_counter() - begin) * 1000
+        size, points = payload(series, frequency)
+        assert points <= MAX_TREND_POINTS * len(EMOTIONS)
+        print(f"{name:>8}  {full_points:>9}  {full_size / 1024:>8.0f}  {frequency:>5}  {points:>5}  "
+              f"{size / 1024:>6.0f}  {build_ms:>6.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Save latency and throughput with each entry committed before the save
+returns, against the write-behind queue that gathers saves into group
+commits. Sessions are threads that each save ROUNDS entries for their user;
+afterwards every user's ids must be 1..n with no entry lost.
+
+Run from the project root:
+    python benchmarks/bench_write_behind.py [sessions] [flush intervals ...]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.journal_store import JournalStore, open_journal_pool, open_journal_writer
+from bench_emotion_index import make_entry
+
+ROUNDS = 40
+TODAY = date(2025, 1, 1)
+
+def run_session(pool, writer, user_id, session, barrier, latencies):
+    """Save ROUNDS entries as one session of user_id."""
+    store = JournalStore(user_id=user_id, pool=pool, writer=writer)
+    barrier.wait()
+    for i in range(ROUNDS):
+        start = time.perf_counter()
+        store.add({
+            'date': (TODAY - timedelta(days=i % 14)).isoformat(),
+            'time': '09:00',
+            'module': 1 + i % 5,
+            'lesson': 1 + i % 4,
+            'prompt': 'Reflect on your day.',
+            'content': make_entry(60, seed=session * ROUNDS + i),
+            'sentiment': {'compound': 0.5, 'pos': 0.2, 'neu': 0.8, 'neg': 0.0,
+                          'category': 'positive', 'emotions': {'joy': 60.0}},
+            'themes': ['journey']
+        })
+        latencies.append(time.perf_counter() - start)
+
+def measure(sessions, flush_interval, path):
+    pool = open_journal_pool(path, size=8)
+    writer = open_journal_writer(pool, flush_interval=flush_interval) if flush_interval is not None else None
+    users = [f"user{session // 2}" for session in range(sessions)]
+    barrier = threading.Barrier(sessions + 1)
+    latencies = []
+    threads = [
+        threading.Thread(target=run_session, args=(pool, writer, users[session], session, barrier, latencies))
+        for session in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    if writer is not None:
+        writer.close()
+    seconds = time.perf_counter() - start
+
+    for user_id in set(users):
+        ids = [entry['id'] for entry in JournalStore(user_id=user_id, pool=pool).iter_entries()]
+        assert ids == list(range(1, users.count(user_id) * ROUNDS + 1)), user_id
+
+    latencies.sort()
+    metrics = writer.metrics() if writer is not None else None
+    return {
+        'saves_per_s': len(latencies) / seconds,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000,
+        'commits': metrics['commits'] if metrics else len(latencies),
+        'commit_ms': metrics['avg_commit_ms'] if metrics else None,
+        'durable_ms': metrics['max_latency_ms'] if metrics else None,
+    }
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    intervals = [float(arg) for arg in sys.argv[2:]] or [0.01, 0.05]
+    print(f"{sessions} sessions, {ROUNDS} saves each")
+    print(f"{'mode':>14}  {'saves/s':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'commits':>7}  "
+          f"{'commit ms':>9}  {'max durable ms':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for flush_interval in [None] + intervals:
+            name = 'direct' if flush_interval is None else f"behind {flush_interval * 1000:g}ms"
+            result = measure(sessions, flush_interval, os.path.join(directory, f"{name}.sqlite3"))
+            commit_text = f"{result['commit_ms']:>9.2f}" if result['commit_ms'] is not None else f"{'-':>9}"
+            durable_text = f"{result['durable_ms']:>14.1f}" if result['durable_ms'] is not None else f"{'-':>14}"
+            print(f"{name:>14}  {result['saves_per_s']:>8.0f}  {result['p50_ms']:>7.2f}  "
+                  f"{result['p95_ms']:>7.2f}  {result['commits']:>7}  {commit_text}  {durable_text}")
+
+if __name__ == "__main__":
+    main()
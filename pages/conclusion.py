@@ -1,5 +1,4 @@
 import streamlit as st
-from datetime import datetime
 import pandas as pd
 import os
 import sys
@@ -10,7 +9,7 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 # Import utilities
-from utils.data_storage import initialize_session_state
+from utils.data_storage import get_journal_store, initialize_session_state
 
 def show_conclusion():
     """Show the conclusion page after completing all modules."""
@@ -39,18 +38,14 @@ def show_conclusion():
     """)
     
     # Display journal statistics
-    if len(st.session_state.journal_entries) > 0:
+    journal_store = get_journal_store()
+    entry_count = journal_store.count()
+    if entry_count > 0:
         # Count entries per module
-        entries_per_module = {}
-        for entry in st.session_state.journal_entries:
-            module = entry.get('module', 0)
-            if module in entries_per_module:
-                entries_per_module[module] += 1
-            else:
-                entries_per_module[module] = 1
+        entries_per_module = journal_store.count_by_module()
         
         # Show statistics
-        st.markdown(f"**Total Journal Entries:** {len(st.session_state.journal_entries)}")
+        st.markdown(f"**Total Journal Entries:** {entry_count}")
         
         # Create a dataframe for the module breakdown
         module_titles = [
@@ -75,12 +70,9 @@ def show_conclusion():
         # Display first and last entries to show growth
         st.markdown("### Your Journey From Start to Finish")
         
-        # Sort entries by timestamp
-        sorted_entries = sorted(st.session_state.journal_entries, key=lambda x: x.get('timestamp', datetime.now()))
-        
-        if len(sorted_entries) >= 2:
-            first_entry = sorted_entries[0]
-            last_entry = sorted_entries[-1]
+        if entry_count >= 2:
+            first_entry = journal_store.first(1)[0]
+            last_entry = journal_store.latest(1)[0]
             
             # First entry
             st.markdown("#### Your First Journal Entry")
@@ -4,6 +4,7 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import pandas as pd
 import random
+from utils.data_storage import get_journal_store
 
 def show_dashboard():
     st.header("Your Journey Dashboard")
@@ -36,14 +37,17 @@ def show_dashboard():
         
         # Next steps
         st.markdown("#### Next Steps")
-        if not st.session_state.journal_entries or datetime.strptime(st.session_state.journal_entries[-1]['date'], '%Y-%m-%d').date() < datetime.now().date():
+        journal_store = get_journal_store()
+        entry_count = journal_store.count()
+        last_entries = journal_store.latest(1)
+        if not last_entries or datetime.strptime(last_entries[-1]['date'], '%Y-%m-%d').date() < datetime.now().date():
             st.info("✏️ Complete today's journal entry")
         
-        if not st.session_state.journal_entries or len(st.session_state.journal_entries) < 7:
+        if not last_entries or entry_count < 7:
             st.info("🌱 Continue your journaling practice to see growth metrics")
         else:
             # Check if weekly summary is due
-            last_entry_date = datetime.strptime(st.session_state.journal_entries[-1]['date'], '%Y-%m-%d')
+            last_entry_date = datetime.strptime(last_entries[-1]['date'], '%Y-%m-%d')
             days_since_last_entry = (datetime.now() - last_entry_date).days
             
             if days_since_last_entry > 6:
@@ -100,12 +104,10 @@ def show_dashboard():
     st.markdown("---")
     
     # Recent journal entries
-    if st.session_state.journal_entries:
+    recent_entries = get_journal_store().latest(3)  # Last 3 entries
+    if recent_entries:
         st.subheader("Recent Journal Entries")
         
-        # Create dataframe for recent entries
-        recent_entries = st.session_state.journal_entries[-3:]  # Last 3 entries
-        
         for entry in reversed(recent_entries):
             date_str = datetime.strptime(entry['date'], '%Y-%m-%d').strftime('%b %d, %Y')
             module_lesson = f"Module {entry['module']}, Lesson {entry['lesson']}"
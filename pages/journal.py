@@ -1,12 +1,18 @@
 import streamlit as st
 from datetime import datetime
 import random
-from utils.sentiment_analysis import SentimentAnalyzer
-from utils.data_storage import save_journal_entry
+from utils.sentiment_analysis import DraftAnalyzer, get_shared_analyzer, iter_text_chunks
+from utils.analysis_cache import DEFAULT_METHOD, get_analysis_cache
+from utils.data_storage import clear_journal, get_theme_index, save_journal_entry
+
+# Entries longer than this are analyzed as a stream instead of sentence by sentence
+STREAMING_ANALYSIS_CHARS = 200000
 
 def clear_input_field():
     """Clear only the journal input field and its associated analysis"""
     st.session_state.journal_content = ""
+    if 'draft_analyzer' in st.session_state:
+        del st.session_state.draft_analyzer
     if 'last_analyzed_content' in st.session_state:
         del st.session_state.last_analyzed_content
     if 'last_sentiment_data' in st.session_state:
@@ -22,9 +28,8 @@ def clear_input_field():
     st.success("Journal input field cleared. You can start a new entry.")
 
 def clear_journal_entries():
-    """Clear all journal entries from session state"""
-    if 'journal_entries' in st.session_state:
-        st.session_state.journal_entries = []
+    """Clear all journal entries from the journal store"""
+    clear_journal()
     if 'last_analyzed_content' in st.session_state:
         del st.session_state.last_analyzed_content
     if 'last_sentiment_data' in st.session_state:
@@ -83,8 +88,12 @@ def show_journal():
         </script>
     """, unsafe_allow_html=True)
     
-    # Initialize sentiment analyzer
-    sentiment_analyzer = SentimentAnalyzer()
+    # Sentiment analyzer shared by all sessions in this process
+    sentiment_analyzer = get_shared_analyzer()
+    
+    # Per-sentence results for the draft, so edits only re-score changed sentences
+    if 'draft_analyzer' not in st.session_state:
+        st.session_state.draft_analyzer = DraftAnalyzer(sentiment_analyzer)
     
     # Add clear input button in the sidebar with clarifying tooltip
     if st.sidebar.button("Clear Journal Input", help="Reset the journal input field to write a new entry. Your previously saved entries will remain intact."):
@@ -161,11 +170,20 @@ def show_journal():
             # If this is a new analysis or content has changed
             if not hasattr(st.session_state, "last_analyzed_content") or st.session_state.last_analyzed_content != content:
                 with st.spinner("Analyzing your journal entry..."):
-                    # Analyze sentiment
-                    sentiment_data = sentiment_analyzer.analyze_sentiment(content)
-                    
-                    # Extract themes
-                    themes = sentiment_analyzer.extract_themes(content)
+                    # Analyze sentiment and extract themes, reusing any earlier result for this text
+                    if len(content) > STREAMING_ANALYSIS_CHARS:
+                        # Very large pastes: bounded memory, no per-sentence draft state.
+                        # Cached on its own: runs over MAX_STREAM_SENTENCE_CHARS without
+                        # punctuation are scored in pieces, unlike analyze_entry()
+                        analyze = lambda text: sentiment_analyzer.analyze_stream(iter_text_chunks(text))
+                        method = 'stream'
+                    else:
+                        analyze = st.session_state.draft_analyzer.analyze
+                        method = DEFAULT_METHOD
+                    analysis = get_analysis_cache().get_or_compute(content, analyze, method=method)
+                    sentiment_data = analysis["sentiment"]
+                    # Rank themes against the whole journal so common words don't dominate
+                    themes = get_theme_index().rank(analysis["terms"])
                     
                     # Generate reflections
                     reflections = sentiment_analyzer.generate_reflection_suggestions(sentiment_data)
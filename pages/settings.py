@@ -1,7 +1,10 @@
 import streamlit as st
-import json
+import tempfile
 from datetime import datetime
-from utils.data_storage import export_user_data, import_user_data
+from utils.data_storage import (
+    clear_journal, get_journal_writer, import_user_data_stream, write_user_data, write_user_snapshot
+)
+from utils.analysis_cache import get_analysis_cache
 
 def show_settings():
     st.header("Settings")
@@ -35,16 +38,35 @@ def show_settings():
     st.subheader("Data Management")
     
     # Export data
+    export_format = st.radio(
+        "Export format",
+        ["JSON", "Binary snapshot"],
+        horizontal=True,
+        help="Snapshots are smaller and restore much faster; JSON is readable by other tools"
+    )
+    compress_export = st.checkbox("Compress export (gzip)", value=True, disabled=export_format != "JSON")
     if st.button("Export Your Data"):
-        data_json = export_user_data()
-        
-        # Create a download link
-        filename = f"conscious_journal_data_{datetime.now().strftime('%Y%m%d')}.json"
+        # The export is written to a temporary file piece by piece, but
+        # st.download_button only takes the whole payload, which Streamlit keeps
+        # in memory until the download; that one copy is the compressed size
+        filename = f"conscious_journal_data_{datetime.now().strftime('%Y%m%d')}"
+        with tempfile.TemporaryFile() as export_file:
+            if export_format == "JSON":
+                write_user_data(export_file, compress=compress_export)
+            else:
+                write_user_snapshot(export_file)
+            export_file.seek(0)
+            export_bytes = export_file.read()
+        st.caption(f"Export size: {len(export_bytes) / 1024 / 1024:.1f} MB")
         
-        # Convert JSON to bytes and create a download link
-        b64 = base64_encode_data(data_json)
-        href = f'<a href="data:application/json;base64,{b64}" download="{filename}">Download JSON</a>'
-        st.markdown(href, unsafe_allow_html=True)
+        # Streamlit serves the bytes itself, no base64 data URI needed
+        if export_format != "JSON":
+            label, file_name, mime = "Download Snapshot", filename + ".tjsnap", "application/octet-stream"
+        elif compress_export:
+            label, file_name, mime = "Download JSON", filename + ".json.gz", "application/gzip"
+        else:
+            label, file_name, mime = "Download JSON", filename + ".json", "application/json"
+        st.download_button(label, data=export_bytes, file_name=file_name, mime=mime)
         
         st.success("Data exported successfully!")
     
@@ -52,42 +74,73 @@ def show_settings():
     st.markdown("### Import Data")
     st.info("""
     This feature allows you to restore your journal entries and settings from a previously exported file.
-    The file should be a JSON file that was exported from this app.
+    The file should be a JSON file or binary snapshot that was exported from this app.
     """)
     
     uploaded_file = st.file_uploader(
-        "Upload your journal data JSON file",
-        type=["json"],
-        help="Select a JSON file that was previously exported from Your Conscious Journal"
+        "Upload your journal data file",
+        type=["json", "gz", "tjsnap"],
+        help="Select a JSON file (or compressed .json.gz) or a .tjsnap snapshot that was previously exported from Your Conscious Journal"
     )
     
     if uploaded_file is not None:
-        try:
-            # Read the file contents
-            file_contents = uploaded_file.getvalue().decode()
+        # Confirm import; the file is parsed and validated once, while importing
+        if st.button("Import Data"):
+            progress_bar = st.progress(0.0, text="Importing journal entries...")
             
-            # Validate JSON structure before importing
-            try:
-                json.loads(file_contents)
-                
-                # Show preview of data
-                st.success("File validated successfully!")
-                
-                # Confirm import
-                if st.button("Import Data"):
-                    success = import_user_data(file_contents)
-                    
-                    if success:
-                        st.success("✅ Data imported successfully! The page will refresh in a moment...")
-                        st.rerun()
-                    else:
-                        st.error("❌ Failed to import data. Please ensure this is a valid export file.")
-            except json.JSONDecodeError:
-                st.error("❌ Invalid JSON file. Please upload a file that was exported from Your Conscious Journal.")
-                
-        except Exception as e:
-            st.error(f"❌ Error reading file: {str(e)}")
-            st.info("💡 Try downloading a fresh export and importing that file instead.")
+            def show_progress(imported):
+                fraction = min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0)
+                progress_bar.progress(fraction, text=f"Imported {imported:,} journal entries...")
+            
+            report = import_user_data_stream(uploaded_file, progress=show_progress)
+            
+            if report is not None:
+                progress_bar.progress(1.0, text=f"Imported {report['imported']:,} journal entries")
+                if report['skipped']:
+                    st.warning(
+                        f"Skipped {report['skipped']:,} invalid entries:\n\n"
+                        + "\n".join(f"- {problem}" for problem in report['problems'])
+                    )
+                    st.success("✅ Data imported successfully!")
+                else:
+                    st.success("✅ Data imported successfully! The page will refresh in a moment...")
+                    st.rerun()
+            else:
+                st.error("❌ Failed to import data. Please ensure this is a valid export file.")
+                st.info("💡 Try downloading a fresh export and importing that file instead.")
+    
+    # Analysis cache statistics
+    st.markdown("### Analysis Cache")
+    cache_stats = get_analysis_cache().stats
+    cache_col1, cache_col2, cache_col3 = st.columns(3)
+    with cache_col1:
+        st.metric("Memory Hits", cache_stats['memory_hits'])
+    with cache_col2:
+        st.metric("Disk Hits", cache_stats['disk_hits'])
+    with cache_col3:
+        st.metric("Misses", cache_stats['misses'])
+    
+    if st.button("Clear Analysis Cache", help="Previously analyzed entries will be analyzed again next time"):
+        get_analysis_cache().clear()
+        st.success("Analysis cache cleared!")
+    
+    # Write-behind queue statistics
+    st.markdown("### Write Queue")
+    writer_stats = get_journal_writer().metrics()
+    queue_col1, queue_col2, queue_col3 = st.columns(3)
+    with queue_col1:
+        st.metric("Waiting to Save", writer_stats['queue_depth'],
+                  help=f"Most ever waiting: {writer_stats['max_depth']}")
+    with queue_col2:
+        st.metric("Commit Time", f"{writer_stats['avg_commit_ms']:.1f} ms",
+                  help=f"{writer_stats['commits']} commits of {writer_stats['avg_batch']:.1f} entries on average")
+    with queue_col3:
+        st.metric("Save Latency", f"{writer_stats['last_latency_ms']:.0f} ms",
+                  help=f"Slowest: {writer_stats['max_latency_ms']:.0f} ms")
+    if writer_stats['failed']:
+        st.error(f"{writer_stats['failed']} entries could not be saved. Last error: {writer_stats['last_error']}")
+    elif writer_stats['last_error']:
+        st.warning(f"Saving is being retried: {writer_stats['last_error']}")
     
     # Reset data
     st.markdown("---")
@@ -109,6 +162,8 @@ def show_settings():
         
         with col2:
             if st.button("Yes, Reset Data"):
+                clear_journal()
+                
                 # Reset session state
                 for key in list(st.session_state.keys()):
                     if key not in ["user_name", "dark_mode", "voice_input_enabled", "email_notifications"]:
@@ -132,16 +187,3 @@ def show_settings():
     
     Based on the "From Crisis to Creating" coaching methodology.
     """)
-
-def base64_encode_data(data_string):
-    """
-    Encode a string as base64.
-    
-    Args:
-        data_string (str): The string to encode
-        
-    Returns:
-        str: The base64-encoded string
-    """
-    import base64
-    return base64.b64encode(data_string.encode()).decode()
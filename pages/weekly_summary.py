@@ -3,112 +3,277 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import pandas as pd
+from utils.data_storage import (
+    SUMMARY_CACHE_SIZE, get_journal_store, get_period_entries, get_period_summary, period_key
+)
 from utils.pdf_generator import PDFGenerator
+from utils.trend import choose_frequency, emotion_series
 import base64
 
-def find_dominant_emotion(emotions):
-    """Safely find the dominant emotion from a dictionary of emotions."""
-    if not emotions or not isinstance(emotions, dict) or len(emotions) == 0:
+# Entry previews drawn per page of the listing
+ENTRIES_PER_PAGE = 10
+
+# Trend chart choices: label -> resampling frequency (None picks one from the range)
+TREND_RESOLUTIONS = {'Auto': None, 'Daily': 'day', 'Weekly': 'week', 'Monthly': 'month'}
+# Label -> points in the trailing rolling mean
+TREND_SMOOTHING = {'None': 1, '3 periods': 3, '7 periods': 7}
+
+def rank_emotions(averages):
+    """Return (Emotion, value) pairs with a positive value, strongest first."""
+    emotion_percentages = {k.capitalize(): v for k, v in averages.items() if v > 0}
+    return sorted(emotion_percentages.items(), key=lambda x: x[1], reverse=True)
+
+def emotion_distribution_figure(avg_emotions):
+    """Bar chart of the average of each emotion, or None without emotion data."""
+    if not avg_emotions:
         return None
-        
-    try:
-        # Sort emotions by value and get the highest one
-        sorted_emotions = sorted(emotions.items(), key=lambda x: x[1], reverse=True)
-        if sorted_emotions:
-            return sorted_emotions[0][0]
-    except Exception:
-        pass
-    
-    return None
+    
+    # Create DataFrame for visualization, sorted by value
+    emotion_df = pd.DataFrame({
+        'Emotion': list(avg_emotions.keys()),
+        'Value': list(avg_emotions.values())
+    }).sort_values('Value', ascending=False)
+    
+    fig = px.bar(
+        emotion_df, 
+        x='Emotion', 
+        y='Value',
+        title='Emotion Distribution',
+        labels={'Value': 'Intensity', 'Emotion': ''},
+        color='Emotion'
+    )
+    
+    # Customize layout
+    fig.update_layout(
+        xaxis_title=None,
+        yaxis_title='Average Intensity',
+        showlegend=False
+    )
+    return fig
 
-def show_emotion_summary(entries):
-    """Show summary of emotions from journal entries."""
-    if not entries:
-        st.info("No journal entries found for the selected period.")
-        return
+def emotion_trend_figure(series, frequency):
+    """Line chart of each emotion per day, week or month, or None without emotion data."""
+    # One point per period and emotion, at most MAX_TREND_POINTS per emotion
+    emotion_data = [
+        {'Date': day, 'Emotion': emotion.capitalize(), 'Value': value}
+        for emotion, (dates, values) in series.items()
+        for day, value in zip(dates, values)
+    ]
+    if not emotion_data:
+        return None
     
-    # Collect emotions across all entries with robust validation
-    all_emotions = {}
-    entries_with_emotions = 0
+    per = {'day': 'Daily', 'week': 'Weekly', 'month': 'Monthly'}[frequency]
+    
+    fig = px.line(
+        pd.DataFrame(emotion_data),
+        x='Date',
+        y='Value',
+        color='Emotion',
+        title=f"Emotional Content Over Time ({per} Average)",
+        labels={'Value': 'Intensity (%)', 'Date': ''},
+        line_shape='spline',
+        color_discrete_map={
+            'Joy': '#FFC107',
+            'Sadness': '#2196F3',
+            'Anger': '#F44336',
+            'Fear': '#9C27B0',
+            'Hope': '#4CAF50'
+        }
+    )
+    
+    fig.update_layout(
+        legend_title_text='',
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="white"),
+        hovermode="x unified"
+    )
+    return fig
+
+def mood_figure(moods):
+    """Horizontal bar chart of mood shares, highest first, or None without entries."""
+    if not moods:
+        return None
     
-    for entry in entries:
-        if not isinstance(entry, dict):
-            continue
-            
-        # Handle different data structures for sentiment
-        sentiment = None
-        if 'sentiment_data' in entry:
-            sentiment = entry['sentiment_data']
-        elif 'sentiment' in entry:
-            sentiment = entry['sentiment']
-        
-        if not sentiment or not isinstance(sentiment, dict):
-            continue
-            
-        emotions = sentiment.get('emotions', {})
-        if not isinstance(emotions, dict) or not emotions:
-            continue
-            
-        # Count entries that actually have emotions data
-        entries_with_emotions += 1
-        
-        # Aggregate emotions
-        for emotion, value in emotions.items():
-            if isinstance(emotion, str) and isinstance(value, (int, float)):
-                all_emotions[emotion] = all_emotions.get(emotion, 0) + value
+    sorted_categories = [category.capitalize() for category, _ in moods]
+    sorted_percentages = [percentage for _, percentage in moods]
+    
+    # Color mapping
+    color_map = {
+        "Positive": "#4CAF50",  # Green
+        "Negative": "#F44336",  # Red
+        "Neutral": "#2196F3"    # Blue
+    }
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=sorted_percentages,
+        y=sorted_categories,
+        orientation='h',
+        marker_color=[color_map[cat] for cat in sorted_categories],
+        text=[f"{p:.1f}%" for p in sorted_percentages],
+        textposition='auto'
+    ))
+    
+    fig.update_layout(
+        title="Overall Mood Distribution in Journal Entries",
+        xaxis_title="Percentage of Entries",
+        yaxis_title="Mood Category",
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="white"),
+        height=250,
+        margin=dict(l=20, r=20, t=40, b=20),
+        xaxis=dict(
+            range=[0, 100],
+            ticksuffix="%"
+        )
+    )
+    return fig
+
+def emotion_intensity_figure(sorted_emotions):
+    """Horizontal bar chart of ranked emotion intensities, or None if there are none."""
+    if not sorted_emotions:
+        return None
+    
+    emotions = [e[0] for e in sorted_emotions]
+    intensities = [e[1] for e in sorted_emotions]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=intensities,
+        y=emotions,
+        orientation='h',
+        marker_color=[
+            '#FFC107' if e == 'Joy' else
+            '#4CAF50' if e == 'Hope' else
+            '#F44336' if e == 'Anger' else
+            '#2196F3' if e == 'Sadness' else
+            '#9C27B0' for e in emotions
+        ],
+        text=[f"{v:.1f}%" for v in intensities],
+        textposition='auto'
+    ))
+    
+    fig.update_layout(
+        title="Emotional Intensity Distribution",
+        xaxis_title="Intensity (%)",
+        yaxis_title="Emotion",
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="white"),
+        height=250,
+        margin=dict(l=20, r=20, t=40, b=20),
+        xaxis=dict(
+            range=[0, 100],
+            ticksuffix="%"
+        )
+    )
+    return fig
+
+@st.cache_data(max_entries=SUMMARY_CACHE_SIZE, show_spinner=False)
+def build_summary_figures(summary_key, _stats):
+    """
+    Build every chart on the page for a period summary.
+    
+    Cached on summary_key, (user, start date, end date, data version), so
+    reruns that change neither the period nor the journal reuse the figures.
+    _stats is not hashed; it is the summary summary_key identifies.
+    """
+    return {
+        'emotions': emotion_distribution_figure(_stats.emotion_averages),
+        'moods': mood_figure(_stats.moods),
+        'intensities': emotion_intensity_figure(rank_emotions(_stats.emotion_intensities)),
+    }
+
+@st.cache_data(max_entries=SUMMARY_CACHE_SIZE, show_spinner=False)
+def build_trend_figure(summary_key, frequency, window, _stats):
+    """
+    Build the trend chart resampled to frequency and smoothed over window points.
+    
+    The day buckets are merged into days, weeks or months and each line is
+    capped with LTTB, so the figure stays the same size however long the
+    range. Cached like build_summary_figures().
+    """
+    return emotion_trend_figure(emotion_series(_stats.days, frequency, window), frequency)
+
+def show_entry_listing(stats):
+    """
+    List the period's entries a page at a time as short previews.
+    
+    Only ENTRIES_PER_PAGE previews are read from the store and drawn per
+    rerun, however long the range, and an entry's full text is fetched only
+    when it is opened.
+    """
+    total = stats.entry_count
+    pages = max(1, -(-total // ENTRIES_PER_PAGE))
+    page = 1
+    if pages > 1:
+        # Keyed on the range, so a new range starts again at page 1
+        page = st.number_input(
+            f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1,
+            key=f"entry_page_{stats.start_date}_{stats.end_date}"
+        )
+    first = (page - 1) * ENTRIES_PER_PAGE
+    st.caption(f"Showing entries {first + 1}-{min(first + ENTRIES_PER_PAGE, total)} of {total}")
+    
+    open_id = st.session_state.get('summary_open_entry')
+    for entry in get_period_entries(stats.start_date, stats.end_date, first, ENTRIES_PER_PAGE):
+        is_open = entry.id is not None and entry.id == open_id
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            st.markdown(f"**{entry.date_label} - {entry.module_lesson}**")
+            details = []
+            if entry.has_sentiment:
+                details.append(f"Sentiment: {entry.mood.capitalize()}")
+                if entry.dominant_emotion:
+                    details.append(f"Dominant emotion: {entry.dominant_emotion.capitalize()}")
+            if details:
+                st.caption(" · ".join(details))
+            if not is_open:
+                st.text(entry.preview)
+        with col2:
+            if entry.id is not None and st.button("Close" if is_open else "Read", key=f"read_entry_{entry.id}"):
+                st.session_state.summary_open_entry = None if is_open else entry.id
+                st.rerun()
+        if is_open:
+            show_full_entry(entry)
+
+def show_full_entry(entry):
+    """Show an opened entry's prompt, text and themes, loaded from the store."""
+    stored = get_journal_store().get(entry.id)
+    if stored is None:
+        st.info("This entry is no longer in your journal.")
+        return
+    st.markdown(f"**Prompt:** {stored.get('prompt', '')}")
+    st.markdown(stored.get('content', ''))
+    
+    # Display themes if available
+    if entry.has_sentiment and entry.themes:
+        st.markdown(f"**Themes:** {', '.join(entry.themes)}")
+
+def show_emotion_summary(stats, fig):
+    """Show summary of emotions from the summary stats of the selected period."""
+    if stats.entry_count == 0:
+        st.info("No journal entries found for the selected period.")
+        return
     
     # If we have no valid emotion data, display a message and return
-    if not all_emotions or entries_with_emotions == 0:
+    if not stats.emotion_averages:
         st.info("No emotion data found in the journal entries for this period.")
         return
-        
-    # Calculate average emotions
-    avg_emotions = {emotion: value / entries_with_emotions for emotion, value in all_emotions.items()}
     
-    # Find dominant emotion safely
-    dominant_emotion = find_dominant_emotion(avg_emotions)
+    dominant_emotion = stats.dominant_emotion
     if dominant_emotion:
         st.markdown(f"**Dominant emotion:** {dominant_emotion.capitalize()}")
     else:
         st.info("Could not determine dominant emotion from available data.")
     
     # Display emotion percentages
-    if avg_emotions:
-        # Create DataFrame for visualization
-        emotion_df = pd.DataFrame({
-            'Emotion': list(avg_emotions.keys()),
-            'Value': list(avg_emotions.values())
-        })
-        
-        if len(emotion_df) > 0:
-            # Sort by value for better visualization
-            emotion_df = emotion_df.sort_values('Value', ascending=False)
-            
-            # Create bar chart
-            try:
-                fig = px.bar(
-                    emotion_df, 
-                    x='Emotion', 
-                    y='Value',
-                    title='Emotion Distribution',
-                    labels={'Value': 'Intensity', 'Emotion': ''},
-                    color='Emotion'
-                )
-                
-                # Customize layout
-                fig.update_layout(
-                    xaxis_title=None,
-                    yaxis_title='Average Intensity',
-                    showlegend=False
-                )
-                
-                st.plotly_chart(fig)
-            except Exception as e:
-                st.error(f"Error creating emotion visualization: {str(e)}")
-        else:
-            st.info("Not enough data to create emotion visualization.")
+    if fig is not None:
+        st.plotly_chart(fig)
     else:
-        st.info("No emotions data available for visualization.")
+        st.info("Not enough data to create emotion visualization.")
 
 def show_weekly_summary():
     st.header("Weekly Summary")
@@ -117,7 +282,8 @@ def show_weekly_summary():
     pdf_generator = PDFGenerator()
     
     # Check if there are journal entries
-    if not st.session_state.journal_entries:
+    journal_store = get_journal_store()
+    if journal_store.count() == 0:
         st.warning("You haven't created any journal entries yet. Start your journaling practice to see your weekly summary.")
         return
     
@@ -136,25 +302,12 @@ def show_weekly_summary():
     max_date = default_end
     
     # Ensure we have journal entries to work with
-    if not hasattr(st.session_state, 'journal_entries') or not st.session_state.journal_entries:
+    if journal_store.count() == 0:
         st.warning("No journal entries found. Displaying default date range.")
     else:
         try:
-            # Extract valid dates from journal entries with thorough validation
-            all_dates = []
-            for entry in st.session_state.journal_entries:
-                if not isinstance(entry, dict) or 'date' not in entry:
-                    continue
-                    
-                try:
-                    date_str = entry.get('date', '')
-                    if not date_str or not isinstance(date_str, str):
-                        continue
-                        
-                    entry_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    all_dates.append(entry_date)
-                except (ValueError, TypeError):
-                    continue
+            # Earliest and latest valid dates come straight from the day index
+            all_dates = [day for day in journal_store.date_range() if day is not None]
             
             # Only update min/max dates if we have valid dates
             if all_dates:
@@ -199,22 +352,23 @@ def show_weekly_summary():
             # Fallback if date input fails
             end_date = default_end.date()
     
-    # Filter entries for the selected period
-    entries = get_entries_for_period(start_date, end_date)
+    # Summary and charts are reused across reruns until the period or the journal changes
+    summary_key = period_key(start_date, end_date)
+    try:
+        stats = get_period_summary(summary_key)
+    except Exception as e:
+        st.error(f"Error loading journal entries: {str(e)}")
+        return
     
-    if not entries:
+    if stats.entry_count == 0:
         st.info(f"No journal entries found between {start_date.strftime('%b %d, %Y')} and {end_date.strftime('%b %d, %Y')}.")
         return
     
-    # Collect emotions data from all entries
-    emotions_data = []
-    for entry in entries:
-        if 'sentiment' in entry and 'emotions' in entry['sentiment']:
-            emotions_data.append(entry['sentiment']['emotions'])
+    figures = build_summary_figures(summary_key, stats)
     
     # Show emotion summary
     st.header("Emotional Overview")
-    show_emotion_summary(entries)
+    show_emotion_summary(stats, figures['emotions'])
     
     # Display summary metrics
     st.markdown("---")
@@ -223,68 +377,28 @@ def show_weekly_summary():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Entries", len(entries))
+        st.metric("Total Entries", stats.entry_count)
     
     with col2:
-        total_words = sum(len(entry['content'].split()) for entry in entries)
-        st.metric("Total Words", total_words)
+        st.metric("Total Words", stats.total_words)
     
     with col3:
-        avg_words = round(total_words / len(entries))
-        st.metric("Avg. Words per Entry", avg_words)
+        st.metric("Avg. Words per Entry", stats.average_words)
     
     # Emotional trends visualization
     st.markdown("---")
     st.subheader("Emotional Trends")
     
-    # Prepare data for visualization
-    emotion_data = []
+    trend_col1, trend_col2 = st.columns(2)
+    with trend_col1:
+        resolution = st.selectbox("Resolution", list(TREND_RESOLUTIONS), key="trend_resolution")
+    with trend_col2:
+        smoothing = st.selectbox("Smoothing (rolling mean)", list(TREND_SMOOTHING), key="trend_smoothing")
+    frequency = TREND_RESOLUTIONS[resolution] or choose_frequency(start_date, end_date)
+    trend_figure = build_trend_figure(summary_key, frequency, TREND_SMOOTHING[smoothing], stats)
     
-    for entry in entries:
-        date = datetime.strptime(entry['date'], '%Y-%m-%d')
-        
-        if 'sentiment' in entry and 'emotions' in entry['sentiment']:
-            emotions = entry['sentiment']['emotions']
-            
-            if emotions and len(emotions) > 0:  # Check if emotions dictionary is not empty
-                for emotion, value in emotions.items():
-                    emotion_data.append({
-                        'Date': date,
-                        'Emotion': emotion.capitalize(),
-                        'Value': value
-                    })
-    
-    if emotion_data:
-        # Create DataFrame for plotting
-        df = pd.DataFrame(emotion_data)
-        
-        # Create line chart of emotions over time
-        fig = px.line(
-            df,
-            x='Date',
-            y='Value',
-            color='Emotion',
-            title="Emotional Content Over Time",
-            labels={'Value': 'Intensity (%)', 'Date': ''},
-            line_shape='spline',
-            color_discrete_map={
-                'Joy': '#FFC107',
-                'Sadness': '#2196F3',
-                'Anger': '#F44336',
-                'Fear': '#9C27B0',
-                'Hope': '#4CAF50'
-            }
-        )
-        
-        fig.update_layout(
-            legend_title_text='',
-            plot_bgcolor="rgba(0,0,0,0)",
-            paper_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="white"),
-            hovermode="x unified"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+    if trend_figure is not None:
+        st.plotly_chart(trend_figure, use_container_width=True)
     else:
         st.info("Insufficient emotional data for the selected period to visualize trends.")
     
@@ -292,136 +406,26 @@ def show_weekly_summary():
     st.markdown("---")
     st.subheader("Journal Entries & Insights")
     
-    for entry in entries:
-        date_str = datetime.strptime(entry['date'], '%Y-%m-%d').strftime('%B %d, %Y')
-        module_lesson = f"Module {entry['module']}, Lesson {entry['lesson']}"
-        
-        expander = st.expander(f"{date_str} - {module_lesson}")
-        with expander:
-            st.markdown(f"**Prompt:** {entry['prompt']}")
-            st.markdown(entry['content'])
-            
-            # Display sentiment if available
-            if 'sentiment' in entry:
-                sentiment = entry['sentiment']
-                category = sentiment['category'].lower()
-                display_category = "positive" if category in ['very positive', 'positive'] else \
-                                 "negative" if category in ['very negative', 'negative'] else \
-                                 "neutral"
-                st.markdown(f"**Sentiment:** {display_category.capitalize()}")
-                
-                # Display emotions if available
-                if 'emotions' in sentiment and sentiment['emotions']:
-                    emotions = sentiment['emotions']
-                    # Get dominant emotion safely
-                    dominant_emotion = find_dominant_emotion(emotions)
-                    if dominant_emotion:
-                        st.markdown(f"**Dominant emotion:** {dominant_emotion.capitalize()}")
-                    else:
-                        st.markdown("**Emotion data:** Not available")
-                else:
-                    st.markdown("**Emotion data:** Not available")
-                
-                # Display themes if available
-                if 'themes' in entry and entry['themes']:
-                    st.markdown(f"**Themes:** {', '.join(entry['themes'])}")
+    show_entry_listing(stats)
     
     # Growth highlights and recommendations
     st.markdown("---")
     st.subheader("Growth Highlights & Recommendations")
     
     # Generate growth highlights based on journal entries
-    if entries:
-        # Calculate emotional trends
-        emotion_averages = {}
-        sentiment_categories = {"positive": 0, "neutral": 0, "negative": 0}
-        entry_count = len(entries)
-        
-        for entry in entries:
-            # Track sentiment categories
-            if 'sentiment' in entry and 'category' in entry['sentiment']:
-                category = entry['sentiment']['category'].lower()
-                # Map legacy categories to new ones
-                if category in ['very positive', 'positive']:
-                    sentiment_categories['positive'] += 1
-                elif category in ['very negative', 'negative']:
-                    sentiment_categories['negative'] += 1
-                else:
-                    sentiment_categories['neutral'] += 1
-            
-            # Track emotion intensities
-            if 'sentiment' in entry and 'emotions' in entry['sentiment']:
-                emotions = entry['sentiment']['emotions']
-                
-                for emotion, value in emotions.items():
-                    if emotion in emotion_averages:
-                        emotion_averages[emotion].append(value)
-                    else:
-                        emotion_averages[emotion] = [value]
-        
-        # Calculate averages for emotions
-        for emotion, values in emotion_averages.items():
-            emotion_averages[emotion] = sum(values) / len(values)
-        
-        # Calculate percentages for sentiment categories
-        sentiment_percentages = {
-            category: (count / entry_count) * 100 
-            for category, count in sentiment_categories.items() 
-            if count > 0
-        }
+    if stats.entry_count:
+        # Average each emotion over the entries where it was detected
+        emotion_averages = stats.emotion_intensities
         
         # Display sentiment trend percentages
         st.markdown("### Emotional Trend Analysis")
         
-        # Create a horizontal bar chart for sentiment categories
-        if sentiment_percentages:
-            categories = list(sentiment_percentages.keys())
-            percentages = list(sentiment_percentages.values())
-            
-            # Sort by percentage (highest first)
-            sorted_indices = sorted(range(len(percentages)), key=lambda i: percentages[i], reverse=True)
-            sorted_categories = [categories[i].capitalize() for i in sorted_indices]
-            sorted_percentages = [percentages[i] for i in sorted_indices]
-            
-            # Color mapping
-            color_map = {
-                "Positive": "#4CAF50",  # Green
-                "Negative": "#F44336",  # Red
-                "Neutral": "#2196F3"    # Blue
-            }
-            
-            colors = [color_map[cat] for cat in sorted_categories]
-            
-            # Create bar chart
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=sorted_percentages,
-                y=sorted_categories,
-                orientation='h',
-                marker_color=colors,
-                text=[f"{p:.1f}%" for p in sorted_percentages],
-                textposition='auto'
-            ))
-            
-            fig.update_layout(
-                title="Overall Mood Distribution in Journal Entries",
-                xaxis_title="Percentage of Entries",
-                yaxis_title="Mood Category",
-                plot_bgcolor="rgba(0,0,0,0)",
-                paper_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="white"),
-                height=250,
-                margin=dict(l=20, r=20, t=40, b=20),
-                xaxis=dict(
-                    range=[0, 100],
-                    ticksuffix="%"
-                )
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        # Horizontal bar chart of mood shares, highest first
+        if figures['moods'] is not None:
+            st.plotly_chart(figures['moods'], use_container_width=True)
             
             # Add interpretation based on dominant sentiment
-            dominant_sentiment = sorted_categories[0].lower() if sorted_categories else "neutral"
+            dominant_sentiment = stats.dominant_mood or "neutral"
             
             if dominant_sentiment == "positive":
                 st.markdown("📈 **Mood Insight:** Your journal entries show a predominantly positive outlook, which suggests you're in a creative or resourceful state of mind. This is an excellent time to set goals and build on your momentum.")
@@ -434,47 +438,12 @@ def show_weekly_summary():
         if emotion_averages:
             st.markdown("### Specific Emotional Patterns")
             
-            # Format emotion averages as percentages and sort
-            emotion_percentages = {k.capitalize(): v for k, v in emotion_averages.items() if v > 0}
-            sorted_emotions = sorted(emotion_percentages.items(), key=lambda x: x[1], reverse=True)
+            # Emotions with a positive average, strongest first
+            sorted_emotions = rank_emotions(emotion_averages)
             
             # Create a bar chart for emotion intensities
             if sorted_emotions:  # Only create chart if there are emotions to display
-                emotions = [e[0] for e in sorted_emotions]
-                intensities = [e[1] for e in sorted_emotions]
-                
-                fig = go.Figure()
-                fig.add_trace(go.Bar(
-                    x=intensities,
-                    y=emotions,
-                    orientation='h',
-                    marker_color=[
-                        '#FFC107' if e == 'Joy' else
-                        '#4CAF50' if e == 'Hope' else
-                        '#F44336' if e == 'Anger' else
-                        '#2196F3' if e == 'Sadness' else
-                        '#9C27B0' for e in emotions
-                    ],
-                    text=[f"{v:.1f}%" for v in intensities],
-                    textposition='auto'
-                ))
-                
-                fig.update_layout(
-                    title="Emotional Intensity Distribution",
-                    xaxis_title="Intensity (%)",
-                    yaxis_title="Emotion",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    font=dict(color="white"),
-                    height=250,
-                    margin=dict(l=20, r=20, t=40, b=20),
-                    xaxis=dict(
-                        range=[0, 100],
-                        ticksuffix="%"
-                    )
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(figures['intensities'], use_container_width=True)
                 
                 # Find dominant emotions (those with intensity > 30%)
                 significant_emotions = [(emotion, value) for emotion, value in sorted_emotions if value > 30]
@@ -565,7 +534,8 @@ def show_weekly_summary():
             # Generate PDF
             pdf_bytes = pdf_generator.create_weekly_summary_pdf(
                 user_data={
-                    'journal_entries': entries
+                    'journal_entries': get_journal_store().entries_between(start_date, end_date),
+                    'summary': stats
                 },
                 start_date=start_datetime,
                 end_date=end_datetime
@@ -581,34 +551,3 @@ def show_weekly_summary():
             )
             
             st.success("PDF generated successfully!")
-
-def get_entries_for_period(start_date, end_date):
-    """
-    Get journal entries for a specific date range.
-    
-    Args:
-        start_date (date): Start date
-        end_date (date): End date
-        
-    Returns:
-        list: Journal entries within the date range
-    """
-    entries = []
-    
-    try:
-        if not hasattr(st.session_state, 'journal_entries') or not st.session_state.journal_entries:
-            return entries
-            
-        for entry in st.session_state.journal_entries:
-            try:
-                entry_date = datetime.strptime(entry['date'], '%Y-%m-%d').date()
-                if start_date <= entry_date <= end_date:
-                    entries.append(entry)
-            except (ValueError, KeyError, TypeError):
-                # Skip entries with invalid dates
-                continue
-    except Exception as e:
-        st.error(f"Error loading journal entries: {str(e)}")
-        return []
-    
-    return entries
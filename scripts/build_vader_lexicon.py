@@ -0,0 +1,46 @@
+"""
+Build the bundled, pre-parsed VADER lexicon used by utils.sentiment_analysis.
+
+Parses the VADER lexicon text file once and pickles the resulting word -> valence
+dict to data/vader_lexicon.pickle, so the app never needs to download or parse it.
+
+Run from the project root:
+    python scripts/build_vader_lexicon.py [path/to/vader_lexicon.txt]
+
+Without a path, the lexicon is read from the local NLTK data directory.
+"""
+import os
+import pickle
+import sys
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_analysis import VADER_LEXICON_PATH
+
+def read_lexicon_text(path=None):
+    """Return the raw lexicon text from path, or from NLTK data if no path is given."""
+    if path:
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    import nltk
+    return nltk.data.load("sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt")
+
+def parse_lexicon(text):
+    """Parse tab-separated lexicon lines into a word -> mean valence dict."""
+    lexicon = {}
+    for line in text.split("\n"):
+        if not line.strip():
+            continue
+        word, measure = line.strip().split("\t")[0:2]
+        lexicon[word] = float(measure)
+    return lexicon
+
+def main():
+    lexicon = parse_lexicon(read_lexicon_text(sys.argv[1] if len(sys.argv) > 1 else None))
+    with open(VADER_LEXICON_PATH, 'wb') as f:
+        pickle.dump(lexicon, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"Wrote {len(lexicon)} entries to {VADER_LEXICON_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Tests that streaming analysis matches analyzing the whole text.
+
+Run from the project root:
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import pytest
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_analysis import SentimentAnalyzer, iter_text_chunks
+
+# VADER rules that read across sentence boundaries or over the whole text
+TEXTS = [
+    "The day was not good. But it was fine. I hated it!",
+    "It was not. Good day. I was NOT happy but OK.",
+    "kind. of great. Kind of sad.",
+    "Never. So good. never this bad",
+    "He was the upper. hand in this! Really?? yes???",
+    "GREAT DAY",
+    "GREAT DAY but bad",
+    "SO GOOD. so good",
+    "  leading space. trailing!   ",
+    "!!!",
+]
+
+WORDS = ("good bad not never but But so kind of very least at happy sad hate love GREAT "
+         "TERRIBLE VERY really extremely barely the day I it was felt".split()) + ['.', '!', '?', '\n']
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return SentimentAnalyzer()
+
+@pytest.mark.parametrize('size', [1, 5, 64])
+@pytest.mark.parametrize('text', TEXTS)
+def test_stream_matches_whole_text(analyzer, text, size):
+    assert analyzer.analyze_stream(iter_text_chunks(text, size)) == analyzer.analyze_entry(text)
+
+def test_random_streams_match_whole_text(analyzer):
+    rng = random.Random(1)
+    for _ in range(200):
+        text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 40)))
+        size = rng.randint(1, 50)
+        assert analyzer.analyze_stream(iter_text_chunks(text, size)) == analyzer.analyze_entry(text)
+
+def test_empty_stream_matches_empty_text(analyzer):
+    assert analyzer.analyze_stream(iter_text_chunks('')) == analyzer.analyze_entry('')
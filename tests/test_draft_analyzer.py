@@ -0,0 +1,60 @@
+"""
+Tests that incremental draft analysis matches analyzing the whole text.
+
+Run from the project root:
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import pytest
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment_analysis import DraftAnalyzer, SentimentAnalyzer
+
+# VADER rules that read across sentence boundaries or over the whole text
+TEXTS = [
+    "The day was not good. But it was fine. I hated it!",
+    "It was not. Good day. I was NOT happy but OK.",
+    "kind. of great. Kind of sad.",
+    "Never. So good. never this bad",
+    "He was the upper. hand in this! Really?? yes???",
+    "good. good. not good. GOOD!",
+    "I don't. Like it. At least. Love it.",
+    "  leading space. trailing!   ",
+    "end.Next sentence.Bad",
+    "BUT this is fine. but bad",
+    "!!!",
+    "",
+]
+
+WORDS = ("good bad not never but so kind of very least at happy sad hate love GREAT "
+         "TERRIBLE really extremely barely the day I it was felt").split()
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return SentimentAnalyzer()
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_draft_matches_whole_text(analyzer, text):
+    assert DraftAnalyzer(analyzer).analyze(text) == analyzer.analyze_entry(text)
+
+def test_edits_reuse_sentences_and_match_whole_text(analyzer):
+    rng = random.Random(1)
+    sentences = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 12))) + rng.choice('.!?')
+                 for _ in range(40)]
+    draft = DraftAnalyzer(analyzer)
+    draft.analyze(' '.join(sentences))
+
+    for _ in range(50):
+        index = rng.randrange(len(sentences))
+        sentences[index] = rng.choice(['But not bad.', 'NEVER good!', 'kind of sad?', sentences[index] + ' so'])
+        text = ' '.join(sentences)
+        assert draft.analyze(text) == analyzer.analyze_entry(text)
+
+    # Each edit re-scores the changed sentence, not the draft
+    assert draft.stats['scored'] < 40 + 50 * 2
+    assert draft.stats['reused'] > 50 * 30
@@ -0,0 +1,52 @@
+"""
+Tests for the journal store's entry listing.
+
+Run from the project root:
+    python -m pytest tests
+"""
+import os
+import sys
+from datetime import date
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.journal_store import JournalStore
+from utils.summary_stats import PREVIEW_LENGTH, EntrySummary, summarize_entries
+
+ENTRIES = [
+    {'date': '2025-01-02', 'module': 2, 'lesson': 3, 'content': 'A calm and hopeful morning. ' * 20,
+     'sentiment': {'category': 'very positive', 'emotions': {'hope': 70.0, 'joy': 70}},
+     'themes': ['morning', 'calm']},
+    {'date': '2025-01-01', 'content': 'Worried about work.',
+     'sentiment': {'category': 'negative', 'emotions': {'sadness': True, 'fear': 40}}, 'themes': None},
+    {'date': '2025-01-03', 'content': 'x' * (PREVIEW_LENGTH + 1), 'sentiment': 'not analysed'},
+    {'date': '2025-01-03', 'content': 'No emotions.', 'sentiment': {'emotions': [1, 2]}, 'themes': ['work']},
+    {'date': '2025-02-01', 'content': 'Outside the period.'},
+    {'date': 'someday', 'content': 'No valid date.'},
+]
+
+START, END = date(2025, 1, 1), date(2025, 1, 31)
+
+def fields(summary):
+    return [getattr(summary, name) for name in EntrySummary.__slots__]
+
+def listing(store, **paging):
+    return [EntrySummary(**row) for row in store.listing_between(START, END, PREVIEW_LENGTH + 1, **paging)]
+
+def test_listing_matches_summaries_of_whole_entries():
+    store = JournalStore()
+    store.add_many(ENTRIES)
+
+    expected = summarize_entries(store.entries_between(START, END), START, END)
+
+    assert [fields(summary) for summary in listing(store)] == [fields(summary) for summary in expected]
+    assert [summary.dominant_emotion for summary in expected] == ['fear', 'hope', None, None]
+
+def test_listing_pages_in_date_order():
+    store = JournalStore()
+    store.add_many(ENTRIES)
+
+    assert [summary.id for summary in listing(store, limit=2)] == [2, 1]
+    assert [summary.id for summary in listing(store, limit=2, offset=2)] == [3, 4]
+    assert listing(store, limit=2, offset=4) == []
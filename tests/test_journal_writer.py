@@ -0,0 +1,123 @@
+"""
+Tests for the write-behind journal queue: holds, failed commits and shutdown.
+
+Run from the project root:
+    python -m pytest tests
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.journal_store import JournalStore, open_journal_pool
+from utils.journal_writer import JournalWriter
+
+USER = 'user:test'
+
+def make_entry(content, entry_id=None):
+    return {'id': entry_id, 'date': '2025-01-01', 'time': '09:00', 'module': 1, 'lesson': 1,
+            'prompt': 'Reflect on your day.', 'content': content,
+            'sentiment': {'compound': 0.0, 'category': 'neutral', 'emotions': {'neutral': 50}},
+            'themes': []}
+
+class FlakyPool:
+    """Pool whose transactions fail while `failing` is set; reads go through."""
+
+    def __init__(self, pool):
+        self._pool = pool
+        self.failing = True
+
+    def connection(self):
+        return self._pool.connection()
+
+    @contextmanager
+    def transaction(self):
+        if self.failing:
+            raise sqlite3.OperationalError("disk I/O error")
+        with self._pool.transaction() as conn:
+            yield conn
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = open_journal_pool(str(tmp_path / 'journal.sqlite3'), size=4)
+    yield pool
+    pool.close()
+
+def make_writer(pool, **options):
+    return JournalWriter(pool, JournalStore._insert_sql(), **options)
+
+def stored(pool):
+    with pool.connection() as conn:
+        return conn.execute(
+            "SELECT id, content FROM entries WHERE user_id = ? ORDER BY id", (USER,)
+        ).fetchall()
+
+def test_add_waits_for_replace_all_and_continues_after_its_ids(pool):
+    writer = make_writer(pool, flush_interval=0)
+    store = JournalStore(user_id=USER, pool=pool, writer=writer)
+    store.add(make_entry('before'))
+    saved = {}
+
+    def save():
+        saved['entry'] = store.add(make_entry('during'))
+
+    def imported():
+        yield make_entry('imported 1', entry_id=10)
+        # Saves started now have to wait for the import to finish
+        thread.start()
+        time.sleep(0.2)
+        assert 'entry' not in saved
+        yield make_entry('imported 2', entry_id=11)
+
+    thread = threading.Thread(target=save)
+    assert store.replace_all(imported()) == 2
+    thread.join(5)
+    writer.close()
+
+    assert saved['entry']['id'] == 12
+    assert stored(pool) == [(10, 'imported 1'), (11, 'imported 2'), (12, 'during')]
+
+def test_failed_commit_is_retried_then_dropped_and_reported_once(pool):
+    flaky = FlakyPool(pool)
+    writer = make_writer(flaky, flush_interval=0, retries=2, retry_interval=0)
+    store = JournalStore(user_id=USER, pool=pool, writer=writer)
+
+    assert store.add(make_entry('lost'))['id'] == 1
+    # Reads don't raise for the lost entry
+    assert store.count() == 0
+
+    metrics = writer.metrics()
+    assert metrics['errors'] == 3
+    assert metrics['failed'] == 1
+    assert metrics['committed'] == 0
+    assert metrics['pending'] == 0
+    assert isinstance(writer.take_failure(USER), sqlite3.OperationalError)
+    assert writer.take_failure(USER) is None
+
+    # The id counter is read again, so the dropped id is handed out again
+    flaky.failing = False
+    assert store.add(make_entry('kept'))['id'] == 1
+    store.flush()
+    writer.close()
+    assert stored(pool) == [(1, 'kept')]
+    assert writer.metrics()['committed'] == 1
+
+def test_close_commits_queued_entries_and_refuses_later_saves(pool):
+    writer = make_writer(pool, flush_interval=10)
+    store = JournalStore(user_id=USER, pool=pool, writer=writer)
+    for number in range(3):
+        store.add(make_entry(f'entry {number}'))
+
+    writer.close(timeout=5)
+
+    assert stored(pool) == [(1, 'entry 0'), (2, 'entry 1'), (3, 'entry 2')]
+    assert writer.pending() == 0
+    with pytest.raises(RuntimeError):
+        store.add(make_entry('too late'))
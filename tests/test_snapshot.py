@@ -0,0 +1,95 @@
+"""
+Round trip and damaged-input tests for the binary snapshot format.
+
+Run from the project root:
+    python -m pytest tests
+"""
+import io
+import os
+import struct
+import sys
+import zlib
+
+import pytest
+
+# Add the project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.snapshot import MAGIC, SNAPSHOT_VERSION, read_snapshot, write_snapshot
+
+SETTINGS = {'user_name': 'Test', 'current_module': 2}
+ENTRIES = [
+    {'id': 1, 'date': '2025-01-01', 'time': '09:00', 'module': 1, 'lesson': 2,
+     'prompt': 'Reflect on your day.', 'content': 'A calm and hopeful morning.',
+     'sentiment': {'compound': 0.6, 'pos': 0.4, 'neu': 0.6, 'neg': 0.0,
+                   'category': 'positive', 'emotions': {'hope': 70.0, 'joy': 30.0}},
+     'themes': ['morning', 'calm']},
+    {'id': 2, 'date': '2025-01-02', 'content': 'Worried about work.',
+     'sentiment': {'compound': -0.4, 'category': 'negative', 'emotions': {'fear': 100.0}},
+     'themes': []},
+]
+
+def snapshot_bytes():
+    buffer = io.BytesIO()
+    write_snapshot(buffer, SETTINGS, ENTRIES)
+    return buffer.getvalue()
+
+def split_blocks(data):
+    """Return the three length-prefixed blocks after the magic and version."""
+    offset = len(MAGIC) + 2
+    blocks = []
+    for _ in range(3):
+        size = struct.unpack_from('<Q', data, offset)[0]
+        blocks.append(data[offset + 8:offset + 8 + size])
+        offset += 8 + size
+    return blocks
+
+def join_blocks(blocks):
+    return MAGIC + struct.pack('<H', SNAPSHOT_VERSION) + b''.join(
+        struct.pack('<Q', len(block)) + block for block in blocks
+    )
+
+def test_round_trip():
+    settings, records = read_snapshot(io.BytesIO(snapshot_bytes()))
+    assert settings == SETTINGS
+    assert [record.to_dict() for record in records] == ENTRIES
+
+@pytest.mark.parametrize('length', range(len(MAGIC) + 2, 200, 7))
+def test_truncated_snapshot_raises_value_error(length):
+    data = snapshot_bytes()
+    with pytest.raises(ValueError):
+        read_snapshot(io.BytesIO(data[:length]))
+
+def test_flipped_byte_raises_only_value_error():
+    data = snapshot_bytes()
+    for position in range(len(MAGIC) + 2, len(data)):
+        damaged = bytearray(data)
+        damaged[position] ^= 0xFF
+        # Either the damage goes unnoticed or it is reported as a ValueError
+        try:
+            read_snapshot(io.BytesIO(bytes(damaged)))
+        except ValueError:
+            pass
+
+@pytest.mark.parametrize('cut', [0, 3, 9, 40])
+def test_short_text_block_is_corrupt(cut):
+    header, columns, text = split_blocks(snapshot_bytes())
+    damaged = join_blocks([header, columns, zlib.compress(zlib.decompress(text)[:cut])])
+    with pytest.raises(ValueError, match="Corrupt snapshot"):
+        read_snapshot(io.BytesIO(damaged))
+
+def test_short_column_block_is_corrupt():
+    header, columns, text = split_blocks(snapshot_bytes())
+    damaged = join_blocks([header, zlib.compress(zlib.decompress(columns)[:20]), text])
+    with pytest.raises(ValueError, match="Corrupt snapshot"):
+        read_snapshot(io.BytesIO(damaged))
+
+def test_bad_header_is_corrupt():
+    _, columns, text = split_blocks(snapshot_bytes())
+    for header in (b'{not json', b'[]', b'{"entries": 2}', b'{"settings": {}, "entries": "2", "emotions": []}'):
+        with pytest.raises(ValueError, match="Corrupt snapshot"):
+            read_snapshot(io.BytesIO(join_blocks([header, columns, text])))
+
+def test_not_a_snapshot():
+    with pytest.raises(ValueError, match="Not a journal snapshot"):
+        read_snapshot(io.BytesIO(b'{"journal_entries": []}'))
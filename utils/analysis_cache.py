@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+import streamlit as st
+from utils.data_storage import DATA_DIR
+from utils.sentiment_analysis import ANALYZER_VERSION
+
+DEFAULT_CACHE_PATH = os.path.join(DATA_DIR, 'analysis_cache.sqlite3')
+
+# Results that match SentimentAnalyzer.analyze_entry()
+DEFAULT_METHOD = 'entry'
+
+class AnalysisCache:
+    """
+    Content-addressed cache of analysis results.
+
+    Results are keyed by a hash of the analyzer version, the analysis method
+    and the text, so methods that can score the same text differently never
+    hand out each other's results. A bounded
+    in-memory LRU sits in front of an optional SQLite store on disk, so identical
+    text is only analyzed once across reruns, sessions and restarts.
+    """
+
+    def __init__(self, path=None, max_entries=256, version=ANALYZER_VERSION):
+        """
+        Args:
+            path (str): SQLite file for the persistent store, or None for memory only
+            max_entries (int): Number of results kept in the in-memory LRU
+            version (str): Analyzer version mixed into every key
+        """
+        self.version = version
+        self.max_entries = max_entries
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        # Results are held as JSON so every lookup hands out a fresh copy
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analysis (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def key(self, text, method=DEFAULT_METHOD):
+        """Return the content address of text for the current analyzer version and method."""
+        return hashlib.sha256(f"{self.version}\0{method}\0{text}".encode('utf-8')).hexdigest()
+
+    def get(self, text, method=DEFAULT_METHOD):
+        """
+        Look up a cached result.
+
+        Args:
+            text (str): The analyzed text
+            method (str): Name of the analysis that produced the result
+
+        Returns:
+            dict: The cached result, or None on a miss
+        """
+        key = self.key(text, method)
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return json.loads(payload)
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT result FROM analysis WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    self._remember(key, row[0])
+                    self.stats['disk_hits'] += 1
+                    return json.loads(row[0])
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, text, result, method=DEFAULT_METHOD):
+        """Store a result of method in memory and, if configured, on disk."""
+        key = self.key(text, method)
+        payload = json.dumps(result)
+        with self._lock:
+            self._remember(key, payload)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO analysis (key, result) VALUES (?, ?)", (key, payload)
+                )
+                self._conn.commit()
+
+    def get_or_compute(self, text, compute, method=DEFAULT_METHOD):
+        """
+        Return the cached result of method for text, calling compute(text) on a miss.
+        """
+        result = self.get(text, method)
+        if result is None:
+            result = compute(text)
+            self.put(text, result, method)
+        return result
+
+    def clear(self):
+        """Drop every cached result and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM analysis")
+                self._conn.commit()
+            self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def _remember(self, key, payload):
+        """Insert into the LRU, evicting the least recently used result when full."""
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+@st.cache_resource
+def get_analysis_cache():
+    """Return the process-wide analysis cache shared by all sessions."""
+    return AnalysisCache(DEFAULT_CACHE_PATH)
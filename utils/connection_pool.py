@@ -0,0 +1,111 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections shared across sessions.
+
+    Connections are opened lazily up to `size` and handed out one caller at a
+    time; when all are busy, callers wait for one to come back. Reads run in
+    autocommit mode and, with WAL, in parallel with a writer. Writes go
+    through transaction(): one writer at a time per process, each holding
+    SQLite's write lock from BEGIN IMMEDIATE, so other processes wait (for up
+    to `busy_timeout` seconds) instead of failing part way through.
+    """
+
+    def __init__(self, path=None, size=8, timeout=30.0, busy_timeout=30.0, setup=None):
+        """
+        Args:
+            path (str): SQLite file, or None for an in-memory database
+                (which only exists on one connection, so size is forced to 1)
+            size (int): Maximum number of open connections
+            timeout (float): Seconds to wait for a free connection
+            busy_timeout (float): Seconds a connection waits on a locked database
+            setup (callable): Called with the first connection opened, e.g. to
+                create tables
+        """
+        self.path = path or ':memory:'
+        self.size = 1 if path is None else size
+        self._timeout = timeout
+        self._busy_timeout = busy_timeout
+        self._setup = setup
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.waits = 0
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a with block.
+
+        Raises:
+            TimeoutError: If no connection comes free within the pool timeout
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Borrow a connection inside a write transaction, committed on success."""
+        # Writers in this process queue here rather than in SQLite's busy
+        # handler, which polls with growing sleeps
+        with self._write_lock, self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def close(self):
+        """Close the idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    @property
+    def opened(self):
+        """Number of connections opened so far."""
+        return self._opened
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.size:
+                conn = self._open()
+                self._opened += 1
+                return conn
+            self.waits += 1
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No database connection came free within {self._timeout:g}s "
+                f"(pool size {self.size})"
+            ) from None
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.path, timeout=self._busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if self._setup is not None and self._opened == 0:
+            self._setup(conn)
+        return conn
@@ -0,0 +1,177 @@
+import json
+import re
+from utils.journal_entry import day_ordinal
+
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+
+# Expected types of entry fields; 'content' and 'date' are required
+ENTRY_SCHEMA = {
+    'id': int,
+    'date': str,
+    'time': str,
+    'module': int,
+    'lesson': int,
+    'prompt': str,
+    'content': str,
+    'sentiment': dict,
+    'themes': list,
+}
+REQUIRED_FIELDS = ('date', 'content')
+
+def validate_entry(entry):
+    """
+    Check one imported journal entry against ENTRY_SCHEMA.
+
+    Args:
+        entry: A decoded element of the export's journal_entries array
+
+    Returns:
+        list: Problems found, empty if the entry is valid
+    """
+    if not isinstance(entry, dict):
+        return [f"expected an object, got {type(entry).__name__}"]
+
+    problems = []
+    for field in REQUIRED_FIELDS:
+        if field not in entry:
+            problems.append(f"missing '{field}'")
+    for field, kind in ENTRY_SCHEMA.items():
+        value = entry.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+            problems.append(f"'{field}' should be {kind.__name__}, got {type(value).__name__}")
+
+    if isinstance(entry.get('date'), str) and day_ordinal(entry['date']) is None:
+        problems.append(f"'date' is not YYYY-MM-DD: {entry['date']!r}")
+    if isinstance(entry.get('themes'), list) and not all(isinstance(theme, str) for theme in entry['themes']):
+        problems.append("'themes' should only hold strings")
+
+    sentiment = entry.get('sentiment')
+    if isinstance(sentiment, dict):
+        if 'category' in sentiment and not isinstance(sentiment['category'], str):
+            problems.append("'sentiment.category' should be str")
+        emotions = sentiment.get('emotions')
+        if emotions is not None and not (
+            isinstance(emotions, dict) and all(
+                isinstance(score, (int, float)) and not isinstance(score, bool)
+                for score in emotions.values()
+            )
+        ):
+            problems.append("'sentiment.emotions' should map emotions to numbers")
+    return problems
+
+class ExportReader:
+    """
+    Incremental reader for the export document written by write_export().
+
+    Reads the stream in chunks and decodes one value at a time with
+    JSONDecoder.raw_decode, so each journal entry is parsed exactly once and
+    only the current entry and a chunk of text are held in memory. Top-level
+    settings are collected into `settings` as they are passed.
+    """
+
+    def __init__(self, text_stream, chunk_size=65536):
+        """
+        Args:
+            text_stream: Text file-like object holding the export JSON
+            chunk_size (int): Characters read at a time
+        """
+        self.settings = {}
+        self._stream = text_stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def entries(self):
+        """
+        Yield the elements of journal_entries in order.
+
+        Settings before and after the entries are read into self.settings;
+        they are complete once the generator is exhausted.
+
+        Raises:
+            ValueError: If the document is not a valid export
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise ValueError("Export keys must be strings")
+            self._expect(':')
+            if key == 'journal_entries':
+                yield from self._array()
+            else:
+                self.settings[key] = self._value()
+
+            separator = self._peek()
+            self._pos += 1
+            if separator == '}':
+                break
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' in export, found {separator!r}")
+        if self._peek() != '':
+            raise ValueError("Unexpected data after the export document")
+
+    def _array(self):
+        """Yield the elements of the array starting at the current position."""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' in journal_entries, found {separator!r}")
+
+    def _value(self):
+        """Decode the JSON value at the current position, reading more text as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            # A number at the end of the buffer might continue in the next chunk
+            if end == len(self._buffer) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _peek(self):
+        """Skip whitespace and return the next character, or '' at the end."""
+        while True:
+            self._pos = _WHITESPACE_RE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                return ''
+            self._fill()
+
+    def _expect(self, char):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in export, found {found!r}")
+        self._pos += 1
+
+    def _fill(self):
+        """Drop consumed text and read the next chunk, growing it for very long values."""
+        pending = self._buffer[self._pos:]
+        chunk = self._stream.read(max(self._chunk_size, len(pending)))
+        if not chunk:
+            self._eof = True
+        self._buffer = pending + chunk
+        self._pos = 0
@@ -1,6 +1,155 @@
 import streamlit as st
 from datetime import datetime, timedelta
+import gzip
+import atexit
+import io
 import json
+import os
+import threading
+from utils.data_import import ExportReader, validate_entry
+from utils.journal_store import DEFAULT_USER, JournalStore, open_journal_pool, open_journal_writer
+from utils.rollups import Rollups
+from utils.sentiment_analysis import get_shared_analyzer
+from utils.snapshot import MAGIC as SNAPSHOT_MAGIC, is_snapshot, read_snapshot, write_snapshot
+from utils.summary_stats import PREVIEW_LENGTH, EntrySummary, SummaryStats
+from utils.theme_index import ThemeIndex
+
+# Number of invalid entries described in an import report
+MAX_REPORTED_PROBLEMS = 5
+
+# Directory for on-disk app data, overridable for deployments
+DATA_DIR = os.environ.get(
+    'JOURNAL_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.journal_data')
+)
+
+# Database connections shared by all sessions of the server
+POOL_SIZE = int(os.environ.get('JOURNAL_POOL_SIZE', 8))
+
+@st.cache_resource
+def get_connection_pool():
+    """Return the process-wide connection pool on the journal database under DATA_DIR."""
+    return open_journal_pool(os.path.join(DATA_DIR, 'journal.sqlite3'), size=POOL_SIZE)
+
+# Saves are committed in the background, gathered over this many seconds
+FLUSH_INTERVAL = float(os.environ.get('JOURNAL_FLUSH_INTERVAL', 0.05))
+WRITE_QUEUE_SIZE = int(os.environ.get('JOURNAL_WRITE_QUEUE_SIZE', 1000))
+
+@st.cache_resource
+def get_journal_writer():
+    """Return the process-wide write-behind queue, flushed when the server exits."""
+    writer = open_journal_writer(
+        get_connection_pool(), max_queue=WRITE_QUEUE_SIZE, flush_interval=FLUSH_INTERVAL
+    )
+    atexit.register(writer.close)
+    return writer
+
+# Users whose rollups and theme index are kept in memory at once
+USER_CACHE_SIZE = int(os.environ.get('JOURNAL_USER_CACHE_SIZE', 256))
+
+# Taken while a save updates the rollups and theme index, so a rebuild after
+# lost saves never sees a save half counted
+_analytics_lock = threading.Lock()
+
+def login_enabled():
+    """Return True if Streamlit authentication is configured ([auth] in secrets.toml)."""
+    try:
+        return 'auth' in st.secrets
+    except FileNotFoundError:
+        return False
+
+def needs_login():
+    """Return True if the session must sign in before it can open a journal."""
+    return login_enabled() and _authenticated_user_id() is None
+
+def current_user_id():
+    """
+    Return the id of the session's journal.
+    
+    Without authentication configured the app is a personal install: every
+    session opens the one journal, which lasts across reloads and restarts.
+    With authentication configured, each signed-in account has a journal of
+    its own, and app.py asks anyone else to log in before showing a page.
+    
+    Raises:
+        RuntimeError: If authentication is configured and the session hasn't signed in
+    """
+    user_id = _authenticated_user_id()
+    if user_id is not None:
+        return user_id
+    if login_enabled():
+        raise RuntimeError("Log in to open your journal")
+    return DEFAULT_USER
+
+def _authenticated_user_id():
+    """Return the signed-in account's journal id, or None without a login."""
+    if not st.user.get('is_logged_in'):
+        return None
+    # The identity provider's subject is stable; email is the fallback
+    subject = st.user.get('sub') or st.user.get('email')
+    return f"user:{subject}" if subject else None
+
+def get_journal_store():
+    """Return the session user's view of the journal store; rows load on demand."""
+    return JournalStore(user_id=current_user_id(), pool=get_connection_pool(), writer=get_journal_writer())
+
+def get_rollups():
+    """Return the day and week rollups of the session user's journal."""
+    return _get_user_rollups(current_user_id())
+
+@st.cache_resource(max_entries=USER_CACHE_SIZE)
+def _get_user_rollups(user_id):
+    """Build a user's rollups from the journal store once, shared by their sessions."""
+    store = JournalStore(user_id=user_id, pool=get_connection_pool(), writer=get_journal_writer())
+    return Rollups.from_entries(store.iter_entries())
+
+# Period summaries kept per server, across users and date ranges
+SUMMARY_CACHE_SIZE = int(os.environ.get('JOURNAL_SUMMARY_CACHE_SIZE', 32))
+
+def get_data_version():
+    """Return the version of the session user's journal; it changes with every change."""
+    return get_rollups().version
+
+def period_key(start_date, end_date):
+    """
+    Return the cache key of the session user's summary of [start_date, end_date].
+    
+    The key is (user, start date, end date, data version). Take it once per
+    rerun and use it for the summary and everything drawn from it, so they
+    all describe the same state of the journal.
+    """
+    return (current_user_id(), start_date, end_date, get_data_version())
+
+def get_period_summary(key):
+    """
+    Return the SummaryStats a period_key() identifies.
+    
+    Cached on the key, so reruns reuse it until the journal changes.
+    """
+    return _get_period_summary(*key)
+
+@st.cache_data(max_entries=SUMMARY_CACHE_SIZE, show_spinner=False)
+def _get_period_summary(user_id, start_date, end_date, version):
+    """Compute a period summary from the rollups; version only keys the cache."""
+    return SummaryStats.compute(start_date, end_date, _get_user_rollups(user_id))
+
+def get_period_entries(start_date, end_date, offset, limit):
+    """
+    Return one page of the session user's entries in [start_date, end_date].
+    
+    Args:
+        start_date (date): First day
+        end_date (date): Last day
+        offset (int): Entries of the period to skip, oldest first
+        limit (int): Most entries returned
+        
+    Returns:
+        list: EntrySummary records, with previews instead of full text
+    """
+    rows = get_journal_store().listing_between(
+        start_date, end_date, PREVIEW_LENGTH + 1, limit=limit, offset=offset
+    )
+    return [EntrySummary(**row) for row in rows]
 
 def initialize_session_state():
     """Initialize the session state with default values if not already set."""
@@ -14,9 +163,6 @@ def initialize_session_state():
     if 'current_lesson' not in st.session_state:
         st.session_state.current_lesson = 1
         
-    if 'journal_entries' not in st.session_state:
-        st.session_state.journal_entries = []
-        
     if 'completed_lessons' not in st.session_state:
         st.session_state.completed_lessons = set()
         
@@ -54,7 +200,7 @@ def initialize_session_state():
 
 def save_journal_entry(module, lesson, prompt, content, sentiment_data, themes):
     """
-    Save a journal entry to the session state.
+    Save a journal entry to the journal store.
     
     Args:
         module (int): The module number
@@ -74,7 +220,7 @@ def save_journal_entry(module, lesson, prompt, content, sentiment_data, themes):
             sentiment_data['emotions'] = {'neutral': 50}
             
         entry = {
-            'id': len(st.session_state.journal_entries) + 1,
+            'id': None,  # Assigned by the store
             'date': datetime.now().strftime('%Y-%m-%d'),
             'time': datetime.now().strftime('%H:%M'),
             'module': module,
@@ -85,11 +231,15 @@ def save_journal_entry(module, lesson, prompt, content, sentiment_data, themes):
             'themes': themes if themes else []
         }
         
-        # Initialize journal_entries if it doesn't exist
-        if 'journal_entries' not in st.session_state:
-            st.session_state.journal_entries = []
-            
-        st.session_state.journal_entries.append(entry)
+        # Fetch anything built lazily from the store before the entry goes in,
+        # so it isn't counted twice
+        theme_index = get_theme_index()
+        rollups = get_rollups()
+        terms = get_shared_analyzer().theme_terms(content)
+        with _analytics_lock:
+            entry = get_journal_store().add(entry)
+            rollups.add(entry)
+            theme_index.add_document(terms)
         
         # Mark the lesson as completed
         lesson_key = f"{module}-{lesson}"
@@ -103,9 +253,9 @@ def save_journal_entry(module, lesson, prompt, content, sentiment_data, themes):
         return entry
     except Exception as e:
         st.error(f"Error saving journal entry: {str(e)}")
-        # Return a default entry to prevent further errors
+        # Return a default entry to prevent further errors; it was never stored
         return {
-            'id': len(st.session_state.get('journal_entries', [])) + 1,
+            'id': None,
             'date': datetime.now().strftime('%Y-%m-%d'),
             'time': datetime.now().strftime('%H:%M'),
             'module': module,
@@ -116,6 +266,51 @@ def save_journal_entry(module, lesson, prompt, content, sentiment_data, themes):
             'themes': []
         }
 
+def report_failed_saves():
+    """
+    Show an error if saves of the session user's journal were lost.
+    
+    Saves are committed in the background, so one that keeps failing is
+    only known after its page has finished. The rollups and theme index
+    already counted it, so they are rebuilt from what the store holds.
+    """
+    user_id = current_user_id()
+    error = get_journal_writer().take_failure(user_id)
+    if error is None:
+        return
+    store = get_journal_store()
+    with _analytics_lock:
+        _get_user_rollups(user_id).reset(store.iter_entries())
+        _get_user_theme_index(user_id).reset(_theme_documents(store.iter_contents()))
+    st.error(f"Some journal entries could not be saved and were lost: {error}")
+
+def clear_journal():
+    """Delete every journal entry, along with the analytics built from them."""
+    get_journal_store().clear()
+    get_rollups().reset()
+    get_theme_index().reset()
+
+def get_theme_index():
+    """
+    Return the theme index of the session user's journal.
+    
+    Returns:
+        ThemeIndex: Document frequencies of theme words across the journal
+    """
+    return _get_user_theme_index(current_user_id())
+
+@st.cache_resource(max_entries=USER_CACHE_SIZE)
+def _get_user_theme_index(user_id):
+    """Build a user's theme index from the journal store once, shared by their sessions."""
+    store = JournalStore(user_id=user_id, pool=get_connection_pool(), writer=get_journal_writer())
+    return ThemeIndex.from_documents(_theme_documents(store.iter_contents()))
+
+def _theme_documents(contents):
+    """Yield the theme words of each text, for a ThemeIndex."""
+    analyzer = get_shared_analyzer()
+    for content in contents:
+        yield analyzer.theme_terms(content)
+
 def update_growth_metrics(sentiment_data):
     """
     Update growth metrics based on journal entry sentiment.
@@ -195,14 +390,12 @@ def get_journal_entries_for_period(start_date, end_date):
     Returns:
         list: Journal entries within the date range
     """
-    entries = []
-    
-    for entry in st.session_state.journal_entries:
-        entry_date = datetime.strptime(entry['date'], '%Y-%m-%d')
-        if start_date <= entry_date <= end_date:
-            entries.append(entry)
+    # Entries are dated at midnight, so a start time past midnight excludes that day
+    first_day = start_date.date()
+    if start_date.time() != datetime.min.time():
+        first_day += timedelta(days=1)
     
-    return entries
+    return get_journal_store().entries_between(first_day, end_date.date())
 
 def get_module_completion_percentage():
     """
@@ -222,18 +415,73 @@ def export_user_data():
     Returns:
         str: JSON string containing user data
     """
-    data = {
+    buffer = io.BytesIO()
+    write_user_data(buffer)
+    return buffer.getvalue().decode('utf-8')
+
+def write_user_data(fileobj, compress=False):
+    """
+    Stream user data as JSON into a binary file-like object.
+    
+    Args:
+        fileobj: Binary file-like object to write to
+        compress (bool): Gzip the output
+    """
+    write_export(fileobj, _export_settings(), get_journal_store().iter_entries(), compress=compress)
+
+def write_user_snapshot(fileobj):
+    """
+    Write user data as a binary snapshot (see utils.snapshot).
+    
+    Holds the same data as the JSON export but is smaller and much faster
+    to restore. import_user_data_stream() accepts either format.
+    
+    Args:
+        fileobj: Binary file-like object to write to
+    """
+    write_snapshot(fileobj, _export_settings(), get_journal_store().iter_entries())
+
+def _export_settings():
+    """Collect the exported session settings."""
+    return {
         'user_name': st.session_state.user_name,
         'current_module': st.session_state.current_module,
         'current_lesson': st.session_state.current_lesson,
-        'journal_entries': st.session_state.journal_entries,
         'completed_lessons': list(st.session_state.completed_lessons),
         'daily_check_in': st.session_state.daily_check_in,
         'growth_metrics': st.session_state.growth_metrics,
         'export_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
+
+def write_export(fileobj, settings, entries, compress=False):
+    """
+    Write an export document, encoding one entry at a time.
     
-    return json.dumps(data, indent=2)
+    Produces the same JSON document as before, with entries one per line, so
+    memory use doesn't grow with the size of the journal.
+    
+    Args:
+        fileobj: Binary file-like object to write to
+        settings (dict): Top-level fields other than journal_entries
+        entries (iterable): Journal entries as dicts or JournalEntry records
+        compress (bool): Gzip the output
+    """
+    if compress:
+        with gzip.GzipFile(fileobj=fileobj, mode='wb') as gzip_file:
+            write_export(gzip_file, settings, entries)
+        return
+    
+    fileobj.write(b'{\n')
+    for key, value in settings.items():
+        fileobj.write(f'  {json.dumps(key)}: {json.dumps(value)},\n'.encode('utf-8'))
+    fileobj.write(b'  "journal_entries": [')
+    separator = b'\n    '
+    for entry in entries:
+        if not isinstance(entry, dict):
+            entry = entry.to_dict()
+        fileobj.write(separator + json.dumps(entry).encode('utf-8'))
+        separator = b',\n    '
+    fileobj.write(b'\n  ]\n}\n')
 
 def import_user_data(json_data):
     """
@@ -245,27 +493,136 @@ def import_user_data(json_data):
     Returns:
         bool: Success status
     """
-    try:
-        data = json.loads(json_data)
-        
-        # Update session state
-        st.session_state.user_name = data.get('user_name', 'User')
-        st.session_state.current_module = data.get('current_module', 1)
-        st.session_state.current_lesson = data.get('current_lesson', 1)
-        st.session_state.journal_entries = data.get('journal_entries', [])
-        st.session_state.completed_lessons = set(data.get('completed_lessons', []))
-        st.session_state.daily_check_in = data.get('daily_check_in', {
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'mood': 5,
-            'reflection': ''
-        })
-        st.session_state.growth_metrics = data.get('growth_metrics', {
-            'emotional_awareness': 0,
-            'coping_strategies': 0,
-            'resilience': 0
-        })
+    return import_user_data_stream(io.BytesIO(json_data.encode('utf-8'))) is not None
+
+def import_user_data_stream(fileobj, progress=None, batch_size=1000):
+    """
+    Import user data from an export file, parsing it once as a stream.
+    
+    Each journal entry is decoded, checked against the entry schema and
+    inserted in batches, so memory stays bounded however large the archive.
+    Invalid entries are skipped and reported. The journal is replaced in one
+    transaction, so a malformed file leaves the existing journal untouched.
+    
+    Args:
+        fileobj: Binary file-like object holding export JSON, optionally
+            gzipped, or a snapshot from write_user_snapshot()
+        progress (callable): Called with the number of entries imported so far
+            after every batch
+        batch_size (int): Entries inserted per batch
         
-        return True
+    Returns:
+        dict: {'imported': int, 'skipped': int, 'problems': list of str},
+              or None if the import failed
+    """
+    # Gzip exports and snapshots are recognised by their magic numbers
+    head = fileobj.read(len(SNAPSHOT_MAGIC))
+    fileobj.seek(0)
+    if is_snapshot(head):
+        return _restore_snapshot(fileobj, progress, batch_size)
+    if head[:2] == b'\x1f\x8b':
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode='rb')
+    
+    report = {'imported': 0, 'skipped': 0, 'problems': []}
+    journal_store = get_journal_store()
+    rollups = get_rollups()
+    theme_index = get_theme_index()
+    
+    text_stream = io.TextIOWrapper(fileobj, encoding='utf-8')
+    reader = ExportReader(text_stream)
+    
+    def valid_entries():
+        for number, entry in enumerate(reader.entries(), start=1):
+            problems = validate_entry(entry)
+            if problems:
+                report['skipped'] += 1
+                if len(report['problems']) < MAX_REPORTED_PROBLEMS:
+                    report['problems'].append(f"Entry {number}: {'; '.join(problems)}")
+                continue
+            
+            rollups.add(entry)
+            report['imported'] += 1
+            if progress is not None and report['imported'] % batch_size == 0:
+                progress(report['imported'])
+            yield entry
+    
+    try:
+        rollups.reset()
+        journal_store.replace_all(valid_entries(), batch_size=batch_size)
+        # Summaries cached while the import ran may have missed its entries
+        rollups.touch()
     except Exception as e:
+        # The store rolled back, so bring the rollups back in line with it
+        rollups.reset(journal_store.iter_entries())
         st.error(f"Error importing data: {str(e)}")
-        return False
+        return None
+    finally:
+        # Leave the caller's file open
+        text_stream.detach()
+    theme_index.reset(_theme_documents(journal_store.iter_contents()))
+    
+    _apply_imported_settings(reader.settings)
+    if progress is not None:
+        progress(report['imported'])
+    return report
+
+def _restore_snapshot(fileobj, progress, batch_size):
+    """Restore a binary snapshot; see import_user_data_stream()."""
+    report = {'imported': 0, 'skipped': 0, 'problems': []}
+    journal_store = get_journal_store()
+    rollups = get_rollups()
+    theme_index = get_theme_index()
+    
+    try:
+        settings, records = read_snapshot(fileobj)
+    except ValueError as e:
+        st.error(f"Error importing data: {str(e)}")
+        return None
+    
+    entries = []
+    for number, record in enumerate(records, start=1):
+        # Records that went through from_dict() cleanly are already valid
+        if record.extra or record.day is None or record.content is None:
+            problems = validate_entry(record.to_dict())
+            if problems:
+                report['skipped'] += 1
+                if len(report['problems']) < MAX_REPORTED_PROBLEMS:
+                    report['problems'].append(f"Entry {number}: {'; '.join(problems)}")
+                continue
+        entries.append(record)
+    
+    def counted_entries():
+        for count, entry in enumerate(entries, start=1):
+            if progress is not None and count % batch_size == 0:
+                progress(count)
+            yield entry
+    
+    try:
+        report['imported'] = journal_store.replace_all(counted_entries(), batch_size=batch_size)
+    except Exception as e:
+        st.error(f"Error importing data: {str(e)}")
+        return None
+    rollups.reset(entries)
+    theme_index.reset(_theme_documents(record.content or '' for record in entries))
+    
+    _apply_imported_settings(settings)
+    if progress is not None:
+        progress(report['imported'])
+    return report
+
+def _apply_imported_settings(data):
+    """Load imported settings into the session."""
+    st.session_state.user_name = data.get('user_name', 'User')
+    st.session_state.current_module = data.get('current_module', 1)
+    st.session_state.current_lesson = data.get('current_lesson', 1)
+    st.session_state.completed_lessons = set(data.get('completed_lessons', []))
+    st.session_state.daily_check_in = data.get('daily_check_in', {
+        'date': datetime.now().strftime('%Y-%m-%d'),
+        'mood': 5,
+        'reflection': ''
+    })
+    st.session_state.growth_metrics = data.get('growth_metrics', {
+        'emotional_awareness': 0,
+        'coping_strategies': 0,
+        'resilience': 0
+    })
@@ -0,0 +1,201 @@
+import math
+import sys
+from array import array
+from datetime import date, datetime
+from utils.sentiment_analysis import EMOTION_KEYWORDS
+
+# Fixed emotion order of JournalEntry.emotion_scores; save_journal_entry
+# fills in 'neutral' when nothing was detected
+ENTRY_EMOTIONS = tuple(EMOTION_KEYWORDS) + ('neutral',)
+_EMOTION_INDEX = {emotion: i for i, emotion in enumerate(ENTRY_EMOTIONS)}
+
+# Fields kept as-is in a slot when they have the expected type
+_PLAIN_FIELDS = {'id': int, 'time': str, 'module': int, 'lesson': int, 'prompt': str, 'content': str}
+_SCORE_FIELDS = ('compound', 'pos', 'neu', 'neg')
+_FIELD_ORDER = ('id', 'date', 'time', 'module', 'lesson', 'prompt', 'content', 'sentiment', 'themes')
+
+_ABSENT = object()
+
+def day_ordinal(date_str):
+    """
+    Parse an entry date into a proleptic Gregorian day number.
+
+    Returns:
+        int: date.toordinal() of the 'YYYY-MM-DD' date, or None if it isn't one
+    """
+    # Canonical dates take the fast ISO parser; strptime also accepts
+    # unpadded forms such as '2024-1-5'
+    if isinstance(date_str, str) and len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return date.fromisoformat(date_str).toordinal()
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').toordinal()
+    except (ValueError, TypeError):
+        return None
+
+def _is_type(value, kind):
+    """Exact type check, so bools don't pass for ints."""
+    return type(value) is kind
+
+class JournalEntry:
+    """
+    Compact record of one journal entry.
+
+    Uses __slots__ instead of a per-entry dict: the date is a day ordinal,
+    module and lesson are small ints, emotion scores sit in a fixed-order
+    float array (NaN where absent), and category, time, prompt and theme
+    strings are interned so repeats share one object. Anything that doesn't
+    fit those types is kept verbatim in `extra`, so from_dict() followed by
+    to_dict() always gives back an equal dict. Supports the read-only dict
+    access the pages use: entry['key'], entry.get(), 'key' in entry.
+    """
+
+    __slots__ = (
+        'id', 'day', 'time', 'module', 'lesson', 'prompt', 'content',
+        'category', 'compound', 'pos', 'neu', 'neg', 'emotion_scores', 'themes',
+        'extra', 'sentiment_extra'
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a record from an entry in the dict/JSON shape.
+
+        Args:
+            data (dict): Journal entry as saved or exported
+
+        Returns:
+            JournalEntry: The compact record
+        """
+        entry = cls()
+        extra = {}
+        for key, value in data.items():
+            if key in _PLAIN_FIELDS and _is_type(value, _PLAIN_FIELDS[key]):
+                if key in ('time', 'prompt'):
+                    value = sys.intern(value)
+                setattr(entry, key, value)
+            elif key == 'date' and isinstance(value, str) and entry._set_date(value):
+                pass
+            elif key == 'themes' and _is_type(value, list) and all(_is_type(t, str) for t in value):
+                entry.themes = tuple(sys.intern(theme) for theme in value)
+            elif key == 'sentiment' and _is_type(value, dict) and _is_type(value.get('category'), str):
+                entry._set_sentiment(value)
+            else:
+                extra[key] = value
+        entry.extra = extra or None
+        return entry
+
+    def to_dict(self):
+        """Return the entry in the dict/JSON shape it was built from."""
+        data = {}
+        for key in _FIELD_ORDER:
+            value = self._field(key)
+            if value is not _ABSENT:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def emotions(self):
+        """Return the emotion scores as a dict, highest score first."""
+        if self.emotion_scores is None:
+            return None
+        present = [
+            (ENTRY_EMOTIONS[i], score)
+            for i, score in enumerate(self.emotion_scores) if not math.isnan(score)
+        ]
+        present.sort(key=lambda x: x[1], reverse=True)
+        return dict(present)
+
+    def __getitem__(self, key):
+        value = self._field(key)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._field(key)
+        return default if value is _ABSENT else value
+
+    def __contains__(self, key):
+        return self._field(key) is not _ABSENT
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __eq__(self, other):
+        if isinstance(other, JournalEntry):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return f"JournalEntry({self.to_dict()!r})"
+
+    def _field(self, key):
+        """Return one field in dict shape, or _ABSENT."""
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        if key in _PLAIN_FIELDS:
+            value = getattr(self, key)
+        elif key == 'date':
+            # _set_date() only keeps years from 1000 on, where isoformat()
+            # matches strftime('%Y-%m-%d') and is much cheaper
+            value = date.fromordinal(self.day).isoformat() if self.day is not None else None
+        elif key == 'themes':
+            value = list(self.themes) if self.themes is not None else None
+        elif key == 'sentiment':
+            value = self._sentiment() if self.category is not None else None
+        else:
+            return _ABSENT
+        return _ABSENT if value is None else value
+
+    def _set_date(self, value):
+        """Store value as a day ordinal if it round-trips exactly."""
+        day = day_ordinal(value)
+        if day is None or date.fromordinal(day).strftime('%Y-%m-%d') != value:
+            return False
+        self.day = day
+        return True
+
+    def _set_sentiment(self, sentiment):
+        """Split a sentiment dict into slots, keeping anything unusual verbatim."""
+        sentiment_extra = {}
+        for key, value in sentiment.items():
+            if key == 'category':
+                self.category = sys.intern(value)
+            elif key in _SCORE_FIELDS and _is_type(value, float):
+                setattr(self, key, value)
+            elif key == 'emotions' and _is_type(value, dict) and all(
+                emotion in _EMOTION_INDEX and _is_type(score, float) and not math.isnan(score)
+                for emotion, score in value.items()
+            ):
+                scores = array('d', [math.nan]) * len(ENTRY_EMOTIONS)
+                for emotion, score in value.items():
+                    scores[_EMOTION_INDEX[emotion]] = score
+                self.emotion_scores = scores
+            else:
+                sentiment_extra[key] = value
+        self.sentiment_extra = sentiment_extra or None
+
+    def _sentiment(self):
+        """Rebuild the sentiment dict from slots."""
+        sentiment = {}
+        for key in _SCORE_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                sentiment[key] = value
+        sentiment['category'] = self.category
+        if self.emotion_scores is not None:
+            sentiment['emotions'] = self.emotions()
+        if self.sentiment_extra:
+            sentiment.update(self.sentiment_extra)
+        return sentiment
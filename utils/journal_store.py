@@ -0,0 +1,442 @@
+import json
+import os
+from contextlib import nullcontext
+from datetime import date
+from utils.connection_pool import ConnectionPool
+from utils.journal_entry import JournalEntry, day_ordinal
+from utils.journal_writer import JournalWriter
+
+# Entry keys stored in their own columns; anything else goes in the extra JSON column
+ENTRY_COLUMNS = ('id', 'date', 'time', 'module', 'lesson', 'prompt', 'content', 'sentiment', 'themes')
+_JSON_COLUMNS = ('sentiment', 'themes')
+_SELECT = "SELECT " + ", ".join(ENTRY_COLUMNS) + ", extra FROM entries"
+
+# Tenant of sessions that don't name a user, and of journals from before users
+DEFAULT_USER = 'default'
+
+def open_journal_pool(path=None, size=8):
+    """
+    Open a connection pool on the journal database, creating or upgrading its tables.
+
+    Args:
+        path (str): SQLite file for the journal, or None for an in-memory database
+        size (int): Maximum number of open connections
+
+    Returns:
+        ConnectionPool: Pool to build JournalStore views on
+    """
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return ConnectionPool(path, size=size, setup=_create_schema)
+
+def open_journal_writer(pool, max_queue=1000, flush_interval=0.05):
+    """
+    Start a write-behind queue committing journal saves through pool.
+
+    Args:
+        pool (ConnectionPool): Pool from open_journal_pool()
+        max_queue (int): Entries waiting before a save blocks
+        flush_interval (float): Seconds to gather saves into one commit
+
+    Returns:
+        JournalWriter: Writer to pass to JournalStore views; close() it on shutdown
+    """
+    return JournalWriter(pool, JournalStore._insert_sql(), max_queue=max_queue,
+                         flush_interval=flush_interval)
+
+def _create_schema(conn):
+    """Create the entries table, migrating journals from before users."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+        migrate = bool(columns) and 'user_id' not in columns
+        if migrate:
+            conn.execute("ALTER TABLE entries RENAME TO entries_single_user")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                user_id TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                date TEXT,
+                time TEXT,
+                module INTEGER,
+                lesson INTEGER,
+                prompt TEXT,
+                content TEXT,
+                sentiment TEXT,
+                themes TEXT,
+                extra TEXT,
+                day INTEGER,
+                PRIMARY KEY (user_id, id)
+            )
+        """)
+        if migrate:
+            _migrate_single_user(conn, columns)
+        # Journals of anonymous sessions, which were kept under a random id per
+        # session for a while, can't be opened again by anyone
+        conn.execute("DELETE FROM entries WHERE user_id LIKE 'session:%'")
+        for index in ('idx_entries_date', 'idx_entries_day', 'idx_entries_module_lesson'):
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_user_day ON entries (user_id, day, id)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entries_user_module_lesson ON entries (user_id, module, lesson)"
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+def _migrate_single_user(conn, columns):
+    """Copy a journal from before users into the DEFAULT_USER tenant."""
+    copied = [column for column in ENTRY_COLUMNS + ('extra', 'day') if column in columns]
+    conn.execute(
+        "INSERT INTO entries (user_id, " + ", ".join(copied) + ") "
+        "SELECT ?, " + ", ".join(copied) + " FROM entries_single_user",
+        (DEFAULT_USER,)
+    )
+    if 'day' not in columns:
+        # Journals from before the day column: parse each date once
+        rows = conn.execute("SELECT id, date FROM entries").fetchall()
+        conn.executemany(
+            "UPDATE entries SET day = ? WHERE user_id = ? AND id = ?",
+            [(day_ordinal(date_str), DEFAULT_USER, entry_id) for entry_id, date_str in rows]
+        )
+    conn.execute("DROP TABLE entries_single_user")
+
+class JournalStore:
+    """
+    One user's view of the SQLite-backed journal.
+
+    Every user's entries live in one table keyed by (user_id, id), on a
+    connection pool shared by all sessions, so a view is cheap to make and
+    loads nothing until a page asks for rows. The database runs in WAL mode
+    so readers never wait on a writer, and writes take SQLite's write lock
+    up front, so concurrent sessions queue instead of clobbering each other.
+    Entries are indexed by user and day and by user and module/lesson, so
+    pages fetch just the rows they show. Each date is parsed once on write
+    into a day ordinal, and the sorted day index answers range queries by
+    binary search in O(log n + k). Entries go in and come out in the same
+    dict shape the app has always used.
+
+    With a JournalWriter, add() only queues the entry and returns; reads have
+    the user's queued entries committed first, without waiting out the
+    writer's gathering interval, so a session always sees its own saves.
+    Bulk changes hold the user's saves back until they are done.
+    """
+
+    def __init__(self, path=None, user_id=DEFAULT_USER, pool=None, writer=None):
+        """
+        Args:
+            path (str): SQLite file for the journal, or None for an in-memory
+                store; ignored when pool is given
+            user_id (str): Whose entries this view reads and writes
+            pool (ConnectionPool): Shared pool from open_journal_pool()
+            writer (JournalWriter): Write-behind queue for add(), or None to
+                commit each entry before add() returns
+        """
+        self._pool = pool if pool is not None else open_journal_pool(path)
+        self.user_id = user_id
+        self._writer = writer
+
+    def add(self, entry):
+        """
+        Insert one entry, assigning the user's next id if it has none.
+
+        Returns:
+            dict: The entry as stored, including its id
+        """
+        row = self._to_row(entry)
+        if self._writer is not None:
+            entry_id = self._writer.add(self.user_id, row, self._next_free_id)
+            stored = dict(entry)
+            stored['id'] = entry_id
+            return stored
+        with self._pool.transaction() as conn:
+            entry_id = row[0]
+            if entry_id is None or self._exists(conn, entry_id):
+                entry_id = self._next_id(conn)
+            conn.execute(self._insert_sql(), (self.user_id, entry_id) + row[1:])
+        stored = dict(entry)
+        stored['id'] = entry_id
+        return stored
+
+    def add_many(self, entries, batch_size=1000):
+        """
+        Insert entries in one transaction, batch_size rows at a time.
+
+        entries may be any iterable, so a stream of entries is never held in
+        memory at once. Entries keep their own integer ids; missing or
+        repeated ids are given the next free id.
+
+        Returns:
+            int: Number of entries inserted
+        """
+        with self._saves_held():
+            with self._pool.transaction() as conn:
+                return self._insert_batches(conn, entries, batch_size)
+
+    def replace_all(self, entries, batch_size=1000):
+        """
+        Replace the user's whole journal with entries in one transaction.
+
+        If reading or inserting entries fails part way, the old journal is kept.
+
+        Returns:
+            int: Number of entries inserted
+        """
+        with self._saves_held():
+            with self._pool.transaction() as conn:
+                conn.execute("DELETE FROM entries WHERE user_id = ?", (self.user_id,))
+                return self._insert_batches(conn, entries, batch_size)
+
+    def clear(self):
+        """Delete every entry of the user."""
+        with self._saves_held():
+            with self._pool.transaction() as conn:
+                conn.execute("DELETE FROM entries WHERE user_id = ?", (self.user_id,))
+
+    def flush(self, timeout=None):
+        """
+        Commit the user's queued entries and wait for them.
+
+        Entries the writer had to drop are reported by its take_failure().
+        """
+        if self._writer is not None:
+            self._writer.flush(self.user_id, timeout)
+
+    def count(self):
+        """Return the number of entries."""
+        return self._scalar("SELECT COUNT(*) FROM entries WHERE user_id = ?")
+
+    def get(self, entry_id):
+        """Return the entry with entry_id, or None."""
+        entries = self._query(_SELECT + " WHERE user_id = ? AND id = ?", (entry_id,))
+        return entries[0] if entries else None
+
+    def entries_between(self, start_date, end_date):
+        """
+        Return entries dated within [start_date, end_date], oldest first.
+
+        Entries whose date isn't a valid 'YYYY-MM-DD' never match.
+
+        Args:
+            start_date (date): First day
+            end_date (date): Last day
+        """
+        return self._query(
+            _SELECT + " WHERE user_id = ? AND day BETWEEN ? AND ? ORDER BY day, id",
+            (start_date.toordinal(), end_date.toordinal())
+        )
+
+    def listing_between(self, start_date, end_date, preview_length, limit=-1, offset=0):
+        """
+        Return what a listing shows of entries dated within [start_date, end_date], oldest first.
+
+        Reads only the listed columns and the first preview_length characters
+        of each text, picks the dominant emotion in SQL, and pages with
+        limit and offset, so a page costs the same however long the range.
+
+        Returns:
+            list: Dicts of EntrySummary arguments (entry_id, day, module,
+                lesson, content, has_sentiment, category, dominant_emotion, themes)
+        """
+        self.flush()
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, day, module, lesson, substr(content, 1, ?),
+                       json_type(sentiment) = 'object',
+                       json_extract(sentiment, '$.category'),
+                       CASE WHEN json_type(sentiment, '$.emotions') = 'object' THEN (
+                           SELECT key FROM json_each(sentiment, '$.emotions')
+                           WHERE type IN ('integer', 'real') ORDER BY value DESC, id LIMIT 1
+                       ) END,
+                       themes
+                FROM entries WHERE user_id = ? AND day BETWEEN ? AND ?
+                ORDER BY day, id LIMIT ? OFFSET ?
+                """,
+                (preview_length, self.user_id, start_date.toordinal(), end_date.toordinal(), limit, offset)
+            ).fetchall()
+        return [
+            {'entry_id': entry_id, 'day': day, 'module': module, 'lesson': lesson,
+             'content': content, 'has_sentiment': bool(has_sentiment), 'category': category,
+             'dominant_emotion': dominant_emotion, 'themes': json.loads(themes) if themes else []}
+            for entry_id, day, module, lesson, content, has_sentiment, category, dominant_emotion, themes in rows
+        ]
+
+    def first(self, limit=1):
+        """Return the earliest saved entries, oldest first."""
+        return self._query(_SELECT + " WHERE user_id = ? ORDER BY id LIMIT ?", (limit,))
+
+    def latest(self, limit=1):
+        """Return the most recently saved entries, oldest first."""
+        entries = self._query(_SELECT + " WHERE user_id = ? ORDER BY id DESC LIMIT ?", (limit,))
+        entries.reverse()
+        return entries
+
+    def date_range(self):
+        """
+        Return the earliest and latest entry dates.
+
+        Returns:
+            tuple: (first date, last date) as dates, or (None, None) without valid dates
+        """
+        self.flush()
+        with self._pool.connection() as conn:
+            first_day, last_day = conn.execute(
+                "SELECT MIN(day), MAX(day) FROM entries WHERE user_id = ?", (self.user_id,)
+            ).fetchone()
+        if first_day is None:
+            return None, None
+        return date.fromordinal(first_day), date.fromordinal(last_day)
+
+    def count_by_module(self):
+        """Return a dict of module number -> number of entries."""
+        self.flush()
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT module, COUNT(*) FROM entries WHERE user_id = ? GROUP BY module", (self.user_id,)
+            ).fetchall()
+        return {module: count for module, count in rows}
+
+    def iter_entries(self, batch_size=500):
+        """Yield every entry in saved order, fetching batch_size rows at a time."""
+        last_id = -1
+        while True:
+            batch = self._query(
+                _SELECT + " WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+            )
+            if not batch:
+                return
+            yield from batch
+            last_id = batch[-1]['id']
+
+    def iter_contents(self, batch_size=500):
+        """Yield the text of every entry in saved order."""
+        self.flush()
+        last_id = -1
+        while True:
+            with self._pool.connection() as conn:
+                rows = conn.execute(
+                    "SELECT id, content FROM entries WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?",
+                    (self.user_id, last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for _, content in rows:
+                yield content or ''
+            last_id = rows[-1][0]
+
+    def _scalar(self, sql, params=()):
+        """Run a query on this user's rows; the user id is bound first."""
+        self.flush()
+        with self._pool.connection() as conn:
+            return conn.execute(sql, (self.user_id,) + params).fetchone()[0]
+
+    def _query(self, sql, params=()):
+        """Fetch this user's entries; the user id is bound first."""
+        self.flush()
+        with self._pool.connection() as conn:
+            rows = conn.execute(sql, (self.user_id,) + params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def _exists(self, conn, entry_id):
+        return conn.execute(
+            "SELECT 1 FROM entries WHERE user_id = ? AND id = ?", (self.user_id, entry_id)
+        ).fetchone() is not None
+
+    def _next_free_id(self):
+        with self._pool.connection() as conn:
+            return self._next_id(conn)
+
+    def _saves_held(self):
+        """Keep the writer from queueing the user's saves during a bulk change."""
+        if self._writer is None:
+            return nullcontext()
+        return self._writer.hold(self.user_id)
+
+    def _next_id(self, conn):
+        return (conn.execute(
+            "SELECT MAX(id) FROM entries WHERE user_id = ?", (self.user_id,)
+        ).fetchone()[0] or 0) + 1
+
+    @staticmethod
+    def _insert_sql():
+        return (
+            "INSERT INTO entries (user_id, " + ", ".join(ENTRY_COLUMNS) + ", extra, day) VALUES (?, "
+            + ", ".join("?" for _ in ENTRY_COLUMNS) + ", ?, ?)"
+        )
+
+    def _insert_batches(self, conn, entries, batch_size):
+        """Insert entries batch_size rows at a time inside the caller's transaction."""
+        insert_sql = self._insert_sql()
+        next_id = self._next_id(conn)
+        seen_ids = set()
+        count = 0
+        batch = []
+        for entry in entries:
+            row = self._to_row(entry)
+            entry_id = row[0]
+            if entry_id is None or entry_id in seen_ids:
+                entry_id = next_id
+            seen_ids.add(entry_id)
+            next_id = max(next_id, entry_id + 1)
+            batch.append((self.user_id, entry_id) + row[1:])
+            if len(batch) >= batch_size:
+                conn.executemany(insert_sql, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            conn.executemany(insert_sql, batch)
+            count += len(batch)
+        return count
+
+    @staticmethod
+    def _to_row(entry):
+        """Flatten an entry dict into column values."""
+        if isinstance(entry, JournalEntry):
+            if not entry.extra:
+                return JournalStore._record_row(entry)
+            entry = entry.to_dict()
+        row = []
+        for column in ENTRY_COLUMNS:
+            value = entry.get(column)
+            if column == 'id' and (not isinstance(value, int) or isinstance(value, bool)):
+                value = None
+            elif column in _JSON_COLUMNS and value is not None:
+                value = json.dumps(value)
+            row.append(value)
+        extra = {key: value for key, value in entry.items() if key not in ENTRY_COLUMNS}
+        row.append(json.dumps(extra) if extra else None)
+        row.append(day_ordinal(entry.get('date')))
+        return tuple(row)
+
+    @staticmethod
+    def _record_row(entry):
+        """Column values straight from a JournalEntry's slots, as _to_row() would give."""
+        sentiment = entry._sentiment() if entry.category is not None else None
+        return (
+            entry.id,
+            entry.get('date'),
+            entry.time,
+            entry.module,
+            entry.lesson,
+            entry.prompt,
+            entry.content,
+            json.dumps(sentiment) if sentiment is not None else None,
+            json.dumps(list(entry.themes)) if entry.themes is not None else None,
+            None,
+            entry.day
+        )
+
+    @staticmethod
+    def _from_row(row):
+        """Rebuild an entry from column values, leaving out empty columns."""
+        entry = {}
+        for column, value in zip(ENTRY_COLUMNS, row):
+            if value is None:
+                continue
+            entry[column] = json.loads(value) if column in _JSON_COLUMNS else value
+        extra = row[len(ENTRY_COLUMNS)]
+        if extra:
+            entry.update(json.loads(extra))
+        return JournalEntry.from_dict(entry)
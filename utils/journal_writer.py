@@ -0,0 +1,296 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+class JournalWriter:
+    """
+    Write-behind queue for journal saves.
+
+    add() gives the entry its id and returns at once; a background thread
+    drains a bounded queue and commits everything that arrived within
+    `flush_interval` of the first waiting entry in one transaction (group
+    commit), so a burst of saves costs one disk sync instead of one each.
+    flush() waits until queued entries are on disk and has them committed
+    straight away rather than after the interval. close() commits whatever
+    is queued and stops the thread; call it on shutdown.
+
+    A failed commit is retried `retries` times. After that its entries are
+    dropped and the error is kept for each of their users until
+    take_failure() collects it, so a lost save is never silent; flush() and
+    the reads behind it carry on regardless.
+
+    Ids are handed out from a per-user counter seeded from the database, and
+    an entry is stored under exactly the id add() returned. Changes to a
+    journal that bypass the writer (imports, clearing) go through hold(),
+    so the counter can't go stale in this process; a row whose id was taken
+    by another process fails rather than moving to a different id.
+    """
+
+    def __init__(self, pool, insert_sql, max_queue=1000, flush_interval=0.05, max_batch=500,
+                 retries=3, retry_interval=1.0):
+        """
+        Args:
+            pool (ConnectionPool): Pool the entries are committed through
+            insert_sql (str): INSERT statement taking a row from JournalStore
+            max_queue (int): Entries waiting before add() blocks
+            flush_interval (float): Seconds to gather entries into one commit
+            max_batch (int): Most entries committed in one transaction
+            retries (int): Times a failed commit is retried before its entries are dropped
+            retry_interval (float): Seconds before retrying a failed commit
+        """
+        self._pool = pool
+        self._insert_sql = insert_sql
+        self._max_queue = max_queue
+        self.flush_interval = flush_interval
+        self._max_batch = max_batch
+        self._retries = retries
+        self._retry_interval = retry_interval
+
+        # Queued (user_id, row, queued_at); one condition covers every state change
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+        # Next id per user, so ids are known before the row is written. The
+        # generation goes up whenever a counter is dropped, so an id read from
+        # the database before then isn't used to seed it again.
+        self._next_ids = {}
+        self._generation = 0
+        self._pending = {}
+        self._held = set()
+        self._failures = {}
+        self._flushing = 0
+
+        self.stats = {
+            'queued': 0, 'committed': 0, 'commits': 0, 'errors': 0, 'failed': 0, 'max_depth': 0,
+            'last_commit_ms': 0.0, 'total_commit_ms': 0.0,
+            'last_latency_ms': 0.0, 'max_latency_ms': 0.0, 'last_error': None,
+        }
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='journal-writer', daemon=True)
+        self._thread.start()
+
+    def add(self, user_id, row, next_id):
+        """
+        Queue one row for user_id.
+
+        Args:
+            user_id (str): Owner of the entry
+            row (tuple): Column values from JournalStore._to_row()
+            next_id (callable): Returns the user's next free id from the
+                database; only called when the user has no counter yet
+
+        Returns:
+            int: The id the entry will be stored under
+
+        Raises:
+            RuntimeError: If the writer is closed
+        """
+        seed = None
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._closed or self._accepts(user_id))
+                if self._closed:
+                    raise RuntimeError("Journal writer is closed")
+                entry_id = self._next_ids.get(user_id)
+                if entry_id is None and seed is not None and seed[0] == self._generation:
+                    entry_id = seed[1]
+                if entry_id is not None:
+                    return self._enqueue(user_id, row, entry_id)
+                generation = self._generation
+            # Read outside the lock: it borrows a pool connection, which the
+            # writer thread may be holding while it waits to report a commit
+            seed = (generation, next_id())
+
+    def pending(self, user_id=None):
+        """Return the number of entries queued but not yet committed."""
+        with self._lock:
+            if user_id is None:
+                return sum(self._pending.values())
+            return self._pending.get(user_id, 0)
+
+    def flush(self, user_id=None, timeout=None):
+        """
+        Commit queued entries (only user_id's, if given) now and wait for them.
+
+        Entries that are dropped instead don't make it fail; see take_failure().
+
+        Raises:
+            TimeoutError: If they aren't committed within timeout seconds
+        """
+        with self._changed:
+            self._flushing += 1
+            self._changed.notify_all()
+            try:
+                if not self._changed.wait_for(lambda: self._settled(user_id), timeout):
+                    raise TimeoutError("Journal entries are still waiting to be written")
+            finally:
+                self._flushing -= 1
+
+    def take_failure(self, user_id):
+        """
+        Return, once, the error that last dropped entries of user_id.
+
+        Returns:
+            Exception: Why the entries couldn't be saved, or None if none were lost
+        """
+        with self._lock:
+            return self._failures.pop(user_id, None)
+
+    @contextmanager
+    def hold(self, user_id):
+        """
+        Hold back user_id's saves while their journal is changed another way.
+
+        Commits the user's queued entries first and makes add() wait until
+        the with block ends; the user's id counter is then read again from
+        the database.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: user_id not in self._held)
+            self._held.add(user_id)
+        try:
+            self.flush(user_id)
+            yield
+        finally:
+            with self._changed:
+                self._held.discard(user_id)
+                self._drop_counter(user_id)
+                self._changed.notify_all()
+
+    def metrics(self):
+        """Return queue depth and commit timings for display."""
+        with self._lock:
+            stats = dict(self.stats)
+            depth = len(self._items)
+            pending = sum(self._pending.values())
+        commits = stats['commits']
+        return {
+            'queue_depth': depth,
+            'pending': pending,
+            'max_depth': stats['max_depth'],
+            'commits': commits,
+            'committed': stats['committed'],
+            'avg_batch': stats['committed'] / commits if commits else 0.0,
+            'last_commit_ms': stats['last_commit_ms'],
+            'avg_commit_ms': stats['total_commit_ms'] / commits if commits else 0.0,
+            'last_latency_ms': stats['last_latency_ms'],
+            'max_latency_ms': stats['max_latency_ms'],
+            'errors': stats['errors'],
+            'failed': stats['failed'],
+            'last_error': stats['last_error'],
+        }
+
+    def close(self, timeout=None):
+        """Commit everything queued and stop the writer thread; later saves are refused."""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        self._thread.join(timeout)
+
+    def _accepts(self, user_id):
+        return user_id not in self._held and len(self._items) < self._max_queue
+
+    def _enqueue(self, user_id, row, entry_id):
+        """Queue a row under entry_id; called with the lock held."""
+        # Keep an explicit id only if it can't collide with one handed out
+        if isinstance(row[0], int) and row[0] >= entry_id:
+            entry_id = row[0]
+        self._next_ids[user_id] = entry_id + 1
+        self._pending[user_id] = self._pending.get(user_id, 0) + 1
+        self._items.append((user_id, (user_id, entry_id) + row[1:], time.perf_counter()))
+        self.stats['queued'] += 1
+        self.stats['max_depth'] = max(self.stats['max_depth'], len(self._items))
+        self._changed.notify_all()
+        return entry_id
+
+    def _settled(self, user_id):
+        if user_id is None:
+            return not self._pending
+        return not self._pending.get(user_id)
+
+    def _drop_counter(self, user_id):
+        """Forget the user's next id, so it is read again from the database."""
+        self._next_ids.pop(user_id, None)
+        self._generation += 1
+
+    def _run(self):
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._items or self._closed)
+                if not self._items:
+                    return
+                # Group commit: gather what arrives within the interval of the
+                # oldest entry, unless someone is waiting for it
+                deadline = self._items[0][2] + self.flush_interval
+                while len(self._items) < self._max_batch and not self._closed and not self._flushing:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                batch = [self._items.popleft() for _ in range(min(len(self._items), self._max_batch))]
+                self._changed.notify_all()
+            self._commit(batch)
+
+    def _insert_each(self, conn, batch):
+        """Insert rows one at a time; return (user_id, error) for each row that was refused."""
+        refused = []
+        for user_id, row, _ in batch:
+            try:
+                conn.execute(self._insert_sql, row)
+            except sqlite3.IntegrityError as e:
+                refused.append((user_id, sqlite3.IntegrityError(f"entry id {row[1]} is already taken ({e})")))
+        return refused
+
+    def _commit(self, batch):
+        """Write one batch in a single transaction, retrying a failed commit a few times."""
+        error = None
+        refused = []
+        for attempt in range(self._retries + 1):
+            if attempt:
+                time.sleep(self._retry_interval)
+            start = time.perf_counter()
+            try:
+                with self._pool.transaction() as conn:
+                    try:
+                        conn.executemany(self._insert_sql, [row for _, row, _ in batch])
+                        refused = []
+                    except sqlite3.IntegrityError:
+                        # Another process took some of these ids; store the rest
+                        conn.rollback()
+                        conn.execute("BEGIN IMMEDIATE")
+                        refused = self._insert_each(conn, batch)
+                error = None
+                break
+            except Exception as e:
+                error = e
+                with self._lock:
+                    self.stats['errors'] += 1
+                    self.stats['last_error'] = str(e)
+
+        done = time.perf_counter()
+        latency_ms = max(done - queued_at for _, _, queued_at in batch) * 1000
+        if error is not None:
+            refused = [(user_id, error) for user_id, _, _ in batch]
+        with self._changed:
+            for user_id, _, _ in batch:
+                self._pending[user_id] -= 1
+                if not self._pending[user_id]:
+                    del self._pending[user_id]
+            for user_id, reason in refused:
+                self._failures[user_id] = reason
+                # Re-read the counter once nothing queued depends on it
+                if user_id not in self._pending:
+                    self._drop_counter(user_id)
+            self.stats['failed'] += len(refused)
+            if error is None:
+                self.stats['commits'] += 1
+                self.stats['committed'] += len(batch) - len(refused)
+                self.stats['last_commit_ms'] = (done - start) * 1000
+                self.stats['total_commit_ms'] += (done - start) * 1000
+                self.stats['last_latency_ms'] = latency_ms
+                self.stats['max_latency_ms'] = max(self.stats['max_latency_ms'], latency_ms)
+                self.stats['last_error'] = str(refused[-1][1]) if refused else None
+            self._changed.notify_all()
@@ -8,9 +8,10 @@ from reportlab.graphics.charts.linecharts import HorizontalLineChart
 from reportlab.graphics.charts.piecharts import Pie
 from io import BytesIO
 import base64
-from datetime import datetime
 import tempfile
 import os
+from utils.rollups import Rollups
+from utils.summary_stats import SummaryStats, summarize_entries
 
 class PDFGenerator:
     def __init__(self):
@@ -129,25 +130,26 @@ class PDFGenerator:
         elements.append(intro)
         elements.append(Spacer(1, 12))
         
-        # Filter journal entries for the selected period
-        entries = [
-            entry for entry in user_data.get('journal_entries', [])
-            if start_date <= datetime.strptime(entry['date'], '%Y-%m-%d') <= end_date
-        ]
+        # Same summary the page shows, computed here if the caller has none
+        journal_entries = user_data.get('journal_entries', [])
+        stats = user_data.get('summary')
+        if stats is None:
+            stats = SummaryStats.compute(start_date.date(), end_date.date(), Rollups.from_entries(journal_entries))
+        entries = summarize_entries(journal_entries, start_date.date(), end_date.date())
+        
+        # Summaries hold previews; the report prints each entry in full
+        contents = {entry.get('id'): entry.get('content') for entry in journal_entries}
         
         # Section 1: Activity Summary
         elements.append(Paragraph("Activity Summary", self.custom_styles['Heading1']))
         elements.append(Spacer(1, 6))
         
         # Create a summary table
-        total_entries = len(entries)
-        total_words = sum(len(entry['content'].split()) for entry in entries)
-        
         activity_data = [
             ["Metric", "Value"],
-            ["Journal Entries", str(total_entries)],
-            ["Total Words Written", str(total_words)],
-            ["Average Words per Entry", str(round(total_words / max(total_entries, 1)))]
+            ["Journal Entries", str(stats.entry_count)],
+            ["Total Words Written", str(stats.total_words)],
+            ["Average Words per Entry", str(stats.average_words)]
         ]
         
         activity_table = Table(activity_data, colWidths=[200, 200])
@@ -170,26 +172,8 @@ class PDFGenerator:
             elements.append(Paragraph("Emotional Insights", self.custom_styles['Heading1']))
             elements.append(Spacer(1, 6))
             
-            # Collect emotion data
-            emotions = {
-                "joy": 0,
-                "sadness": 0,
-                "anger": 0,
-                "fear": 0,
-                "hope": 0
-            }
-            
-            for entry in entries:
-                if 'sentiment' in entry and 'emotions' in entry['sentiment']:
-                    for emotion, value in entry['sentiment']['emotions'].items():
-                        emotions[emotion] += value
-            
-            # Average the emotions
-            for emotion in emotions:
-                emotions[emotion] = round(emotions[emotion] / len(entries), 2)
-            
             # Create a paragraph describing emotional trends
-            dominant_emotion = max(emotions.items(), key=lambda x: x[1])[0]
+            dominant_emotion = stats.dominant_emotion or "neutral"
             elements.append(Paragraph(
                 f"Your dominant emotion during this period was <b>{dominant_emotion}</b>.",
                 self.custom_styles['Normal']
@@ -203,37 +187,31 @@ class PDFGenerator:
         
         for entry in entries:
             # Entry date and module/lesson info
-            date_str = datetime.strptime(entry['date'], '%Y-%m-%d').strftime('%B %d, %Y')
-            module_info = f"Module {entry.get('module', '?')}, Lesson {entry.get('lesson', '?')}"
-            
             elements.append(Paragraph(
-                f"<b>{date_str} - {module_info}</b>",
+                f"<b>{entry.date_label} - {entry.module_lesson}</b>",
                 self.custom_styles['Heading2']
             ))
             
             # Journal content
             elements.append(Paragraph(
-                entry.get('content', ''),
+                contents.get(entry.id) or entry.preview,
                 self.custom_styles['JournalEntry']
             ))
             
             # Sentiment summary
-            if 'sentiment' in entry:
-                sentiment = entry['sentiment']
+            if entry.has_sentiment:
                 elements.append(Paragraph(
-                    f"<b>Emotional tone:</b> {sentiment.get('category', 'neutral')}",
+                    f"<b>Emotional tone:</b> {entry.mood}",
                     self.custom_styles['Insight']
                 ))
                 
                 # Add themes if available
-                if 'themes' in entry:
-                    themes = entry['themes']
-                    if themes:
-                        theme_text = ", ".join(themes)
-                        elements.append(Paragraph(
-                            f"<b>Key themes:</b> {theme_text}",
-                            self.custom_styles['Insight']
-                        ))
+                if entry.themes:
+                    theme_text = ", ".join(entry.themes)
+                    elements.append(Paragraph(
+                        f"<b>Key themes:</b> {theme_text}",
+                        self.custom_styles['Insight']
+                    ))
             
             elements.append(Spacer(1, 12))
         
@@ -0,0 +1,70 @@
+from collections import deque
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Built once from a set of phrases (tuples of words), it finds every occurrence
+    of every phrase in a token list in a single linear pass, however many
+    phrases there are and however long they get.
+    """
+
+    def __init__(self, phrases):
+        """
+        Args:
+            phrases (dict): Tuple of words mapped to the payload reported on a match
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        # Build the trie of phrases
+        for words, payload in phrases.items():
+            state = 0
+            for word in words:
+                next_state = self._goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][word] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((len(words), payload))
+
+        # Breadth-first pass to link each state to its longest proper suffix state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(word, 0)
+                self._fail[next_state] = link if link != next_state else 0
+                # A state also reports every phrase that ends at its suffix state
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+        self._output = [tuple(matches) for matches in self._output]
+
+    def find(self, words):
+        """
+        Find all phrase occurrences in a list of words.
+
+        Returns:
+            list: (start index, phrase length, payload) tuples, ordered by end position
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        matches = []
+        state = 0
+        for i, word in enumerate(words):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if output[state]:
+                for length, payload in output[state]:
+                    matches.append((i - length + 1, length, payload))
+        return matches
@@ -0,0 +1,300 @@
+import itertools
+import math
+import threading
+from datetime import date, timedelta
+from utils.journal_entry import day_ordinal
+
+# Sentiment categories in histogram order, legacy labels folded in
+CATEGORIES = ('positive', 'neutral', 'negative')
+_CATEGORY_CODES = {
+    'very positive': 0, 'positive': 0,
+    'neutral': 1,
+    'very negative': 2, 'negative': 2,
+}
+
+def category_code(category):
+    """Return the CATEGORIES index of a sentiment category; unknown ones count as neutral."""
+    return _CATEGORY_CODES.get(category.lower() if isinstance(category, str) else category, 1)
+
+# Scores are summed as integer millionths, so sums are exact and the same
+# whatever order entries were added or buckets were merged in
+SCALE = 1_000_000
+
+def _fixed(value):
+    """Return value in integer millionths, or None if it isn't a finite number."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return round(value * SCALE)
+
+def _next_month(day):
+    """Return the 1st of the month after day's."""
+    return date(day.year + 1, 1, 1) if day.month == 12 else date(day.year, day.month + 1, 1)
+
+class RollupBucket:
+    """
+    Running totals for a group of journal entries.
+
+    Holds counts and exact sums rather than averages, so buckets can be
+    updated one entry at a time and merged into bigger periods without
+    going back to the entries.
+    """
+
+    __slots__ = ('entries', 'words', 'compound', 'categories', 'emotional',
+                 'emotion_totals', 'emotion_counts')
+
+    def __init__(self):
+        self.entries = 0
+        self.words = 0
+        self.compound = 0
+        self.categories = [0] * len(CATEGORIES)
+        self.emotional = 0
+        self.emotion_totals = {}
+        self.emotion_counts = {}
+
+    def add(self, words, compound, category, emotions):
+        """Count one entry; emotions maps emotion -> score in millionths."""
+        self.entries += 1
+        self.words += words
+        self.compound += compound
+        self.categories[category] += 1
+        if emotions:
+            self.emotional += 1
+            for emotion, score in emotions.items():
+                self.emotion_totals[emotion] = self.emotion_totals.get(emotion, 0) + score
+                self.emotion_counts[emotion] = self.emotion_counts.get(emotion, 0) + 1
+
+    def merge(self, other):
+        """Add another bucket's totals into this one."""
+        self.entries += other.entries
+        self.words += other.words
+        self.compound += other.compound
+        for i, count in enumerate(other.categories):
+            self.categories[i] += count
+        self.emotional += other.emotional
+        for emotion, total in other.emotion_totals.items():
+            self.emotion_totals[emotion] = self.emotion_totals.get(emotion, 0) + total
+            self.emotion_counts[emotion] = self.emotion_counts.get(emotion, 0) + other.emotion_counts[emotion]
+
+    def category_counts(self):
+        """Return a dict of category -> number of entries."""
+        return dict(zip(CATEGORIES, self.categories))
+
+    def average_compound(self):
+        """Return the mean compound score, or 0.0 for an empty bucket."""
+        return self.compound / SCALE / self.entries if self.entries else 0.0
+
+    def average_emotions(self, over='present'):
+        """
+        Average each emotion's score.
+
+        Args:
+            over (str): 'present' averages over entries that score that emotion,
+                'emotional' over entries with any emotion, 'all' over every entry
+
+        Returns:
+            dict: Emotion -> average, for emotions scored at least once
+        """
+        averages = {}
+        for emotion, total in self.emotion_totals.items():
+            if over == 'present':
+                count = self.emotion_counts[emotion]
+            elif over == 'emotional':
+                count = self.emotional
+            else:
+                count = self.entries
+            averages[emotion] = total / SCALE / count
+        return averages
+
+    def dominant_emotion(self, over='present'):
+        """Return the emotion with the highest average, or None without emotion data."""
+        averages = self.average_emotions(over)
+        if not averages:
+            return None
+        return max(averages.items(), key=lambda x: x[1])[0]
+
+    def __eq__(self, other):
+        if not isinstance(other, RollupBucket):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+# Source of every Rollups.version in the process; never restarts
+_versions = itertools.count(1)
+
+class Rollups:
+    """
+    Journal totals in a pyramid of day, ISO week, month and year buckets.
+
+    Each saved or imported entry is added to the bucket of its day, ISO week,
+    month and year, so summaries of a period merge a handful of buckets
+    rather than touching entries: whole years and months come from their
+    own buckets, and each ragged end from at most four week buckets and six
+    day buckets. A range of any length merges a few dozen buckets at most.
+    Sums are exact integers, so the buckets built incrementally equal the
+    ones rebuilt from scratch, and any period gives the same numbers however
+    it is decomposed. Entries without a valid date are counted in `undated`
+    only.
+
+    `version` changes with every change, so results computed from the
+    rollups can be cached on it and dropped as soon as the journal changes.
+    Versions are drawn from one counter for the whole process, so rollups
+    rebuilt for the same journal never reuse a version an earlier instance
+    handed out.
+    """
+
+    def __init__(self):
+        self.days = {}
+        self.weeks = {}
+        self.months = {}
+        self.years = {}
+        self.undated = RollupBucket()
+        self.version = next(_versions)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build rollups from entries in one pass."""
+        rollups = cls()
+        rollups.extend(entries)
+        return rollups
+
+    def add(self, entry):
+        """Add one entry dict or JournalEntry record."""
+        self.extend([entry])
+
+    def extend(self, entries):
+        """Add a batch of entries."""
+        with self._lock:
+            self.version = next(_versions)
+            for entry in entries:
+                self._add(entry)
+
+    def reset(self, entries=()):
+        """Drop every bucket, then add entries."""
+        with self._lock:
+            self.days = {}
+            self.weeks = {}
+            self.months = {}
+            self.years = {}
+            self.undated = RollupBucket()
+            self.version = next(_versions)
+            for entry in entries:
+                self._add(entry)
+
+    def touch(self):
+        """Bump the version without changing any bucket."""
+        with self._lock:
+            self.version = next(_versions)
+
+    def total(self):
+        """Return one bucket covering every entry, dated or not."""
+        with self._lock:
+            total = RollupBucket()
+            for bucket in self.years.values():
+                total.merge(bucket)
+            total.merge(self.undated)
+        return total
+
+    def between(self, start_date, end_date):
+        """
+        Return one bucket covering entries dated within [start_date, end_date].
+
+        Args:
+            start_date (date): First day
+            end_date (date): Last day
+        """
+        period = RollupBucket()
+        with self._lock:
+            for bucket in self._cover(start_date, end_date):
+                if bucket is not None:
+                    period.merge(bucket)
+        return period
+
+    def daily(self, start_date, end_date):
+        """
+        Return the day buckets within [start_date, end_date].
+
+        Returns:
+            list: (day ordinal, RollupBucket) pairs for days with entries, in date order
+        """
+        first, last = start_date.toordinal(), end_date.toordinal()
+        with self._lock:
+            if last - first + 1 <= len(self.days):
+                days = [(day, self.days[day]) for day in range(first, last + 1) if day in self.days]
+            else:
+                days = sorted((day, bucket) for day, bucket in self.days.items() if first <= day <= last)
+        return days
+
+    def __eq__(self, other):
+        if not isinstance(other, Rollups):
+            return NotImplemented
+        return (self.days == other.days and self.weeks == other.weeks and self.months == other.months
+                and self.years == other.years and self.undated == other.undated)
+
+    def _cover(self, start_date, end_date):
+        """Yield the buckets (None where empty) that exactly cover [start_date, end_date]."""
+        if start_date > end_date:
+            return
+        # Whole months run from the first 1st on or after start_date to the
+        # last month end on or before end_date
+        first_month = start_date if start_date.day == 1 else _next_month(start_date)
+        after_months = _next_month(end_date)
+        if (end_date + timedelta(days=1)).day != 1:
+            after_months = end_date.replace(day=1)
+        if first_month >= after_months:
+            yield from self._cover_days(start_date, end_date)
+            return
+
+        yield from self._cover_days(start_date, first_month - timedelta(days=1))
+        month = first_month
+        while month < after_months:
+            # A whole year inside the period comes from its year bucket
+            if month.month == 1 and date(month.year + 1, 1, 1) <= after_months:
+                yield self.years.get(month.year)
+                month = date(month.year + 1, 1, 1)
+            else:
+                yield self.months.get((month.year, month.month))
+                month = _next_month(month)
+        yield from self._cover_days(after_months, end_date)
+
+    def _cover_days(self, start_date, end_date):
+        """Yield week and day buckets covering a run of days."""
+        day, last = start_date.toordinal(), end_date.toordinal()
+        while day <= last:
+            current = date.fromordinal(day)
+            # A whole ISO week inside the run comes from its week bucket
+            if current.isoweekday() == 1 and day + 6 <= last:
+                yield self.weeks.get(current.isocalendar()[:2])
+                day += 7
+            else:
+                yield self.days.get(day)
+                day += 1
+
+    def _add(self, entry):
+        """Add one entry to its day and week buckets."""
+        sentiment = entry.get('sentiment')
+        if not isinstance(sentiment, dict):
+            sentiment = {}
+        emotions = sentiment.get('emotions')
+        scores = {}
+        if isinstance(emotions, dict):
+            for emotion, score in emotions.items():
+                score = _fixed(score)
+                if isinstance(emotion, str) and score is not None:
+                    scores[emotion] = score
+
+        category = category_code(sentiment.get('category'))
+        content = entry.get('content')
+        words = len(content.split()) if isinstance(content, str) else 0
+        compound = _fixed(sentiment.get('compound')) or 0
+
+        day = day_ordinal(entry.get('date'))
+        if day is None:
+            self.undated.add(words, compound, category, scores)
+            return
+        current = date.fromordinal(day)
+        for buckets, key in ((self.days, day), (self.weeks, current.isocalendar()[:2]),
+                             (self.months, (current.year, current.month)), (self.years, current.year)):
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = RollupBucket()
+            bucket.add(words, compound, category, scores)
@@ -1,44 +1,420 @@
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from nltk.sentiment.vader import SentiText, SentimentIntensityAnalyzer, VaderConstants
+import functools
+import math
+import os
+import pickle
 import re
-import streamlit as st
-
-# Download necessary NLTK data
-@st.cache_resource
-def download_nltk_data():
-    # Only download the vader_lexicon which we need for sentiment analysis
-    nltk.download('vader_lexicon')
-    
-    # Return common English stopwords as a list - simpler than using NLTK's stopwords
-    return [
-        'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 
-        'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 
-        'himself', 'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 
-        'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which', 
-        'who', 'whom', 'this', 'that', 'these', 'those', 'am', 'is', 'are', 
-        'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 
-        'do', 'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 
-        'or', 'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 
-        'with', 'about', 'against', 'between', 'into', 'through', 'during', 
-        'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down', 'in', 
-        'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 
-        'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 
-        'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 
-        'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 
-        's', 't', 'can', 'will', 'just', 'don', 'should', 'now'
+import threading
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from utils.phrase_matcher import PhraseMatcher
+
+# Pre-parsed VADER lexicon shipped with the app (see scripts/build_vader_lexicon.py)
+VADER_LEXICON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'vader_lexicon.pickle'
+)
+
+# Common English stopwords as a list - simpler than using NLTK's stopwords
+STOPWORDS = [
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 
+    'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 
+    'himself', 'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 
+    'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which', 
+    'who', 'whom', 'this', 'that', 'these', 'those', 'am', 'is', 'are', 
+    'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 
+    'do', 'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 
+    'or', 'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 
+    'with', 'about', 'against', 'between', 'into', 'through', 'during', 
+    'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down', 'in', 
+    'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 
+    'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 
+    'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 
+    'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 
+    's', 't', 'can', 'will', 'just', 'don', 'should', 'now'
+]
+
+# Bump whenever analysis results change so cached results are invalidated
+ANALYZER_VERSION = "7"
+
+# Expanded emotion keywords with synonyms, phrases, and contextual patterns
+EMOTION_KEYWORDS = {
+    "joy": [
+        "happy", "glad", "joy", "delight", "content", "pleased", "elated", "thrilled", "excited",
+        "wonderful", "amazing", "fantastic", "great", "blessed", "grateful", "thankful", "peaceful",
+        "love", "loving", "enjoyed", "enjoy", "smile", "laughed", "laugh", "celebrating",
+        "ecstatic", "overjoyed", "jubilant", "blissful", "cheerful", "radiant", "beaming",
+        "accomplished", "satisfied", "fulfilled", "triumphant", "victorious", "playful", "giddy",
+        "over the moon", "on cloud nine", "at peace"
+    ],
+    "sadness": [
+        "sad", "unhappy", "miserable", "heartbroken", "gloomy", "depressed", "melancholy", "grief",
+        "lonely", "alone", "lost", "empty", "hurt", "pain", "suffering", "disappointed", "miss",
+        "missing", "regret", "hopeless", "despair", "crying", "cried", "tears", "devastated",
+        "heartache", "sorrow", "mourning", "grieving", "broken", "crushed", "desolate", "down",
+        "blue", "heavy-hearted", "weeping", "sobbing", "melancholic", "forlorn",
+        "let down", "heavy heart"
+    ],
+    "anger": [
+        "angry", "mad", "furious", "irritated", "annoyed", "enraged", "frustrated", "outraged",
+        "hate", "hatred", "resent", "resentful", "bitter", "disgusted", "fed up", "upset",
+        "hostile", "rage", "fuming", "livid", "offended", "unfair", "wrong", "infuriated",
+        "seething", "irate", "incensed", "indignant", "provoked", "agitated", "exasperated",
+        "disgruntled", "resentment", "contempt", "irritable", "fed up with"
+    ],
+    "fear": [
+        "afraid", "scared", "fearful", "anxious", "worried", "terrified", "panicked", "nervous",
+        "dread", "uneasy", "stress", "stressed", "overwhelmed", "insecure", "doubt", "uncertain",
+        "hesitant", "apprehensive", "concern", "concerned", "panic", "terror", "frightened",
+        "paranoid", "petrified", "horrified", "alarmed", "threatened", "intimidated",
+        "unsettled", "disturbed", "trembling", "shaking", "tense",
+        "scared to death", "freaking out"
+    ],
+    "hope": [
+        "hope", "hopeful", "optimistic", "looking forward", "anticipate", "expect", "faith", "trust",
+        "believe", "believing", "confident", "determined", "motivated", "inspired", "eager",
+        "excited", "positive", "better", "improve", "improving", "progress", "growing",
+        "aspiring", "promising", "encouraging", "reassuring", "uplifting", "brighter", "possibility",
+        "looking forward to", "can't wait"
+    ],
+    "surprise": [
+        "surprised", "shocked", "amazed", "astonished", "stunned", "startled", "unexpected",
+        "wonder", "awe", "speechless", "mindblown", "flabbergasted", "dumbfounded",
+        "incredible", "unbelievable", "wow", "remarkable", "extraordinary", "sudden", "revelation",
+        "out of nowhere", "can't believe"
+    ],
+    "gratitude": [
+        "grateful", "thankful", "appreciative", "blessed", "appreciate", "indebted",
+        "touched", "moved", "humbled", "honored", "fortunate", "lucky", "privileged",
+        "recognition", "appreciation", "valued", "acknowledged", "thank you"
+    ],
+    "pride": [
+        "proud", "accomplished", "confident", "successful", "achieved", "triumph",
+        "victory", "mastered", "earned", "deserved", "honored", "respected",
+        "achievement", "excellence", "satisfaction", "impressive", "proud of myself"
+    ],
+    "love": [
+        "love", "adore", "cherish", "treasure", "devoted", "affection", "fond",
+        "warmth", "tenderness", "attachment", "caring", "romantic", "passionate",
+        "intimate", "connected", "bonded", "close", "dear", "beloved",
+        "in love", "care about"
+    ],
+    "anxiety": [
+        "anxious", "worried", "nervous", "tense", "restless", "uneasy", "jittery",
+        "edgy", "agitated", "frazzled", "stressed", "pressured", "overwhelmed",
+        "apprehensive", "troubled", "distressed", "fretful", "bothered",
+        "on edge", "can't sleep", "stressed out"
     ]
+}
+
+# Context modifiers for emotion intensity
+CONTEXT_MODIFIERS = {
+    "very": 1.3,
+    "extremely": 1.5,
+    "somewhat": 0.8,
+    "slightly": 0.6,
+    "really": 1.2,
+    "deeply": 1.3
+}
+
+NEGATIONS = frozenset(["not", "don't", "doesn't", "didn't", "no", "never"])
+
+# Phrases carry a higher weight than single keywords
+PHRASE_WEIGHT = 1.2
+
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+_NON_ALPHA_RE = re.compile(r'[\W\d_]+')
+_LAST_SPACE_RE = re.compile(r'\s\S*\Z')
+
+# VADER reads up to this many tokens before and after a word (negations,
+# boosters, idioms), so a sentence's valences depend on its neighbours' edges
+VADER_CONTEXT_BEFORE = 3
+VADER_CONTEXT_AFTER = 2
+# Whitespace after sentence punctuation; splitting there never cuts a VADER token
+_SEGMENT_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Longest run without sentence punctuation that analyze_stream() buffers
+MAX_STREAM_SENTENCE_CHARS = 20000
+
+# Most frequent words of an entry kept in results for corpus-aware theme ranking
+MAX_THEME_TERMS = 200
+
+def tokenize(text):
+    """
+    Tokenize text once into sentences of normalized words.
+    
+    Text is lowercased, split into sentences on runs of '.', '!' and '?', and each
+    sentence is split on whitespace with non-alphabetic characters stripped from
+    every word. Words that strip down to '' are kept so neighbouring words keep
+    their positions.
+    
+    Returns:
+        list: One list of words per non-empty sentence
+    """
+    sub = _NON_ALPHA_RE.sub
+    sentences = []
+    for sentence in _SENTENCE_END_RE.split(text.lower()):
+        words = sentence.split()
+        if words:
+            # Most words are already alphabetic, so only the rest go through the regex
+            sentences.append([word if word.isalpha() else sub('', word) for word in words])
+    return sentences
+
+def iter_text_chunks(text, size=65536):
+    """Yield text in pieces of at most size characters, for analyze_stream()."""
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+def split_sentences(text):
+    """Split text into stripped, non-empty sentences, keeping their original case."""
+    return [s.strip() for s in _SENTENCE_END_RE.split(text) if s.strip()]
+
+def compile_emotion_matcher(emotion_keywords):
+    """
+    Compile emotion keyword lists into a single phrase matcher.
+
+    Keywords are normalized with tokenize(), so they match the token stream
+    exactly; a keyword of several words becomes a multi-word phrase.
+
+    Args:
+        emotion_keywords (dict): Emotion name mapped to its list of keywords
+
+    Returns:
+        PhraseMatcher: Reports a tuple of (emotion, weight) pairs for each match
+    """
+    phrases = {}
+    for emotion, keywords in emotion_keywords.items():
+        for keyword in keywords:
+            words = tuple(word for sentence in tokenize(keyword) for word in sentence if word)
+            if not words:
+                continue
+            weight = PHRASE_WEIGHT if len(words) > 1 else 1.0
+            matches = phrases.setdefault(words, [])
+            # A keyword listed twice under one emotion still only counts once
+            if (emotion, weight) not in matches:
+                matches.append((emotion, weight))
+    
+    return PhraseMatcher({words: tuple(matches) for words, matches in phrases.items()})
+
+# Compile the lexicon once at import
+EMOTION_MATCHER = compile_emotion_matcher(EMOTION_KEYWORDS)
+
+def _top_emotions(emotion_scores):
+    """Normalize raw emotion scores into percentages for the top three emotions."""
+    if sum(emotion_scores.values()) > 0:
+        # Sort emotions by score
+        sorted_emotions = sorted(emotion_scores.items(), key=lambda x: x[1], reverse=True)
+        
+        # Select top emotions with positive scores
+        emotions = {}
+        for emotion, score in sorted_emotions[:3]:  # Top 3 emotions
+            if score > 0:
+                emotions[emotion] = score
+        
+        # Normalize to percentages
+        if emotions:
+            total = sum(emotions.values())
+            emotions = {k: (v/total) * 100 for k, v in emotions.items()}
+    else:
+        emotions = {}
+    
+    return emotions
+
+def _top_themes(word_freq, top_n):
+    """Return the top_n most frequent words, ties kept in first-seen order."""
+    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+    return [word for word, freq in sorted_words[:top_n]]
+
+def _theme_candidates(word_freq):
+    """Keep the MAX_THEME_TERMS most frequent words as candidates for corpus-aware ranking."""
+    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+    return dict(sorted_words[:MAX_THEME_TERMS])
+
+# Raw per-sentence results that can be summed into entry-level scores
+SentenceScores = namedtuple('SentenceScores', ['emotions', 'terms'])
+
+# VADER tokens of one piece of text, with its ALL CAPS count and first "but" (-1 if none)
+VaderSegment = namedtuple('VaderSegment', ['tokens', 'caps', 'but'])
+
+@functools.lru_cache(maxsize=None)
+def load_vader_lexicon():
+    """
+    Load the VADER lexicon once per process.
+    
+    Uses the bundled pickle, falling back to parsing NLTK's local lexicon file
+    when the bundled copy is missing. Neither path touches the network.
+    """
+    try:
+        with open(VADER_LEXICON_PATH, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return SentimentIntensityAnalyzer().lexicon
+
+# VADER's constants are read-only, so every analyzer can share one copy
+_VADER_CONSTANTS = VaderConstants()
+
+class _BundledVader(SentimentIntensityAnalyzer):
+    """VADER analyzer built from the shared, pre-parsed lexicon."""
+    
+    def __init__(self):
+        self.lexicon = load_vader_lexicon()
+        self.constants = _VADER_CONSTANTS
+
+class _SentenceTotals:
+    """Running sums of SentenceScores across the sentences of one entry."""
+    
+    def __init__(self):
+        self.emotions = {emotion: 0.0 for emotion in EMOTION_KEYWORDS}
+        self.word_freq = Counter()
+    
+    def add(self, part):
+        """Fold one sentence's scores into the totals."""
+        # Added match by match, in the order detect_emotions() adds them, so the float sums agree
+        emotions = self.emotions
+        for emotion, score in part.emotions:
+            emotions[emotion] += score
+        # Counted in text order, so ties keep their first-seen order
+        self.word_freq.update(part.terms)
+
+class _ValenceSums:
+    """Running sums that VADER's score_valence() takes over a text's token valences."""
+    
+    __slots__ = ('count', 'total', 'pos', 'neg', 'neu')
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.pos = 0.0
+        self.neg = 0.0
+        self.neu = 0
+    
+    def add(self, sentiment):
+        """Add one valence, with the same float operations as sum() and _sift_sentiment_scores()."""
+        self.count += 1
+        self.total += sentiment
+        if sentiment > 0:
+            self.pos += float(sentiment) + 1
+        elif sentiment < 0:
+            self.neg += float(sentiment) - 1
+        else:
+            self.neu += 1
 
-# Make sure we download the data
-STOPWORDS = download_nltk_data()
+class _PolarityVariant:
+    """Valences and sums of a streamed text under one value of VADER's ALL CAPS flag."""
+    
+    __slots__ = ('is_cap_diff', 'first', 'plain', 'scaled')
+    
+    def __init__(self, is_cap_diff):
+        self.is_cap_diff = is_cap_diff
+        # Valence of each distinct token at its first occurrence
+        self.first = {}
+        # Sums without the "but" rule, and with it as if the first "but" were still to come
+        self.plain = _ValenceSums()
+        self.scaled = _ValenceSums()
+
+class _StreamPolarity:
+    """
+    VADER polarity of a text fed in as consecutive runs of tokens.
+    
+    A token is scored once the VADER_CONTEXT_AFTER tokens after it have
+    arrived, with the VADER_CONTEXT_BEFORE tokens before it kept as context,
+    and its valence goes straight into running sums. What polarity_scores()
+    decides over the whole text is carried along instead: repeated tokens
+    take their first valence, sums are kept both with and without the "but"
+    rule until the first "but" arrives, and while every token so far is ALL
+    CAPS, for both values of the ALL CAPS flag. Memory grows with the text's
+    vocabulary, not its length.
+    """
+    
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        # Up to VADER_CONTEXT_BEFORE scored tokens, then the tokens waiting for their lookahead
+        self.words = []
+        self.scored = 0
+        self.count = 0
+        self.caps = 0
+        self.but = False
+        # Until a token is ALL CAPS the flag changes no valence, so one variant serves both
+        self.variants = [_PolarityVariant(False)]
+    
+    def feed(self, tokens):
+        """Add the next tokens of the text and score those whose lookahead is complete."""
+        for token in tokens:
+            upper = token.isupper()
+            if upper and not self.caps:
+                if self.count:
+                    # Some tokens are ALL CAPS and some aren't, whatever follows
+                    self.variants[0].is_cap_diff = True
+                else:
+                    # Leading ALL CAPS: the flag is False only if every token is
+                    self.variants = [_PolarityVariant(False), _PolarityVariant(True)]
+            elif not upper and len(self.variants) == 2:
+                self.variants = [self.variants[1]]
+            self.count += 1
+            self.caps += upper
+            self.words.append(token)
+        self._score(len(self.words) - VADER_CONTEXT_AFTER)
+        
+        # Only keep the scored tokens later tokens can still look back at
+        drop = max(self.scored - VADER_CONTEXT_BEFORE, 0)
+        if drop:
+            del self.words[:drop]
+            self.scored -= drop
+    
+    def finish(self):
+        """
+        Score the last tokens and return the text's sums.
+        
+        Returns:
+            _ValenceSums: Sums over every token, with the "but" rule applied
+        """
+        self._score(len(self.words))
+        # With two variants left every token was ALL CAPS, and the flag is False
+        variant = self.variants[0]
+        return variant.scaled if self.but else variant.plain
+    
+    def _score(self, stop):
+        """Score the buffered tokens up to stop."""
+        words = self.words
+        token_valences = self.analyzer.token_valences
+        for i in range(self.scored, stop):
+            token = words[i]
+            is_but = not self.but and token.lower() == "but"
+            for variant in self.variants:
+                valence = variant.first.get(token)
+                if valence is None:
+                    valence = variant.first[token] = token_valences(words, i, i + 1, variant.is_cap_diff)[0]
+                if self.but:
+                    variant.scaled.add(valence * 1.5)
+                elif is_but:
+                    variant.scaled.add(valence)
+                else:
+                    variant.plain.add(valence)
+                    variant.scaled.add(valence * 0.5)
+            if is_but:
+                self.but = True
+        self.scored = max(self.scored, stop)
+
+class _VaderWindow:
+    """Stands in for VADER's SentiText: a run of tokens and the whole text's ALL CAPS flag."""
+    
+    __slots__ = ('words_and_emoticons', 'is_cap_diff')
+    
+    def __init__(self, words, is_cap_diff):
+        self.words_and_emoticons = words
+        self.is_cap_diff = is_cap_diff
 
 class SentimentAnalyzer:
     def __init__(self):
-        self.sid = SentimentIntensityAnalyzer()
+        self.sid = _BundledVader()
         self.stop_words = set(STOPWORDS)
         
-    def analyze_sentiment(self, text):
+    def analyze_sentiment(self, text, tokens=None):
         """
         Analyze the sentiment of the given text and return scores and category.
+        
+        Args:
+            text (str): The text to analyze
+            tokens (list): Output of tokenize(text), if already computed
         """
         if not text:
             return {
@@ -72,7 +448,7 @@ class SentimentAnalyzer:
             category = "neutral"
             
         # Detect specific emotions with enhanced context
-        emotions = self.detect_emotions(text)
+        emotions = self.detect_emotions(text, tokens=tokens)
         
         results = {
             "compound": scores['compound'],
@@ -85,181 +461,403 @@ class SentimentAnalyzer:
         
         return results
     
-    def detect_emotions(self, text):
+    def detect_emotions(self, text, tokens=None):
         """
         Detect specific emotions in the text using an enhanced keyword and pattern approach.
-        """
-        # Expanded emotion keywords with synonyms, phrases, and contextual patterns
-        emotion_keywords = {
-            "joy": [
-                "happy", "glad", "joy", "delight", "content", "pleased", "elated", "thrilled", "excited",
-                "wonderful", "amazing", "fantastic", "great", "blessed", "grateful", "thankful", "peaceful",
-                "love", "loving", "enjoyed", "enjoy", "smile", "laughed", "laugh", "celebrating",
-                "ecstatic", "overjoyed", "jubilant", "blissful", "cheerful", "radiant", "beaming",
-                "accomplished", "satisfied", "fulfilled", "triumphant", "victorious", "playful", "giddy"
-            ],
-            "sadness": [
-                "sad", "unhappy", "miserable", "heartbroken", "gloomy", "depressed", "melancholy", "grief",
-                "lonely", "alone", "lost", "empty", "hurt", "pain", "suffering", "disappointed", "miss",
-                "missing", "regret", "hopeless", "despair", "crying", "cried", "tears", "devastated",
-                "heartache", "sorrow", "mourning", "grieving", "broken", "crushed", "desolate", "down",
-                "blue", "heavy-hearted", "weeping", "sobbing", "melancholic", "forlorn"
-            ],
-            "anger": [
-                "angry", "mad", "furious", "irritated", "annoyed", "enraged", "frustrated", "outraged",
-                "hate", "hatred", "resent", "resentful", "bitter", "disgusted", "fed up", "upset",
-                "hostile", "rage", "fuming", "livid", "offended", "unfair", "wrong", "infuriated",
-                "seething", "irate", "incensed", "indignant", "provoked", "agitated", "exasperated",
-                "disgruntled", "resentment", "contempt", "irritable"
-            ],
-            "fear": [
-                "afraid", "scared", "fearful", "anxious", "worried", "terrified", "panicked", "nervous",
-                "dread", "uneasy", "stress", "stressed", "overwhelmed", "insecure", "doubt", "uncertain",
-                "hesitant", "apprehensive", "concern", "concerned", "panic", "terror", "frightened",
-                "paranoid", "petrified", "horrified", "alarmed", "threatened", "intimidated",
-                "unsettled", "disturbed", "trembling", "shaking", "tense"
-            ],
-            "hope": [
-                "hope", "hopeful", "optimistic", "looking forward", "anticipate", "expect", "faith", "trust",
-                "believe", "believing", "confident", "determined", "motivated", "inspired", "eager",
-                "excited", "positive", "better", "improve", "improving", "progress", "growing",
-                "aspiring", "promising", "encouraging", "reassuring", "uplifting", "brighter", "possibility"
-            ],
-            "surprise": [
-                "surprised", "shocked", "amazed", "astonished", "stunned", "startled", "unexpected",
-                "wonder", "awe", "speechless", "mindblown", "flabbergasted", "dumbfounded",
-                "incredible", "unbelievable", "wow", "remarkable", "extraordinary", "sudden", "revelation"
-            ],
-            "gratitude": [
-                "grateful", "thankful", "appreciative", "blessed", "appreciate", "indebted",
-                "touched", "moved", "humbled", "honored", "fortunate", "lucky", "privileged",
-                "recognition", "appreciation", "valued", "acknowledged"
-            ],
-            "pride": [
-                "proud", "accomplished", "confident", "successful", "achieved", "triumph",
-                "victory", "mastered", "earned", "deserved", "honored", "respected",
-                "achievement", "excellence", "satisfaction", "impressive"
-            ],
-            "love": [
-                "love", "adore", "cherish", "treasure", "devoted", "affection", "fond",
-                "warmth", "tenderness", "attachment", "caring", "romantic", "passionate",
-                "intimate", "connected", "bonded", "close", "dear", "beloved"
-            ],
-            "anxiety": [
-                "anxious", "worried", "nervous", "tense", "restless", "uneasy", "jittery",
-                "edgy", "agitated", "frazzled", "stressed", "pressured", "overwhelmed",
-                "apprehensive", "troubled", "distressed", "fretful", "bothered"
-            ]
-        }
         
-        # Normalize text and split into sentences
-        text = text.lower()
-        sentences = [s.strip() for s in re.split('[.!?]+', text) if s.strip()]
+        Args:
+            text (str): The text to analyze
+            tokens (list): Output of tokenize(text), if already computed
+        """
+        if tokens is None:
+            tokens = tokenize(text)
         
         # Initialize emotion tracking
-        emotion_scores = {emotion: 0.0 for emotion in emotion_keywords}
-        
-        # Context modifiers for emotion intensity
-        context_modifiers = {
-            "very": 1.3,
-            "extremely": 1.5,
-            "somewhat": 0.8,
-            "slightly": 0.6,
-            "really": 1.2,
-            "deeply": 1.3
-        }
+        emotion_scores = {emotion: 0.0 for emotion in EMOTION_KEYWORDS}
         
         # Process each sentence for emotions
-        for sentence in sentences:
-            words = sentence.split()
+        for words in tokens:
+            self._score_sentence_emotions(words, emotion_scores)
+        
+        return _top_emotions(emotion_scores)
+    
+    def _score_sentence_emotions(self, words, emotion_scores):
+        """Add the raw emotion scores of one tokenized sentence to emotion_scores."""
+        for emotion, score in self._sentence_emotion_matches(words):
+            emotion_scores[emotion] += score
+    
+    def _sentence_emotion_matches(self, words):
+        """
+        Yield (emotion, score) for each keyword match in one tokenized sentence, in scoring order.
+        
+        Single keywords count unless they are stopwords. Among phrases starting at
+        the same word only the longest counts, so "looking forward to" does not
+        also score "looking forward".
+        """
+        # Check for negations
+        negation_active = any(word in NEGATIONS for word in words)
+        
+        longest_phrases = {}
+        for start, length, matches in EMOTION_MATCHER.find(words):
+            if length == 1:
+                if words[start] not in self.stop_words:
+                    yield from self._emotion_match_scores(words, start, matches, negation_active)
+            elif length > longest_phrases.get(start, (0, ()))[0]:
+                longest_phrases[start] = (length, matches)
+        
+        for start, (length, matches) in longest_phrases.items():
+            yield from self._emotion_match_scores(words, start, matches, negation_active)
+    
+    def _emotion_match_scores(self, words, start, matches, negation_active):
+        """Yield (emotion, score) for one keyword or phrase match starting at words[start]."""
+        # Apply intensity modifier
+        intensity = CONTEXT_MODIFIERS.get(words[start-1], 1.0) if start > 0 else 1.0
+        
+        # If negation is active, flip the emotion valence
+        if negation_active:
+            intensity *= -0.5  # Reduced negative impact
+        
+        for emotion, weight in matches:
+            yield emotion, intensity * weight
+    
+    def extract_themes(self, text, top_n=3, tokens=None, theme_index=None):
+        """
+        Extract main themes from the text.
+        
+        Args:
+            text (str): The text to analyze
+            top_n (int): Number of themes to return
+            tokens (list): Output of tokenize(text), if already computed
+            theme_index (ThemeIndex): Journal to rank against by TF-IDF; raw
+                frequency within the text is used when omitted
+        """
+        word_freq = self.theme_terms(text, tokens=tokens)
+        if theme_index is not None:
+            return theme_index.rank(word_freq, top_n)
+        return _top_themes(word_freq, top_n)
+    
+    def theme_terms(self, text, tokens=None):
+        """
+        Count candidate theme words in the text.
+        
+        Args:
+            text (str): The text to analyze
+            tokens (list): Output of tokenize(text), if already computed
+            
+        Returns:
+            dict: Theme word -> count, in first-seen order
+        """
+        if not text:
+            return {}
+        if tokens is None:
+            tokens = tokenize(text)
+            
+        word_freq = {}
+        for words in tokens:
+            self._count_theme_terms(words, word_freq)
+        return word_freq
+    
+    def _count_theme_terms(self, words, word_freq):
+        """
+        Add frequencies of candidate theme words from one tokenized sentence to word_freq.
+        """
+        for word in self._theme_words(words):
+            word_freq[word] = word_freq.get(word, 0) + 1
+    
+    def _theme_words(self, words):
+        """Return the candidate theme words of one tokenized sentence, in order."""
+        stop_words = self.stop_words
+        # Only consider words longer than 3 characters
+        return [word for word in words if len(word) > 3 and word not in stop_words]
+    
+    def score_sentence(self, sentence):
+        """
+        Score a single sentence's emotions and themes into parts that can be summed across sentences.
+        
+        Args:
+            sentence (str): One sentence, without its terminating punctuation
+            
+        Returns:
+            SentenceScores: Emotion match scores in scoring order and theme words in text order
+        """
+        emotions = []
+        terms = []
+        for words in tokenize(sentence):
+            emotions.extend(self._sentence_emotion_matches(words))
+            terms.extend(self._theme_words(words))
+        
+        return SentenceScores(tuple(emotions), tuple(terms))
+    
+    def combine_sentences(self, parts, scores, top_n=3):
+        """
+        Build entry-level results from per-sentence emotion and theme scores.
+        
+        Args:
+            parts (iterable): SentenceScores of the text's sentences in document order
+            scores (dict): VADER polarity of the whole text, e.g. from polarity_from_valences()
+            top_n (int): Number of themes to return
+            
+        Returns:
+            dict: Same as analyze_entry() on the text
+        """
+        totals = _SentenceTotals()
+        for part in parts:
+            totals.add(part)
+        return self._finish_totals(totals, scores, top_n)
+    
+    def vader_segment(self, text):
+        """
+        Split text into VADER tokens exactly as polarity_scores() does.
+        
+        VADER tokenizes each whitespace-separated word on its own, so a text
+        split at whitespace has the tokens of its pieces, in order.
+        
+        Returns:
+            VaderSegment: The tokens, how many are ALL CAPS, and where "but" first appears
+        """
+        constants = self.sid.constants
+        tokens = tuple(SentiText(text, constants.PUNC_LIST, constants.REGEX_REMOVE_PUNCTUATION).words_and_emoticons)
+        but = next((i for i, token in enumerate(tokens) if token.lower() == "but"), -1)
+        return VaderSegment(tokens, sum(1 for token in tokens if token.isupper()), but)
+    
+    def token_valences(self, words, start, stop, is_cap_diff):
+        """
+        Score words[start:stop] as polarity_scores() scores tokens in those places.
+        
+        VADER looks at most VADER_CONTEXT_BEFORE tokens back and
+        VADER_CONTEXT_AFTER ahead, so words only needs that many of the
+        text's tokens around the run (fewer only at its start or end).
+        
+        Args:
+            words (tuple): Consecutive tokens of the text
+            start (int): First token to score
+            stop (int): Token after the last one to score
+            is_cap_diff (bool): Whether some but not all of the text's tokens are ALL CAPS
+            
+        Returns:
+            list: One valence per token, before the "but" rule
+        """
+        sid = self.sid
+        boosters = sid.constants.BOOSTER_DICT
+        window = _VaderWindow(words, is_cap_diff)
+        valences = []
+        last = len(words) - 1
+        for i in range(start, stop):
+            item = words[i]
+            lower = item.lower()
+            if (i < last and lower == "kind" and words[i + 1].lower() == "of") or lower in boosters:
+                valences.append(0)
+            else:
+                sid.sentiment_valence(0, window, item, i, valences)
+        return valences
+    
+    def polarity_from_valences(self, runs, but, text):
+        """
+        Finish VADER polarity for text from the valences of its tokens.
+        
+        Applies what polarity_scores() does across the whole text: a repeated
+        token takes the valence of its first occurrence, the first "but"
+        halves what comes before it and raises what follows by half, and
+        punctuation emphasis counts every '!' and '?'.
+        
+        Args:
+            runs (iterable): (tokens, valences) for consecutive runs of the
+                text's tokens in order, valences from token_valences()
+            but (int): Position of the text's first "but" token, or -1
+            text (str): The whole text
             
-            # Check for negations
-            negation_active = False
-            for i, word in enumerate(words):
-                clean_word = ''.join(c for c in word if c.isalpha())
-                if clean_word in ["not", "don't", "doesn't", "didn't", "no", "never"]:
-                    negation_active = True
-                    break
+        Returns:
+            dict: Same as polarity_scores(text)
+        """
+        first = {}
+        sentiments = []
+        for tokens, valences in runs:
+            sentiments.extend(map(first.setdefault, tokens, valences))
+        if but >= 0:
+            sentiments = ([sentiment * 0.5 for sentiment in sentiments[:but]] + [sentiments[but]]
+                          + [sentiment * 1.5 for sentiment in sentiments[but + 1:]])
+        return self.sid.score_valence(sentiments, text)
+    
+    def analyze_stream(self, chunks, top_n=3, max_sentence_chars=MAX_STREAM_SENTENCE_CHARS):
+        """
+        Analyze text arriving as an iterable of chunks, with bounded memory.
+        
+        Only the current unfinished sentence and word are buffered. Finished
+        sentences are scored for emotions and themes and folded into running
+        totals, and finished words go through VADER with the context it reads
+        across sentence boundaries (see _StreamPolarity). Results match
+        analyze_entry() on the joined text, except that a run of more than
+        max_sentence_chars without sentence punctuation is cut at whitespace
+        and its emotions and themes scored in pieces, and a single word that
+        long is cut for VADER too.
+        
+        Args:
+            chunks (iterable): Pieces of text, e.g. an open text file or iter_text_chunks(text)
+            top_n (int): Number of themes to return
+            max_sentence_chars (int): Longest unfinished sentence kept in the buffer
             
-            # Process words in the sentence
-            for i, word in enumerate(words):
-                clean_word = ''.join(c for c in word if c.isalpha())
-                if not clean_word or clean_word in self.stop_words:
-                    continue
-                
-                # Apply intensity modifier
-                intensity = 1.0
-                if i > 0:
-                    prev_word = ''.join(c for c in words[i-1] if c.isalpha())
-                    if prev_word in context_modifiers:
-                        intensity = context_modifiers[prev_word]
-                
-                # If negation is active, flip the emotion valence
-                if negation_active:
-                    intensity *= -0.5  # Reduced negative impact
-                
-                # Check for emotion keywords
-                for emotion, keywords in emotion_keywords.items():
-                    if clean_word in keywords:
-                        emotion_scores[emotion] += intensity
-                
-                # Check for two-word phrases
-                if i < len(words) - 1:
-                    next_word = ''.join(c for c in words[i+1] if c.isalpha())
-                    phrase = f"{clean_word} {next_word}"
-                    for emotion, keywords in emotion_keywords.items():
-                        if phrase in keywords:
-                            emotion_scores[emotion] += (intensity * 1.2)  # Higher weight for phrases
-        
-        # Normalize and select top emotions
-        if sum(emotion_scores.values()) > 0:
-            # Sort emotions by score
-            sorted_emotions = sorted(emotion_scores.items(), key=lambda x: x[1], reverse=True)
+        Returns:
+            dict: Same shape as analyze_entry()
+        """
+        totals = _SentenceTotals()
+        polarity = _StreamPolarity(self)
+        exclamations = questions = 0
+        has_text = False
+        pending = ''
+        partial = ''
+        
+        for chunk in chunks:
+            if not chunk:
+                continue
+            has_text = True
+            exclamations += chunk.count("!")
+            questions += chunk.count("?")
             
-            # Select top emotions with positive scores
-            emotions = {}
-            for emotion, score in sorted_emotions[:3]:  # Top 3 emotions
-                if score > 0:
-                    emotions[emotion] = score
+            # VADER tokenizes word by word, so every word followed by whitespace is final
+            words = partial + chunk
+            match = _LAST_SPACE_RE.search(words)
+            cut = match.start() if match else (len(words) if len(words) > max_sentence_chars else 0)
+            polarity.feed(self.vader_segment(words[:cut]).tokens)
+            partial = words[cut:]
             
-            # Normalize to percentages
-            if emotions:
-                total = sum(emotions.values())
-                emotions = {k: (v/total) * 100 for k, v in emotions.items()}
+            # Everything before the last sentence break is made of finished sentences
+            sentences = _SENTENCE_END_RE.split(pending + chunk)
+            pending = sentences.pop()
+            for sentence in sentences:
+                self._add_stream_sentence(totals, sentence)
+            
+            if len(pending) > max_sentence_chars:
+                match = _LAST_SPACE_RE.search(pending)
+                cut = match.start() if match and match.start() > 0 else len(pending)
+                self._add_stream_sentence(totals, pending[:cut])
+                pending = pending[cut:]
+        
+        if not has_text:
+            return self.analyze_entry("", top_n=top_n)
+        self._add_stream_sentence(totals, pending)
+        polarity.feed(self.vader_segment(partial).tokens)
+        scores = self._polarity_from_sums(polarity.finish(), exclamations, questions)
+        return self._finish_totals(totals, scores, top_n)
+    
+    def _add_stream_sentence(self, totals, sentence):
+        """Score a finished sentence from a stream and add it to the running totals."""
+        sentence = sentence.strip()
+        if sentence:
+            totals.add(self.score_sentence(sentence))
+    
+    def _finish_totals(self, totals, scores, top_n):
+        """Turn polarity scores and accumulated sentence totals into analyze_entry()-shaped results."""
+        # Enhanced sentiment categorization with balanced thresholds
+        if scores['compound'] >= 0.3:
+            category = "positive"
+        elif scores['compound'] <= -0.3:
+            category = "negative"
         else:
-            emotions = {}
+            category = "neutral"
+        
+        sentiment = {
+            "compound": scores['compound'],
+            "pos": scores['pos'],
+            "neu": scores['neu'],
+            "neg": scores['neg'],
+            "category": category,
+            "emotions": _top_emotions(totals.emotions)
+        }
+        return {
+            "sentiment": sentiment,
+            "themes": _top_themes(totals.word_freq, top_n),
+            "terms": _theme_candidates(totals.word_freq)
+        }
+        
+    def _polarity_from_sums(self, sums, exclamations, questions):
+        """
+        Turn summed VADER token valences into polarity scores.
+        
+        Mirrors SentimentIntensityAnalyzer.score_valence, working from running
+        sums so that a text can be scored without holding all its valences.
+        
+        Args:
+            sums (_ValenceSums): Sums over the text's token valences
+            exclamations (int): '!' characters in the text
+            questions (int): '?' characters in the text
+        """
+        if not sums.count:
+            return {"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0}
+        valence_sum = float(sums.total)
+        pos_sum = sums.pos
+        neg_sum = sums.neg
+        neu_count = sums.neu
         
-        return emotions
+        # Emphasis from exclamation points (up to 4) and question marks (2 or more)
+        punct_emph_amplifier = min(exclamations, 4) * 0.292
+        if questions > 3:
+            punct_emph_amplifier += 0.96
+        elif questions > 1:
+            punct_emph_amplifier += questions * 0.18
+        
+        if valence_sum > 0:
+            valence_sum += punct_emph_amplifier
+        elif valence_sum < 0:
+            valence_sum -= punct_emph_amplifier
+        compound = self.sid.constants.normalize(valence_sum)
+        
+        if pos_sum > math.fabs(neg_sum):
+            pos_sum += punct_emph_amplifier
+        elif pos_sum < math.fabs(neg_sum):
+            neg_sum -= punct_emph_amplifier
+        
+        total = pos_sum + math.fabs(neg_sum) + neu_count
+        return {
+            "neg": round(math.fabs(neg_sum / total), 3),
+            "neu": round(math.fabs(neu_count / total), 3),
+            "pos": round(math.fabs(pos_sum / total), 3),
+            "compound": round(compound, 4)
+        }
     
-    def extract_themes(self, text, top_n=3):
+    def analyze_entry(self, text, top_n=3):
         """
-        Extract main themes from the text.
+        Analyze sentiment and extract themes for a single entry, tokenizing it once.
+        
+        Returns:
+            dict: {'sentiment': sentiment data, 'themes': list of themes by frequency,
+                   'terms': theme word counts for ThemeIndex.rank()}
         """
-        if not text:
-            return []
+        tokens = tokenize(text) if text else []
+        word_freq = self.theme_terms(text, tokens=tokens)
+        return {
+            "sentiment": self.analyze_sentiment(text, tokens=tokens),
+            "themes": _top_themes(word_freq, top_n),
+            "terms": _theme_candidates(word_freq)
+        }
+    
+    def analyze_many(self, texts, workers=None, chunksize=None):
+        """
+        Analyze a batch of entries, spreading chunks of them across a process pool.
+        
+        Args:
+            texts (iterable): Entry texts to analyze
+            workers (int): Number of worker processes, defaults to the CPU count.
+                With a single worker the batch is analyzed in this process.
+            chunksize (int): Entries per task, defaults to about four chunks per worker
             
-        # Normalize text and simple tokenization
-        text = text.lower()
-        # Simple word tokenization by spaces and removing punctuation
-        words = []
-        for word in text.split():
-            # Remove punctuation
-            word = ''.join(c for c in word if c.isalpha())
-            if word and word not in self.stop_words:
-                words.append(word)
-        
-        # Count word frequencies
-        word_freq = {}
-        for word in words:
-            if len(word) > 3:  # Only consider words longer than 3 characters
-                word_freq[word] = word_freq.get(word, 0) + 1
+        Returns:
+            list: One analyze_entry() result per text, in input order
+        """
+        texts = list(texts)
+        workers = min(workers or os.cpu_count() or 1, len(texts))
+        if workers <= 1:
+            return [self.analyze_entry(text) for text in texts]
         
-        # Sort by frequency
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+        if chunksize is None:
+            chunksize = max(1, math.ceil(len(texts) / (workers * 4)))
+        chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
         
-        # Return top N themes
-        themes = [word for word, freq in sorted_words[:top_n]]
-        return themes
+        results = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            # map() yields chunk results in submission order
+            for chunk_results in pool.map(_analyze_chunk, chunks):
+                results.extend(chunk_results)
+        return results
         
     def generate_reflection_suggestions(self, sentiment_data):
         """
@@ -335,3 +933,127 @@ class SentimentAnalyzer:
         # Return 3-5 suggestions based on emotional complexity
         num_suggestions = min(5, max(3, len(sorted_emotions) + 1))
         return suggestions[:num_suggestions]
+
+class DraftAnalyzer:
+    """
+    Incremental analyzer for the journal draft currently being edited.
+    
+    Splits the draft into sentences at whitespace after sentence punctuation
+    and keeps each sentence's emotion and theme scores, VADER tokens and
+    VADER valences, so re-analyzing after an edit only scores sentences that
+    are new or changed. VADER reads a few tokens across sentence boundaries,
+    so a sentence's valences are keyed on the tokens next to it as well, and
+    the text-wide rules (the first "but", ALL CAPS emphasis, repeated words,
+    punctuation) are applied over the whole draft each time. Results are
+    the same as analyze_entry() and are safe to save with the entry.
+    """
+    
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.stats = {'scored': 0, 'reused': 0, 'valences_scored': 0, 'valences_reused': 0}
+        self._sentences = {}
+        self._valences = {}
+    
+    def analyze(self, text, top_n=3):
+        """
+        Analyze the draft, re-scoring only sentences not seen in the previous draft.
+        
+        Returns:
+            dict: Same shape as SentimentAnalyzer.analyze_entry()
+        """
+        if not text:
+            self._sentences = {}
+            self._valences = {}
+            return self.analyzer.analyze_entry(text, top_n=top_n)
+        
+        analyzer = self.analyzer
+        current = {}
+        sentences = []
+        for sentence in _SEGMENT_BREAK_RE.split(text):
+            scored = current.get(sentence) or self._sentences.get(sentence)
+            if scored is None:
+                # score_sentence() splits on any sentence punctuation itself
+                scored = (analyzer.score_sentence(sentence), analyzer.vader_segment(sentence))
+                self.stats['scored'] += 1
+            else:
+                self.stats['reused'] += 1
+            current[sentence] = scored
+            sentences.append((sentence, scored[1]))
+        
+        # Only keep sentences that are still in the draft
+        self._sentences = current
+        parts = [current[sentence][0] for sentence, _ in sentences]
+        return analyzer.combine_sentences(parts, self._polarity(sentences, text), top_n=top_n)
+    
+    def _polarity(self, sentences, text):
+        """VADER polarity of the draft, scoring only sentences whose tokens or neighbours changed."""
+        sentences = [(sentence, segment) for sentence, segment in sentences if segment.tokens]
+        token_count = sum(len(segment.tokens) for _, segment in sentences)
+        cap_count = sum(segment.caps for _, segment in sentences)
+        is_cap_diff = 0 < token_count - cap_count < token_count
+        
+        # The tokens that follow each sentence, as far as VADER looks ahead
+        following = []
+        after = ()
+        for _, segment in reversed(sentences):
+            following.append(after)
+            after = (segment.tokens[:VADER_CONTEXT_AFTER] + after)[:VADER_CONTEXT_AFTER]
+        following.reverse()
+        
+        current = {}
+        runs = []
+        before = ()
+        but = -1
+        position = 0
+        for (sentence, segment), after in zip(sentences, following):
+            key = (sentence, before, after, is_cap_diff)
+            valences = current.get(key) or self._valences.get(key)
+            if valences is None:
+                valences = self.analyzer.token_valences(
+                    before + segment.tokens + after, len(before), len(before) + len(segment.tokens), is_cap_diff
+                )
+                self.stats['valences_scored'] += 1
+            else:
+                self.stats['valences_reused'] += 1
+            current[key] = valences
+            runs.append((segment.tokens, valences))
+            if but < 0 and segment.but >= 0:
+                but = position + segment.but
+            position += len(segment.tokens)
+            before = (before + segment.tokens[-VADER_CONTEXT_BEFORE:])[-VADER_CONTEXT_BEFORE:]
+        
+        # Only keep valences of sentences still in the draft, in their current surroundings
+        self._valences = current
+        return self.analyzer.polarity_from_valences(runs, but, text)
+
+# Analyzer shared by every session and thread in this process
+_shared_analyzer = None
+_shared_analyzer_lock = threading.Lock()
+
+def get_shared_analyzer():
+    """
+    Return the process-wide SentimentAnalyzer, building and warming it up on first use.
+    
+    The analyzer holds no per-call state, so it is safe to share across threads.
+    """
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        with _shared_analyzer_lock:
+            if _shared_analyzer is None:
+                analyzer = SentimentAnalyzer()
+                # Touch the scoring paths once so the first real entry doesn't pay for it
+                analyzer.analyze_entry("Warming up.")
+                _shared_analyzer = analyzer
+    return _shared_analyzer
+
+# Analyzer owned by a pool worker process, built once by _init_worker
+_worker_analyzer = None
+
+def _init_worker():
+    """Build the worker's analyzer (and its VADER lexicon) once per process."""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer()
+
+def _analyze_chunk(texts):
+    """Analyze a chunk of entries inside a pool worker."""
+    return [_worker_analyzer.analyze_entry(text) for text in texts]
@@ -0,0 +1,291 @@
+"""
+Versioned binary snapshot of the data covered by the JSON export.
+
+Layout (all integers little-endian):
+
+    magic     b'TJSNAP' + u16 format version
+    block     u64 length + UTF-8 JSON header: settings, entry count, emotion order
+    block     u64 length + zlib-compressed column block: one array per numeric field
+    block     u64 length + zlib-compressed text block
+
+The column block holds u16 presence flags, i64 id/module/lesson, i32 day
+ordinal, f64 compound/pos/neu/neg, an n x emotions f64 score matrix (NaN
+where absent) and u32 theme counts. The text block holds the string fields
+as columns, each u32 character lengths followed by one u64 length-prefixed
+UTF-8 blob. Loading is a handful of array reads and string slices instead
+of parsing every entry as JSON.
+"""
+import itertools
+import json
+import struct
+import sys
+import zlib
+from array import array
+import numpy as np
+from utils.journal_entry import ENTRY_EMOTIONS, JournalEntry
+
+MAGIC = b'TJSNAP'
+SNAPSHOT_VERSION = 1
+COMPRESSION_LEVEL = 1
+
+# Presence flags, one bit per optional field
+_INT_FIELDS = ('id', 'module', 'lesson')
+_FLOAT_FIELDS = ('compound', 'pos', 'neu', 'neg')
+_STRING_FIELDS = ('time', 'prompt', 'content', 'category')
+_FLAG_NAMES = (
+    _INT_FIELDS + ('day',) + _FLOAT_FIELDS + _STRING_FIELDS
+    + ('emotion_scores', 'themes', 'extra', 'sentiment_extra')
+)
+_FLAGS = {name: 1 << bit for bit, name in enumerate(_FLAG_NAMES)}
+
+# Slot order of the record assignment in read_snapshot()
+_RECORD_SLOTS = (
+    'id', 'day', 'time', 'module', 'lesson', 'prompt', 'content', 'category',
+    'compound', 'pos', 'neu', 'neg', 'emotion_scores', 'themes', 'extra', 'sentiment_extra'
+)
+
+_INT64_MIN, _INT64_MAX = -2**63, 2**63 - 1
+
+# What decoding damaged data can raise, from the header JSON, zlib, struct and NumPy
+_DECODE_ERRORS = (ValueError, KeyError, IndexError, TypeError, OverflowError, struct.error, zlib.error)
+
+def is_snapshot(head):
+    """Return True if head, the first bytes of a file, start a snapshot."""
+    return head[:len(MAGIC)] == MAGIC
+
+def write_snapshot(fileobj, settings, entries):
+    """
+    Write settings and journal entries as a binary snapshot.
+
+    Args:
+        fileobj: Binary file-like object to write to
+        settings (dict): Top-level export fields other than journal_entries
+        entries (iterable): Journal entries as dicts or JournalEntry records
+
+    Returns:
+        int: Number of entries written
+    """
+    records = [entry if isinstance(entry, JournalEntry) else JournalEntry.from_dict(entry)
+               for entry in entries]
+    count = len(records)
+    nan_scores = array('d', [float('nan')]) * len(ENTRY_EMOTIONS)
+
+    flags = []
+    ints = {name: [] for name in _INT_FIELDS}
+    days = []
+    floats = {name: [] for name in _FLOAT_FIELDS}
+    scores = []
+    strings = {name: [] for name in _STRING_FIELDS + ('extra', 'sentiment_extra')}
+    theme_counts = []
+    themes = []
+
+    for record in records:
+        row_flags = 0
+        extra = record.extra
+        for name in _INT_FIELDS:
+            value = getattr(record, name)
+            if value is not None and _INT64_MIN <= value <= _INT64_MAX:
+                row_flags |= _FLAGS[name]
+            elif value is not None:
+                # Too big for the column; keep it verbatim with the other extras
+                extra = dict(extra or {})
+                extra.setdefault(name, value)
+                value = None
+            ints[name].append(value or 0)
+        if record.day is not None:
+            row_flags |= _FLAGS['day']
+        days.append(record.day or 0)
+        for name in _FLOAT_FIELDS:
+            value = getattr(record, name)
+            if value is not None:
+                row_flags |= _FLAGS[name]
+            floats[name].append(0.0 if value is None else value)
+        if record.emotion_scores is not None:
+            row_flags |= _FLAGS['emotion_scores']
+            scores.append(record.emotion_scores)
+        else:
+            scores.append(nan_scores)
+        if record.themes is not None:
+            row_flags |= _FLAGS['themes']
+            theme_counts.append(len(record.themes))
+            themes.extend(record.themes)
+        else:
+            theme_counts.append(0)
+        for name in _STRING_FIELDS:
+            value = getattr(record, name)
+            if value is not None:
+                row_flags |= _FLAGS[name]
+            strings[name].append(value or '')
+        if extra:
+            row_flags |= _FLAGS['extra']
+        strings['extra'].append(json.dumps(extra) if extra else '')
+        if record.sentiment_extra:
+            row_flags |= _FLAGS['sentiment_extra']
+        strings['sentiment_extra'].append(
+            json.dumps(record.sentiment_extra) if record.sentiment_extra else ''
+        )
+        flags.append(row_flags)
+
+    header = json.dumps({
+        'settings': settings,
+        'entries': count,
+        'emotions': list(ENTRY_EMOTIONS),
+    }).encode('utf-8')
+
+    columns = zlib.compress(b''.join(
+        [np.array(flags, dtype='<u2').tobytes()]
+        + [np.array(ints[name], dtype='<i8').tobytes() for name in _INT_FIELDS]
+        + [np.array(days, dtype='<i4').tobytes()]
+        + [np.array(floats[name], dtype='<f8').tobytes() for name in _FLOAT_FIELDS]
+        + [np.frombuffer(b''.join(scores), dtype=np.float64).astype('<f8').tobytes(),
+           np.array(theme_counts, dtype='<u4').tobytes()]
+    ), COMPRESSION_LEVEL)
+
+    compressor = zlib.compressobj(COMPRESSION_LEVEL)
+    text = []
+    for values in [strings[name] for name in _STRING_FIELDS + ('extra', 'sentiment_extra')] + [themes]:
+        text.append(compressor.compress(_encode_strings(values)))
+    text.append(compressor.flush())
+    text = b''.join(text)
+
+    fileobj.write(MAGIC + struct.pack('<H', SNAPSHOT_VERSION))
+    for block in (header, columns, text):
+        fileobj.write(struct.pack('<Q', len(block)))
+        fileobj.write(block)
+    return count
+
+def read_snapshot(fileobj):
+    """
+    Read a snapshot written by write_snapshot().
+
+    Args:
+        fileobj: Binary file-like object positioned at the start of the snapshot
+
+    Returns:
+        tuple: (settings dict, list of JournalEntry records)
+
+    Raises:
+        ValueError: If the data is not a snapshot, uses an unknown version,
+            or is truncated or corrupt
+    """
+    head = fileobj.read(len(MAGIC) + 2)
+    if not is_snapshot(head) or len(head) < len(MAGIC) + 2:
+        raise ValueError("Not a journal snapshot")
+    version = struct.unpack('<H', head[len(MAGIC):])[0]
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+
+    try:
+        header = json.loads(_read_block(fileobj).decode('utf-8'))
+        settings = header['settings']
+        count = header['entries']
+        emotions = tuple(header['emotions'])
+        if not isinstance(settings, dict) or not isinstance(count, int) or count < 0:
+            raise ValueError("Bad snapshot header")
+        column_block = zlib.decompress(_read_block(fileobj))
+        text = zlib.decompress(_read_block(fileobj))
+    except _DECODE_ERRORS as e:
+        raise ValueError("Corrupt snapshot") from e
+    if emotions != ENTRY_EMOTIONS[:len(emotions)]:
+        raise ValueError("Snapshot emotion order does not match this version of the app")
+
+    try:
+        records = _decode_records(count, emotions, column_block, text)
+    except _DECODE_ERRORS as e:
+        raise ValueError("Corrupt snapshot") from e
+    return settings, records
+
+def _decode_records(count, emotions, column_block, text):
+    """Rebuild the JournalEntry records from the decompressed column and text blocks."""
+    # Column block
+    offset = 0
+    def take(dtype, shape):
+        nonlocal offset
+        values = np.frombuffer(column_block, dtype=dtype, count=int(np.prod(shape)), offset=offset)
+        offset += values.nbytes
+        return values.reshape(shape)
+
+    flags = take('<u2', count).tolist()
+    ints = {name: take('<i8', count).tolist() for name in _INT_FIELDS}
+    days = take('<i4', count).tolist()
+    floats = {name: take('<f8', count).tolist() for name in _FLOAT_FIELDS}
+    scores = take('<f8', (count, len(emotions))).astype(np.float64)
+    theme_counts = take('<u4', count).tolist()
+
+    # Text block
+    text_offset = 0
+    strings = {}
+    for name in _STRING_FIELDS + ('extra', 'sentiment_extra'):
+        strings[name], text_offset = _decode_strings(text, text_offset, count)
+    themes, text_offset = _decode_strings(text, text_offset, sum(theme_counts))
+
+    def present(values, name, convert=None):
+        """Values with None where the row's flag for name is clear."""
+        flag = _FLAGS[name]
+        if convert is None:
+            return [value if row_flags & flag else None for value, row_flags in zip(values, flags)]
+        return [convert(value) if row_flags & flag else None for value, row_flags in zip(values, flags)]
+
+    columns = {name: present(ints[name], name) for name in _INT_FIELDS}
+    columns['day'] = present(days, 'day')
+    columns.update((name, present(floats[name], name)) for name in _FLOAT_FIELDS)
+    columns['content'] = present(strings['content'], 'content')
+    # Share repeated strings the way JournalEntry.from_dict() does
+    columns.update((name, present(strings[name], name, sys.intern)) for name in ('time', 'prompt', 'category'))
+    columns['extra'] = present(strings['extra'], 'extra', json.loads)
+    columns['sentiment_extra'] = present(strings['sentiment_extra'], 'sentiment_extra', json.loads)
+
+    missing = array('d', [float('nan')]) * (len(ENTRY_EMOTIONS) - len(emotions))
+    raw_scores = scores.tobytes()
+    width = scores.itemsize * len(emotions)
+    columns['emotion_scores'] = present(
+        [raw_scores[start:start + width] for start in range(0, len(raw_scores), width)],
+        'emotion_scores', lambda row: array('d', row) + missing
+    )
+
+    themes = [sys.intern(theme) for theme in themes]
+    ends = itertools.accumulate(theme_counts)
+    columns['themes'] = present(
+        [tuple(themes[end - size:end]) for size, end in zip(theme_counts, ends)], 'themes'
+    )
+
+    records = []
+    new_record = JournalEntry.__new__
+    for values in zip(*[columns[name] for name in _RECORD_SLOTS]):
+        record = new_record(JournalEntry)
+        (record.id, record.day, record.time, record.module, record.lesson, record.prompt,
+         record.content, record.category, record.compound, record.pos, record.neu, record.neg,
+         record.emotion_scores, record.themes, record.extra, record.sentiment_extra) = values
+        records.append(record)
+
+    return records
+
+def _read_block(fileobj):
+    """Read one u64 length-prefixed block."""
+    size = fileobj.read(8)
+    if len(size) < 8:
+        raise ValueError("Truncated snapshot")
+    size = struct.unpack('<Q', size)[0]
+    block = fileobj.read(size)
+    if len(block) < size:
+        raise ValueError("Truncated snapshot")
+    return block
+
+def _encode_strings(values):
+    """Encode a string column: u32 character lengths, then a u64 length-prefixed UTF-8 blob."""
+    lengths = np.fromiter((len(value) for value in values), dtype='<u4', count=len(values))
+    blob = ''.join(values).encode('utf-8', 'surrogatepass')
+    return lengths.tobytes() + struct.pack('<Q', len(blob)) + blob
+
+def _decode_strings(text, offset, count):
+    """Decode a string column written by _encode_strings()."""
+    lengths = np.frombuffer(text, dtype='<u4', count=count, offset=offset)
+    offset += lengths.nbytes
+    blob_size = struct.unpack_from('<Q', text, offset)[0]
+    offset += 8
+    joined = text[offset:offset + blob_size].decode('utf-8', 'surrogatepass')
+    offset += blob_size
+
+    ends = np.cumsum(lengths, dtype=np.int64).tolist()
+    starts = [0] + ends[:-1]
+    return [joined[start:end] for start, end in zip(starts, ends)], offset
@@ -0,0 +1,164 @@
+from datetime import date
+from utils.journal_entry import day_ordinal
+from utils.rollups import CATEGORIES, RollupBucket, category_code
+
+# Characters of an entry's text shown in listings before it is opened
+PREVIEW_LENGTH = 160
+
+def preview_text(content, length=PREVIEW_LENGTH):
+    """Return the start of content, cut at a word boundary, with an ellipsis if cut."""
+    if len(content) <= length:
+        return content
+    cut = content[:length]
+    if not content[length].isspace() and ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip() + '…'
+
+class EntrySummary:
+    """
+    What the summary lists for one journal entry.
+
+    Holds a preview rather than the full text, so a page of the listing
+    stays small; the entry itself is fetched by id when opened. The page
+    builds these from JournalStore.listing_between(), which reads only the
+    columns shown; from_entry() builds one from a whole entry.
+    """
+
+    __slots__ = ('id', 'date', 'date_label', 'module_lesson', 'preview',
+                 'has_sentiment', 'mood', 'dominant_emotion', 'themes')
+
+    def __init__(self, entry_id, day, module, lesson, content, has_sentiment, category,
+                 dominant_emotion, themes):
+        """
+        Args:
+            entry_id (int): The entry's id
+            day (int): The entry's day ordinal
+            module (int): Module number, or None if unknown
+            lesson (int): Lesson number, or None if unknown
+            content (str): The entry's text, or at least its first PREVIEW_LENGTH + 1 characters
+            has_sentiment (bool): Whether the entry has sentiment data
+            category (str): The entry's sentiment category
+            dominant_emotion (str): Its highest scoring emotion, or None
+            themes (list): Its themes
+        """
+        self.id = entry_id
+        self.date = date.fromordinal(day)
+        self.date_label = self.date.strftime('%B %d, %Y')
+        self.module_lesson = (f"Module {'?' if module is None else module}, "
+                              f"Lesson {'?' if lesson is None else lesson}")
+        self.preview = preview_text(content or '')
+        self.has_sentiment = bool(has_sentiment)
+        # Legacy 'very positive' / 'very negative' labels fold into three moods
+        self.mood = CATEGORIES[category_code(category)]
+        self.dominant_emotion = dominant_emotion
+        self.themes = list(themes or [])
+
+    @classmethod
+    def from_entry(cls, entry, day):
+        """
+        Summarise a whole entry.
+
+        Args:
+            entry (dict): Journal entry dict or JournalEntry record
+            day (int): The entry's day ordinal
+        """
+        sentiment = entry.get('sentiment')
+        has_sentiment = isinstance(sentiment, dict)
+        if not has_sentiment:
+            sentiment = {}
+        emotions = sentiment.get('emotions')
+        scores = [
+            (emotion, score) for emotion, score in emotions.items()
+            if isinstance(score, (int, float)) and not isinstance(score, bool)
+        ] if isinstance(emotions, dict) else []
+        return cls(
+            entry.get('id'), day, entry.get('module'), entry.get('lesson'), entry.get('content'),
+            has_sentiment, sentiment.get('category'),
+            max(scores, key=lambda x: x[1])[0] if scores else None,
+            entry.get('themes')
+        )
+
+def summarize_entries(entries, start_date, end_date):
+    """
+    Return an EntrySummary for each entry dated within [start_date, end_date].
+
+    Args:
+        entries (iterable): Journal entries; ones outside the period are skipped
+        start_date (date): First day
+        end_date (date): Last day
+    """
+    first, last = start_date.toordinal(), end_date.toordinal()
+    summaries = []
+    for entry in entries:
+        day = day_ordinal(entry.get('date'))
+        if day is not None and first <= day <= last:
+            summaries.append(EntrySummary.from_entry(entry, day))
+    return summaries
+
+class SummaryStats:
+    """
+    The totals and trends the weekly summary page and PDF show for a period.
+
+    Built from the rollup buckets alone, so it never reads an entry and its
+    size grows with the days in the period, not the entries in it. The
+    entry listing is paged out of the store separately (see EntrySummary).
+    The page and the PDF both render from the same SummaryStats, so they
+    always agree.
+    """
+
+    def __init__(self, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.entry_count = 0
+        self.total_words = 0
+        self.average_words = 0
+        self.moods = []
+        self.dominant_mood = None
+        self.emotion_averages = {}
+        self.emotion_intensities = {}
+        self.dominant_emotion = None
+        self.days = []
+
+    @classmethod
+    def compute(cls, start_date, end_date, rollups):
+        """
+        Summarise the entries dated within [start_date, end_date].
+
+        Args:
+            start_date (date): First day
+            end_date (date): Last day
+            rollups (Rollups): The journal's rollups
+
+        Returns:
+            SummaryStats: The period's summary
+        """
+        stats = cls(start_date, end_date)
+        stats._total(rollups)
+        return stats
+
+    def _total(self, rollups):
+        """Fill in the period totals from the rollup buckets."""
+        period = rollups.between(self.start_date, self.end_date)
+        self.entry_count = period.entries
+        self.total_words = period.words
+        self.average_words = round(period.words / period.entries) if period.entries else 0
+
+        # Share of entries per mood, highest first
+        moods = [
+            (category, count / period.entries * 100)
+            for category, count in period.category_counts().items() if count > 0
+        ]
+        self.moods = sorted(moods, key=lambda x: x[1], reverse=True)
+        self.dominant_mood = self.moods[0][0] if self.moods else None
+
+        # Averaged over entries with any emotion data, and over entries showing each emotion
+        self.emotion_averages = period.average_emotions(over='emotional')
+        self.emotion_intensities = period.average_emotions(over='present')
+        self.dominant_emotion = period.dominant_emotion(over='emotional')
+
+        # Copies of the day buckets, for trends at any resolution
+        self.days = []
+        for day, bucket in rollups.daily(self.start_date, self.end_date):
+            copy = RollupBucket()
+            copy.merge(bucket)
+            self.days.append((date.fromordinal(day), copy))
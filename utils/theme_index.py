@@ -0,0 +1,95 @@
+import threading
+import numpy as np
+
+class ThemeIndex:
+    """
+    Document frequencies of theme words across a journal, for TF-IDF theme ranking.
+
+    Frequencies live in a NumPy array indexed through a word -> column vocabulary.
+    Adding an entry only touches that entry's distinct words, and ranking only
+    looks up the words of the entry being ranked, so both stay O(entry length)
+    however many entries the journal holds. One index can be shared by
+    every session of a user: updates and lookups are serialized.
+    """
+
+    def __init__(self, capacity=1024):
+        self.vocabulary = {}
+        self.document_frequency = np.zeros(capacity, dtype=np.int32)
+        self.document_count = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_documents(cls, documents):
+        """Build an index over documents, each an iterable of theme words."""
+        index = cls()
+        index.reset(documents)
+        return index
+
+    def add_document(self, terms):
+        """
+        Count one entry's distinct theme words.
+
+        Args:
+            terms (iterable): Theme words of the entry, e.g. a word -> count dict
+        """
+        with self._lock:
+            self._add(terms)
+
+    def reset(self, documents=()):
+        """Forget every entry, then count documents."""
+        with self._lock:
+            self.vocabulary = {}
+            self.document_frequency = np.zeros(len(self.document_frequency), dtype=np.int32)
+            self.document_count = 0
+            for terms in documents:
+                self._add(terms)
+
+    def rank(self, term_counts, top_n=3):
+        """
+        Rank an entry's theme words by TF-IDF against the indexed journal.
+
+        Uses smoothed IDF, so with an empty journal the ranking is plain term
+        frequency. Ties keep the order of term_counts.
+
+        Args:
+            term_counts (dict): Theme word -> count within the entry
+            top_n (int): Number of themes to return
+
+        Returns:
+            list: The top_n theme words
+        """
+        if not term_counts:
+            return []
+
+        words = list(term_counts)
+        tf = np.fromiter(term_counts.values(), dtype=np.float64, count=len(words))
+        df = np.zeros(len(words), dtype=np.float64)
+        with self._lock:
+            for i, word in enumerate(words):
+                column = self.vocabulary.get(word)
+                if column is not None:
+                    df[i] = self.document_frequency[column]
+            document_count = self.document_count
+
+        idf = np.log((1.0 + document_count) / (1.0 + df)) + 1.0
+        order = np.argsort(-(tf * idf), kind='stable')[:top_n]
+        return [words[i] for i in order]
+
+    def _add(self, terms):
+        """add_document() with the lock held."""
+        columns = [self._column(word) for word in set(terms)]
+        if columns:
+            self.document_frequency[np.array(columns, dtype=np.intp)] += 1
+        self.document_count += 1
+
+    def _column(self, word):
+        """Return the array column for word, growing the array when needed."""
+        column = self.vocabulary.get(word)
+        if column is None:
+            column = len(self.vocabulary)
+            self.vocabulary[word] = column
+            if column >= len(self.document_frequency):
+                grown = np.zeros(len(self.document_frequency) * 2, dtype=np.int32)
+                grown[:len(self.document_frequency)] = self.document_frequency
+                self.document_frequency = grown
+        return column
@@ -0,0 +1,133 @@
+from datetime import date
+from utils.rollups import RollupBucket
+
+# Resampling frequencies for trend charts, finest first
+FREQUENCIES = ('day', 'week', 'month')
+
+# Most points drawn per emotion line; longer series are thinned with LTTB
+MAX_TREND_POINTS = 200
+
+def choose_frequency(start_date, end_date):
+    """Pick the resolution for a range: days up to a quarter, weeks up to two years, then months."""
+    days = (end_date - start_date).days + 1
+    if days <= 92:
+        return 'day'
+    if days <= 731:
+        return 'week'
+    return 'month'
+
+def period_start(day, frequency):
+    """Return the first day of the day, ISO week or month containing day."""
+    if frequency == 'week':
+        return date.fromordinal(day.toordinal() - day.weekday())
+    if frequency == 'month':
+        return day.replace(day=1)
+    return day
+
+def resample(days, frequency):
+    """
+    Merge day buckets into one bucket per day, week or month.
+
+    Buckets hold exact sums, so each period's averages are over all of its
+    entries, not averages of daily averages.
+
+    Args:
+        days (list): (date, RollupBucket) pairs in date order
+        frequency (str): One of FREQUENCIES
+
+    Returns:
+        list: (period start date, RollupBucket) pairs in date order
+    """
+    periods = []
+    for day, bucket in days:
+        start = period_start(day, frequency)
+        if not periods or periods[-1][0] != start:
+            periods.append((start, RollupBucket()))
+        periods[-1][1].merge(bucket)
+    return periods
+
+def rolling_mean(values, window):
+    """Trailing mean over the last `window` values; the first few average what there is."""
+    if window <= 1:
+        return list(values)
+    means = []
+    total = 0.0
+    for i, value in enumerate(values):
+        total += value
+        if i >= window:
+            total -= values[i - window]
+        means.append(total / min(i + 1, window))
+    return means
+
+def lttb(xs, ys, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    point kept before it and the average of the next bucket, which keeps
+    the peaks and troughs a line chart needs.
+
+    Args:
+        xs (list): Ascending x values as numbers
+        ys (list): y values
+        threshold (int): Number of points to keep
+
+    Returns:
+        list: Indices of the kept points, ascending
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    kept = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket, the third corner of each triangle
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+def emotion_series(days, frequency, window=1, max_points=MAX_TREND_POINTS):
+    """
+    Build one line per emotion from day buckets, bounded in size.
+
+    Args:
+        days (list): (date, RollupBucket) pairs in date order
+        frequency (str): One of FREQUENCIES
+        window (int): Points in the trailing rolling mean, 1 for none
+        max_points (int): Most points kept per emotion
+
+    Returns:
+        dict: Emotion -> (dates, values), each line at most max_points long
+    """
+    series = {}
+    for start, bucket in resample(days, frequency):
+        for emotion, value in bucket.average_emotions(over='present').items():
+            dates, values = series.setdefault(emotion, ([], []))
+            dates.append(start)
+            values.append(value)
+
+    for emotion, (dates, values) in series.items():
+        values = rolling_mean(values, window)
+        if len(dates) > max_points:
+            kept = lttb([day.toordinal() for day in dates], values, max_points)
+            dates = [dates[i] for i in kept]
+            values = [values[i] for i in kept]
+        series[emotion] = (dates, values)
+    return series